@@ -6,7 +6,8 @@ from app.routers import (
     leaders,
     teams,
     projects,
-    utils
+    utils,
+    batch
 )
 
 # Crear un router principal para la API
@@ -20,3 +21,4 @@ api_router.include_router(leaders.router)
 api_router.include_router(teams.router)
 api_router.include_router(projects.router)
 api_router.include_router(utils.router)
+api_router.include_router(batch.router)
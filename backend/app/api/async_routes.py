@@ -0,0 +1,235 @@
+"""
+Rutas asíncronas a partir de los routers síncronos (DB_ASYNC=true)
+
+Los endpoints de app/routers son funciones síncronas que reciben una Session. En
+modo async, async_router() crea para cada ruta un endpoint async que recibe una
+AsyncSession (get_async_db y sus variantes de lectura y escritura) y ejecuta el endpoint original con su Session
+síncrona dentro de AsyncSession.run_sync: la E/S de aiosqlite se espera en el bucle
+de eventos en lugar de bloquear un hilo del threadpool. Las dependencias que usan la
+base de datos (get_current_user, ...) se convierten igual y comparten la sesión.
+
+El código del puente corre en el propio bucle de eventos, así que un endpoint con
+trabajo de CPU apreciable (bcrypt, numpy) lo bloquearía para todas las peticiones en
+curso. Esos endpoints se marcan con @cpu_bound y siguen siendo síncronos: usan el
+engine síncrono desde el threadpool, como en el modo por defecto.
+
+La respuesta se valida contra response_model dentro del mismo puente, porque fuera
+de él una carga perezosa de SQLAlchemy no puede hacer E/S.
+"""
+import inspect
+import types
+import typing
+from contextvars import ContextVar
+from fastapi import APIRouter, Depends, params
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response
+from app.database.database import get_db, get_read_db, get_write_db
+from app.database.async_database import get_async_db, get_async_read_db, get_async_write_db
+
+# AsyncSession del puente mientras se ejecuta código síncrono dentro de él (None fuera)
+_bridge_session: ContextVar = ContextVar("async_bridge_session", default=None)
+
+# Parámetro oculto que da una AsyncSession a los puentes cuya función no recibe ninguna
+_BRIDGE_SESSION = "async_bridge_session"
+
+# Orígenes de las anotaciones Optional[X] / Union[X, Y] y, desde Python 3.10, X | Y
+_UNION_TYPES = (typing.Union, getattr(types, "UnionType", typing.Union))
+
+# ---- STREAMING ----
+async def _iterate_in_bridge(session: AsyncSession, iterator):
+    done = object()
+    while True:
+        chunk = await session.run_sync(lambda sync_session: next(iterator, done))
+        if chunk is done:
+            return
+        yield chunk
+
+def streaming_response(content, **kwargs) -> StreamingResponse:
+    """
+    StreamingResponse que funciona en los dos modos. En modo async el iterador se
+    avanza dentro del puente greenlet (Starlette lo iteraría en el threadpool, donde
+    la sesión asíncrona no puede hacer consultas).
+    """
+    session = _bridge_session.get()
+    if session is not None:
+        content = _iterate_in_bridge(session, iter(content))
+    return StreamingResponse(content, **kwargs)
+
+# ---- ENDPOINTS CON TRABAJO DE CPU ----
+def cpu_bound(endpoint):
+    """Deja el endpoint síncrono en modo async: su trabajo de CPU se hace en el threadpool"""
+    endpoint.cpu_bound = True
+    return endpoint
+
+def _is_cpu_bound(call) -> bool:
+    return getattr(call, "cpu_bound", False)
+
+# ---- CONVERSIÓN DE ENDPOINTS Y DEPENDENCIAS ----
+# Dependencias de sesión y su equivalente asíncrono
+SESSION_DEPENDENCIES = {
+    get_db: get_async_db,
+    get_read_db: get_async_read_db,
+    get_write_db: get_async_write_db,
+}
+_converted: typing.Dict[typing.Callable, typing.Callable] = {}
+
+def _signature(call) -> inspect.Signature:
+    signature = inspect.signature(call)
+    hints = typing.get_type_hints(call) if inspect.isfunction(call) else {}
+    return signature.replace(parameters=[
+        parameter.replace(annotation=hints.get(parameter.name, parameter.annotation))
+        for parameter in signature.parameters.values()
+    ])
+
+def _uses_database(call) -> bool:
+    """True si call depende, directa o indirectamente, de una sesión de base de datos"""
+    if call in SESSION_DEPENDENCIES:
+        return True
+    if not inspect.isfunction(call):
+        return False
+    return any(
+        isinstance(parameter.default, params.Depends) and parameter.default.dependency is not None
+        and _uses_database(parameter.default.dependency)
+        for parameter in inspect.signature(call).parameters.values()
+    )
+
+def _async_parameters(call) -> inspect.Signature:
+    """Firma de call con cada Depends que usa la base de datos apuntando a su versión async"""
+    signature = _signature(call)
+    parameters = []
+    for parameter in signature.parameters.values():
+        dependency = parameter.default
+        if isinstance(dependency, params.Depends) and dependency.dependency is not None \
+                and _uses_database(dependency.dependency):
+            async_dependency = _async_dependency(dependency.dependency)
+            annotation = AsyncSession if dependency.dependency in SESSION_DEPENDENCIES else parameter.annotation
+            parameter = parameter.replace(
+                default=Depends(async_dependency, use_cache=dependency.use_cache), annotation=annotation
+            )
+        parameters.append(parameter)
+    return signature.replace(parameters=parameters)
+
+def _bridge(call, finish=None):
+    """Envuelve una función síncrona en una corrutina que la ejecuta en el puente greenlet"""
+    def run(sync_session, session, kwargs):
+        token = _bridge_session.set(session)
+        try:
+            result = call(**kwargs)
+            return finish(result) if finish else result
+        finally:
+            _bridge_session.reset(token)
+
+    async def endpoint(**kwargs):
+        session = kwargs.pop(_BRIDGE_SESSION, None)
+        if session is None:
+            session = next(value for value in kwargs.values() if isinstance(value, AsyncSession))
+        kwargs = {
+            name: value.sync_session if isinstance(value, AsyncSession) else value
+            for name, value in kwargs.items()
+        }
+        return await session.run_sync(run, session, kwargs)
+
+    signature = _async_parameters(call)
+    if not any(parameter.annotation is AsyncSession for parameter in signature.parameters.values()):
+        # Dependencias como get_current_active_user no reciben sesión pero cargan atributos:
+        # la sesión de la petición (get_async_db, la misma que usa la ruta) abre el puente
+        signature = signature.replace(parameters=[*signature.parameters.values(), inspect.Parameter(
+            _BRIDGE_SESSION, inspect.Parameter.KEYWORD_ONLY, default=Depends(get_async_db), annotation=AsyncSession
+        )])
+    endpoint.__name__ = call.__name__
+    endpoint.__qualname__ = call.__qualname__
+    endpoint.__doc__ = call.__doc__
+    endpoint.__signature__ = signature
+    return endpoint
+
+def _async_dependency(call):
+    if call in SESSION_DEPENDENCIES:
+        return SESSION_DEPENDENCIES[call]
+    if call not in _converted:
+        _converted[call] = _bridge(call)
+    return _converted[call]
+
+def _load_attributes(value, annotation):
+    """
+    Lee, en Python y dentro del puente, todos los atributos que la validación contra
+    annotation va a pedir a los objetos ORM. Así las cargas perezosas ocurren aquí y
+    no dentro del validador de Pydantic: un cambio de greenlet en mitad de su código
+    nativo rompe el proceso.
+    """
+    if value is None or isinstance(value, (str, bytes, int, float, bool, dict, BaseModel)):
+        return
+    origin = typing.get_origin(annotation)
+    arguments = typing.get_args(annotation)
+    if origin in (list, set, tuple, frozenset):
+        for item in value:
+            _load_attributes(item, arguments[0] if arguments else typing.Any)
+    elif origin in _UNION_TYPES:
+        for argument in arguments:
+            _load_attributes(value, argument)
+    elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        for name, field in annotation.model_fields.items():
+            _load_attributes(getattr(value, name, None), field.annotation)
+
+def _response_finisher(route: APIRoute):
+    """Convierte el resultado en datos desacoplados de la sesión (modelos Pydantic o JSON)"""
+    def finish(result):
+        if isinstance(result, Response):
+            return result
+        if route.response_field is None:
+            return jsonable_encoder(result)
+        _load_attributes(result, route.response_model)
+        value, errors = route.response_field.validate(result, {}, loc=("response",))
+        # Si no valida, FastAPI devuelve el mismo error que en modo síncrono
+        return result if errors else value
+    return finish
+
+def async_route_endpoint(route: APIRoute):
+    """
+    Endpoint async equivalente al de la ruta (la misma función si ya era async, no usa
+    la base o está marcado con @cpu_bound)
+    """
+    if inspect.iscoroutinefunction(route.endpoint) or not _uses_database(route.endpoint) \
+            or _is_cpu_bound(route.endpoint):
+        return route.endpoint
+    return _bridge(route.endpoint, _response_finisher(route))
+
+def async_router(router: APIRouter) -> APIRouter:
+    """Copia del router con todas las rutas que usan la base de datos convertidas a async"""
+    converted = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute) or _is_cpu_bound(route.endpoint):
+            converted.routes.append(route)
+            continue
+        converted.add_api_route(
+            route.path,
+            async_route_endpoint(route),
+            methods=route.methods,
+            name=route.name,
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=[
+                Depends(_async_dependency(dependency.dependency), use_cache=dependency.use_cache)
+                if dependency.dependency is not None and _uses_database(dependency.dependency) else dependency
+                for dependency in route.dependencies
+            ],
+            summary=route.summary,
+            description=route.description,
+            response_description=route.response_description,
+            responses=route.responses,
+            deprecated=route.deprecated,
+            operation_id=route.operation_id,
+            response_model_include=route.response_model_include,
+            response_model_exclude=route.response_model_exclude,
+            response_model_by_alias=route.response_model_by_alias,
+            response_model_exclude_unset=route.response_model_exclude_unset,
+            response_model_exclude_defaults=route.response_model_exclude_defaults,
+            response_model_exclude_none=route.response_model_exclude_none,
+            include_in_schema=route.include_in_schema,
+            response_class=route.response_class,
+        )
+    return converted
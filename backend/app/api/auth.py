@@ -6,6 +6,8 @@ from passlib.context import CryptContext
 from app.models.models import User
 from app.schemas.auth_schemas import UserCreate, TokenData
 from app.config import settings
+from app.api.operations.lookups import lookup_statement, get_by_key
+from app.api.operations.unit_of_work import unit_of_work
 
 # Contexto de encriptación para contraseñas
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -20,31 +22,33 @@ def get_password_hash(password):
 
 def create_user(db: Session, user: UserCreate):
     """Crear un nuevo usuario"""
-    # Verificar si el usuario ya existe
-    existing_user = db.query(User).filter(User.username == user.username).first()
-    if existing_user:
-        raise ValueError("El nombre de usuario ya está en uso")
-    
-    existing_email = db.query(User).filter(User.email == user.email).first()
-    if existing_email:
-        raise ValueError("El correo electrónico ya está registrado")
-    
-    # Crear nuevo usuario
-    hashed_password = get_password_hash(user.password)
-    db_user = User(
-        username=user.username,
-        email=user.email,
-        hashed_password=hashed_password
-    )
-    
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    with unit_of_work(db):
+        # Verificar si el usuario ya existe
+        existing_user = db.query(User).filter(User.username == user.username).first()
+        if existing_user:
+            raise ValueError("El nombre de usuario ya está en uso")
+
+        existing_email = db.query(User).filter(User.email == user.email).first()
+        if existing_email:
+            raise ValueError("El correo electrónico ya está registrado")
+
+        # Crear nuevo usuario
+        hashed_password = get_password_hash(user.password)
+        db_user = User(
+            username=user.username,
+            email=user.email,
+            hashed_password=hashed_password
+        )
+
+        db.add(db_user)
     return db_user
 
+# Sentencia construida una sola vez: cada petición autenticada solo liga el username
+_USER_BY_USERNAME = lookup_statement(User.username)
+
 def get_user(db: Session, username: str):
     """Obtener un usuario por su nombre de usuario"""
-    return db.query(User).filter(User.username == username).first()
+    return get_by_key(db, _USER_BY_USERNAME, username)
 
 def authenticate_user(db: Session, username: str, password: str):
     """Autenticar un usuario"""
@@ -0,0 +1,183 @@
+"""
+Caché en memoria para los endpoints de analytics.
+
+Cada entrada tiene un TTL propio y declara de qué tablas depende. Los eventos de
+SQLAlchemy registran las tablas que escribe cada sesión y, al hacer commit, se
+invalidan únicamente las entradas que dependen de ellas. Cuando se llena, se
+descarta la entrada usada hace más tiempo (LRU).
+
+La caché es de cada proceso, pero las invalidaciones llegan a todos: la misma
+transacción que escribe una tabla incrementa su contador en cache_generations, y
+una entrada solo se sirve si los contadores de sus tablas siguen como cuando se
+calculó (una consulta por clave primaria en lugar del cálculo completo).
+"""
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from itertools import chain
+from sqlalchemy import Table, event, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.models import CacheGeneration
+
+# Tablas de las que depende el cálculo de la nómina
+PAYROLL_TABLES = frozenset({
+    "employees", "programmers", "programmer_languages", "leaders",
+    "teams", "team_members", "projects", "employee_payroll", "payroll_summary"
+})
+PROJECT_TABLES = frozenset({"projects"})
+
+class AnalyticsCache:
+    """Caché LRU con TTL por entrada e invalidación por tabla"""
+
+    def __init__(self, max_entries: int = 256, default_ttl: float = 300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # clave -> (expira_en, tablas, valor, contadores en la base)
+        self._generations = defaultdict(int)  # tabla -> número de invalidaciones
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get_or_set(self, key, tables, loader, ttl: float = None, db: Session = None):
+        """
+        Devuelve el valor guardado para key o lo calcula con loader() y lo guarda.
+        El valor debe ser independiente de la sesión (esquemas o datos simples, no objetos ORM).
+        Con db se comprueban además los contadores de la base de datos, para ver las
+        escrituras confirmadas por otros procesos.
+        """
+        shared = shared_generations(db, tables) if db is not None else None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] <= now:
+                    del self._entries[key]
+                    self.expirations += 1
+                elif entry[3] != shared:
+                    del self._entries[key]
+                    self.invalidations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[2]
+            self.misses += 1
+            generations = {table: self._generations[table] for table in tables}
+
+        value = loader()
+
+        with self._lock:
+            # Si una de las tablas cambió mientras se calculaba, el valor ya no es fiable
+            if any(self._generations[table] != generation for table, generation in generations.items()):
+                return value
+            expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+            self._entries[key] = (expires_at, frozenset(tables), value, shared)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate_tables(self, tables):
+        """Elimina las entradas que dependen de alguna de las tablas indicadas"""
+        tables = set(tables)
+        if not tables:
+            return
+        with self._lock:
+            for table in tables:
+                self._generations[table] += 1
+            stale = [key for key, entry in self._entries.items() if entry[1] & tables]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
+
+analytics_cache = AnalyticsCache(
+    max_entries=settings.ANALYTICS_CACHE_SIZE,
+    default_ttl=settings.ANALYTICS_CACHE_TTL
+)
+
+# ---- CONTADORES COMPARTIDOS ENTRE PROCESOS ----
+def shared_generations(db: Session, tables) -> dict:
+    """Contador de cache_generations de cada tabla (0 si nunca se escribió)"""
+    stored = dict(db.execute(
+        select(CacheGeneration.table_name, CacheGeneration.generation)
+        .where(CacheGeneration.table_name.in_(sorted(tables)))
+    ).all())
+    return {table: stored.get(table, 0) for table in tables}
+
+def bump_shared_generations(db, tables) -> None:
+    """Incrementa, en la transacción de db (Session o Connection), el contador de cada tabla escrita"""
+    statement = insert(CacheGeneration.__table__).values(
+        [{"table_name": table, "generation": 1} for table in sorted(tables)]
+    )
+    db.execute(statement.on_conflict_do_update(
+        index_elements=["table_name"], set_={"generation": CacheGeneration.__table__.c.generation + 1}
+    ))
+
+# ---- SEGUIMIENTO DE ESCRITURAS ----
+def _written_tables(session):
+    return session.info.setdefault("written_tables", set())
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_tables(session, flush_context):
+    """Anota las tablas de los objetos ORM insertados, modificados o eliminados"""
+    tables = _written_tables(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            tables.add(table.name)
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statements(orm_execute_state):
+    """
+    Anota las tablas afectadas por INSERT/UPDATE/DELETE masivos ejecutados con la
+    sesión, tanto sobre un modelo como sobre una Table de Core (sin mapper). Si no
+    se puede saber la tabla, se dan por escritas todas.
+    """
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if isinstance(table, Table):
+            tables = {table.name}
+        elif orm_execute_state.bind_mapper is not None:
+            tables = {orm_execute_state.bind_mapper.local_table.name}
+        else:
+            tables = set(CacheGeneration.metadata.tables)
+        _written_tables(orm_execute_state.session).update(tables)
+
+@event.listens_for(Session, "before_commit")
+def _bump_on_commit(session):
+    """Los contadores se confirman junto con las escrituras que invalidan"""
+    session.flush()
+    tables = session.info.get("written_tables")
+    if tables:
+        bump_shared_generations(session, tables)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    analytics_cache.invalidate_tables(session.info.pop("written_tables", set()))
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("written_tables", None)
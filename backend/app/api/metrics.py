@@ -0,0 +1,154 @@
+"""
+Métricas de base de datos por petición.
+
+QueryMetricsMiddleware cuenta las sentencias SQL y el tiempo en la base de datos de
+cada petición (ver track_queries en database.py) y los publica en las cabeceras
+X-DB-Queries y X-DB-Time-ms, en una línea de log JSON (con DB_QUERY_LOG=true) y en
+un agregado por ruta.
+
+Con DB_QUERY_BUDGET > 0 (pensado para los tests) una petición que ejecuta más
+consultas que el presupuesto responde 500, para detectar N+1 nuevos. El límite se
+aplica en el listener del engine: la sentencia que lo supera no se ejecuta y la
+unidad de trabajo se deshace, así que una escritura rechazada no queda guardada.
+Solo las sentencias posteriores al commit (por ejemplo, cargas perezosas al
+serializar la respuesta) ya no pueden deshacer la escritura.
+"""
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from app.config import settings
+from app.database.database import QueryBudgetExceeded, track_queries
+
+logger = logging.getLogger("app.db")
+
+class RouteMetrics:
+    """Agregado de consultas y tiempo de base de datos por ruta (método + plantilla de ruta)"""
+
+    def __init__(self):
+        self._routes = defaultdict(lambda: {
+            "requests": 0, "queries": 0, "max_queries": 0, "db_time_ms": 0.0, "duration_ms": 0.0
+        })
+        self._lock = threading.Lock()
+
+    def record(self, route: str, queries: int, db_time_ms: float, duration_ms: float):
+        with self._lock:
+            entry = self._routes[route]
+            entry["requests"] += 1
+            entry["queries"] += queries
+            entry["max_queries"] = max(entry["max_queries"], queries)
+            entry["db_time_ms"] += db_time_ms
+            entry["duration_ms"] += duration_ms
+
+    def snapshot(self) -> list:
+        """Rutas ordenadas por tiempo total en la base de datos (mayor a menor)"""
+        with self._lock:
+            rows = [
+                {
+                    "route": route,
+                    "requests": entry["requests"],
+                    "total_queries": entry["queries"],
+                    "avg_queries": entry["queries"] / entry["requests"],
+                    "max_queries": entry["max_queries"],
+                    "total_db_time_ms": round(entry["db_time_ms"], 3),
+                    "avg_db_time_ms": round(entry["db_time_ms"] / entry["requests"], 3),
+                    "avg_duration_ms": round(entry["duration_ms"] / entry["requests"], 3),
+                }
+                for route, entry in self._routes.items()
+            ]
+        return sorted(rows, key=lambda row: row["total_db_time_ms"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+route_metrics = RouteMetrics()
+
+_route_paths = {}  # endpoint -> plantilla de la ruta
+
+def _route_name(scope) -> str:
+    """Plantilla de la ruta atendida (p. ej. GET /teams/{team_id}/members)"""
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is not None and app is not None:
+        if endpoint not in _route_paths:
+            for route in app.router.routes:
+                if getattr(route, "endpoint", None) is endpoint:
+                    _route_paths[endpoint] = route.path
+                    break
+        if endpoint in _route_paths:
+            return f"{scope['method']} {_route_paths[endpoint]}"
+    return f"{scope['method']} <sin ruta>"
+
+class QueryMetricsMiddleware:
+    """Middleware ASGI que mide las consultas SQL de cada petición HTTP"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = track_queries(settings.DB_QUERY_BUDGET)
+        started = time.perf_counter()
+        status = {"code": 500, "started": False, "replaced": False}
+
+        async def send_with_metrics(message):
+            if message["type"] == "http.response.start":
+                status["started"] = True
+                # Una ruta que captura cualquier excepción también devuelve el error del presupuesto
+                if stats.exceeded:
+                    await self._reject(_route_name(scope), stats, send)
+                    status["replaced"] = True
+                    return
+                status["code"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                headers.append((b"x-db-time-ms", f"{stats.time_ms:.3f}".encode()))
+                message = {**message, "headers": headers}
+            elif status["replaced"]:
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        except QueryBudgetExceeded:
+            if status["started"]:
+                raise
+            await self._reject(_route_name(scope), stats, send)
+        finally:
+            route = _route_name(scope)
+            duration_ms = (time.perf_counter() - started) * 1000
+            route_metrics.record(route, stats.count, stats.time_ms, duration_ms)
+            if settings.DB_QUERY_LOG:
+                logger.info(json.dumps({
+                    "event": "request",
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": route,
+                    "status": status["code"],
+                    "db_queries": stats.count,
+                    "db_time_ms": round(stats.time_ms, 3),
+                    "duration_ms": round(duration_ms, 3)
+                }))
+
+    @staticmethod
+    async def _reject(route, stats, send):
+        logger.warning(f"Presupuesto de consultas superado en {route}: más de {stats.budget}")
+        body = json.dumps({
+            "detail": f"Query budget exceeded: more than {stats.budget} queries in {route}"
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 500,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-db-queries", str(stats.count).encode()),
+                (b"x-db-time-ms", f"{stats.time_ms:.3f}".encode()),
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
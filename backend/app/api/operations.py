@@ -9,6 +9,16 @@ from .operations.programmer_operations import *
 from .operations.leader_operations import *
 from .operations.team_operations import *
 from .operations.project_operations import *
+from .operations.payroll_operations import *
+from .operations.payroll_analytics import *
+from .operations.payroll_simulation import *
+from .operations.import_operations import *
+from .operations.batch_operations import *
+from .operations.pagination import *
+from .operations.versioning import *
+from .operations.cascades import *
+from .operations.unit_of_work import *
+from .operations.lookups import *
 from .operations.utils import *
 
 # Nota: Este archivo ahora solo sirve como agregador de todas las operaciones
@@ -8,4 +8,14 @@ from .programmer_operations import *
 from .leader_operations import *
 from .team_operations import *
 from .project_operations import *
+from .payroll_operations import *
+from .payroll_analytics import *
+from .payroll_simulation import *
+from .import_operations import *
+from .batch_operations import *
+from .pagination import *
+from .versioning import *
+from .cascades import *
+from .unit_of_work import *
+from .lookups import *
 from .utils import *
@@ -0,0 +1,153 @@
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from app.schemas import schemas
+from app.api.operations import (
+    employee_operations, programmer_operations, leader_operations, team_operations, project_operations,
+    payroll_operations
+)
+from app.api.operations.unit_of_work import unit_of_work
+
+# ---- LOTES DE OPERACIONES ----
+# Un lote es una lista ordenada de llamadas a las operaciones de escritura
+# existentes: {"op": nombre, "args": argumentos de la función (sin db), "ref": alias}.
+# Todas se ejecutan en la misma sesión dentro de una unidad de trabajo, así que el
+# lote se confirma una sola vez o se deshace entero si alguna falla. Una operación
+# con "ref" publica el ID de lo que creó y las siguientes lo usan escribiendo
+# "$alias" en cualquier valor de sus argumentos.
+
+# Operaciones por lote (límite para que un lote no retenga la escritura demasiado tiempo)
+BATCH_MAX_OPERATIONS = 100
+BATCH_REFERENCE_PREFIX = "$"
+
+class BatchOperation:
+    """
+    Una operación disponible en los lotes.
+    arguments indica el tipo de cada argumento de function; response, el esquema con
+    el que se devuelve el resultado, e id_field, el atributo que se publica como ID.
+    """
+
+    def __init__(self, function, arguments: Dict[str, Any], response: Any, id_field: Optional[str] = None):
+        self.function = function
+        self.arguments = {name: TypeAdapter(annotation) for name, annotation in arguments.items()}
+        self.response = TypeAdapter(response)
+        self.id_field = id_field
+
+BATCH_OPERATIONS = {
+    "create_employee": BatchOperation(
+        employee_operations.create_employee, {"employee": schemas.EmployeeCreate}, schemas.Employee, "id"),
+    "update_employee": BatchOperation(
+        employee_operations.update_employee, {"employee_id": int, "employee_update": schemas.EmployeeUpdate},
+        schemas.Employee, "id"),
+    "create_programmer": BatchOperation(
+        programmer_operations.create_programmer, {"programmer": schemas.ProgrammerCreate},
+        schemas.Programmer, "employee_id"),
+    "update_programmer": BatchOperation(
+        programmer_operations.update_programmer,
+        {"programmer_id": int, "programmer_update": schemas.ProgrammerUpdate}, schemas.Programmer, "employee_id"),
+    "create_leader": BatchOperation(
+        leader_operations.create_leader, {"leader": schemas.LeaderCreate}, schemas.Leader, "employee_id"),
+    "update_leader": BatchOperation(
+        leader_operations.update_leader, {"leader_id": int, "leader_update": schemas.LeaderUpdate},
+        schemas.Leader, "employee_id"),
+    "create_team": BatchOperation(team_operations.create_team, {"team": schemas.TeamCreate}, schemas.Team, "id"),
+    "update_team": BatchOperation(
+        team_operations.update_team, {"team_id": int, "team": schemas.TeamCreate}, schemas.Team, "id"),
+    "add_team_member": BatchOperation(
+        team_operations.add_team_member, {"team_id": int, "programmer_id": int}, schemas.TeamMember),
+    "add_team_members": BatchOperation(
+        team_operations.add_team_members, {"team_id": int, "programmer_ids": List[int]},
+        schemas.TeamMembersBulkResult),
+    "remove_team_member": BatchOperation(
+        team_operations.remove_team_member, {"team_id": int, "programmer_id": int}, bool),
+    "remove_team_members": BatchOperation(
+        team_operations.remove_team_members, {"team_id": int, "programmer_ids": List[int]},
+        schemas.TeamMembersBulkResult),
+    "create_project": BatchOperation(
+        project_operations.create_project, {"project": schemas.ProjectCreate}, schemas.Project, "id"),
+    "update_project": BatchOperation(
+        project_operations.update_project, {"project_id": int, "project_update": schemas.ProjectBase},
+        schemas.Project, "id"),
+    "create_management_project": BatchOperation(
+        project_operations.create_management_project, {"management_project": schemas.ManagementProjectCreate},
+        schemas.ManagementProject, "project_id"),
+    "create_multimedia_project": BatchOperation(
+        project_operations.create_multimedia_project, {"multimedia_project": schemas.MultimediaProjectCreate},
+        schemas.MultimediaProject, "project_id"),
+    "delete_projects": BatchOperation(
+        project_operations.delete_projects, {"project_ids": List[int]}, schemas.BulkDeleteResult),
+    "delete_teams": BatchOperation(team_operations.delete_teams, {"team_ids": List[int]}, schemas.BulkDeleteResult),
+    "delete_employees": BatchOperation(
+        employee_operations.delete_employees, {"employee_ids": List[int]}, schemas.BulkDeleteResult),
+}
+
+def _resolve_references(value: Any, created: Dict[str, int]) -> Any:
+    """Sustituye los "$alias" de operaciones anteriores por sus IDs"""
+    if isinstance(value, dict):
+        return {key: _resolve_references(item, created) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve_references(item, created) for item in value]
+    if isinstance(value, str) and value.startswith(BATCH_REFERENCE_PREFIX):
+        name = value[len(BATCH_REFERENCE_PREFIX):]
+        if name in created:
+            return created[name]
+    return value
+
+def _run_operation(db: Session, name: str, args: Dict[str, Any], created: Dict[str, int]):
+    operation = BATCH_OPERATIONS.get(name)
+    if operation is None:
+        raise ValueError(f"Operación desconocida. Opciones: {', '.join(BATCH_OPERATIONS)}")
+    unknown = set(args).difference(operation.arguments)
+    if unknown:
+        raise ValueError(f"Argumentos desconocidos: {', '.join(sorted(unknown))}")
+    missing = set(operation.arguments).difference(args)
+    if missing:
+        raise ValueError(f"Faltan argumentos: {', '.join(sorted(missing))}")
+
+    args = _resolve_references(args, created)
+    values = {}
+    for key, adapter in operation.arguments.items():
+        try:
+            values[key] = adapter.validate_python(args[key])
+        except ValidationError as e:
+            raise ValueError("; ".join(
+                f"{'.'.join([key, *map(str, item['loc'])])}: {item['msg']}" for item in e.errors()
+            ))
+
+    outcome = operation.function(db, **values)
+    if outcome is None or outcome is False:
+        raise ValueError("Recurso no encontrado")
+    # Se vuelca dentro de la transacción para que las relaciones se carguen con la misma sesión
+    result = operation.response.dump_python(
+        operation.response.validate_python(outcome, from_attributes=True), mode="json"
+    )
+    return getattr(outcome, operation.id_field) if operation.id_field else None, result
+
+def run_batch(db: Session, operations: List[schemas.BatchOperationRequest]) -> List[dict]:
+    """
+    Ejecuta las operaciones en orden en una sola transacción y devuelve el resultado
+    de cada una. Si alguna falla se deshace todo el lote y el error indica cuál fue.
+    """
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        raise ValueError(f"Un lote admite como máximo {BATCH_MAX_OPERATIONS} operaciones")
+
+    created: Dict[str, int] = {}
+    results = []
+    # La nómina se recalcula una vez al final del lote, no en cada operación
+    with unit_of_work(db), payroll_operations.deferred_payroll(db):
+        for index, operation in enumerate(operations):
+            if operation.ref is not None and operation.ref in created:
+                raise ValueError(f"Operación {index} ({operation.op}): la referencia {operation.ref} ya existe")
+            try:
+                created_id, result = _run_operation(db, operation.op, operation.args, created)
+            except IntegrityError as e:
+                raise ValueError(f"Operación {index} ({operation.op}): {e.orig}")
+            except ValueError as e:
+                raise ValueError(f"Operación {index} ({operation.op}): {e}")
+            if operation.ref is not None:
+                if created_id is None:
+                    raise ValueError(f"Operación {index} ({operation.op}): no crea nada que se pueda referenciar")
+                created[operation.ref] = created_id
+            results.append({"index": index, "op": operation.op, "ref": operation.ref, "id": created_id, "result": result})
+    return results
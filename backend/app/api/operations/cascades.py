@@ -0,0 +1,49 @@
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional
+from app.api.operations.payroll_operations import chunked
+from app.api.operations.versioning import StaleVersionError
+
+# ---- BORRADOS EN CASCADA ----
+# Los borrados son sentencias DELETE por conjuntos de IDs sobre la tabla principal
+# (employees, teams, projects). Las filas que dependen de ellas las borra o
+# desasocia la propia base de datos con las reglas ON DELETE de models.py, y las
+# operaciones comprueban antes, con una consulta por regla, qué registros no se
+# pueden borrar (por ejemplo, un líder al frente de un equipo).
+#
+# Los borrados de un solo recurso llevan además la versión que se leyó
+# (WHERE id = ? AND version = ?), como el DELETE del ORM: si otra petición cambió
+# la fila entretanto no se borra nada y la operación lanza StaleVersionError.
+
+# IDs por sentencia (límite de 999 parámetros de SQLite)
+DELETE_CHUNK_SIZE = 900
+
+def unique_ids(ids: Iterable[int]) -> List[int]:
+    """IDs sin repetir, en el orden en que llegaron"""
+    return list(dict.fromkeys(ids))
+
+def delete_by_ids(db: Session, column, ids: Iterable[int], versions: Optional[Dict[int, int]] = None) -> None:
+    """
+    Ejecuta DELETE ... WHERE column IN (...) por bloques o, con versions (ID -> versión
+    leída), un DELETE por fila que solo borra esa versión. Como la base de datos
+    también borra filas dependientes que la sesión puede tener cargadas, al final
+    se expiran los objetos de la sesión: get_by_primary_key los vuelve a leer y no
+    devuelve filas que ya no existen.
+    """
+    ids = list(ids)
+    if not ids:
+        return
+    db.flush()
+    model = column.class_
+    if versions is not None:
+        for row_id in ids:
+            result = db.execute(
+                delete(model).where(column == row_id, model.version == versions[row_id]),
+                execution_options={"synchronize_session": False}
+            )
+            if result.rowcount == 0:
+                raise StaleVersionError()
+    else:
+        for chunk in chunked(ids, DELETE_CHUNK_SIZE):
+            db.execute(delete(model).where(column.in_(chunk)), execution_options={"synchronize_session": False})
+    db.expire_all()
@@ -1,45 +1,105 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from typing import Dict, Iterable, Optional
 from app.models import models
 from app.schemas import schemas
 from app.api.operations.utils import calculate_salary
+from app.api.operations import payroll_operations, pagination, lookups, cascades
+from app.api.operations.unit_of_work import unit_of_work
 
 # ---- Operaciones CRUD para Empleados ----
 def create_employee(db: Session, employee: schemas.EmployeeCreate):
-    db_employee = models.Employee(**employee.model_dump())
-    db.add(db_employee)
-    db.commit()
-    db.refresh(db_employee)
+    with unit_of_work(db):
+        db_employee = models.Employee(**employee.model_dump())
+        db.add(db_employee)
+        db.flush()
+        payroll_operations.refresh_employee_payroll(db, [db_employee.id])
     return db_employee
 
+_EMPLOYEE_BY_ID = lookups.lookup_statement(models.Employee.id)
+_EMPLOYEE_BY_IDENTITY = lookups.lookup_statement(models.Employee.identity_card)
+
 def get_employee(db: Session, employee_id: int):
-    return db.query(models.Employee).filter(models.Employee.id == employee_id).first()
+    return lookups.get_by_primary_key(db, _EMPLOYEE_BY_ID, models.Employee, employee_id)
 
 def get_employee_by_identity(db: Session, identity_card: str):
-    return db.query(models.Employee).filter(models.Employee.identity_card == identity_card).first()
+    return lookups.get_by_key(db, _EMPLOYEE_BY_IDENTITY, identity_card)
+
+# Órdenes admitidos en el listado (cada uno respaldado por un índice)
+EMPLOYEE_SORTS = {
+    "id": [(models.Employee.id, False)],
+    "-id": [(models.Employee.id, True)],
+    "name": [(models.Employee.name, False), (models.Employee.id, False)],
+    "base_salary": [(models.Employee.base_salary, False), (models.Employee.id, False)],
+    "-base_salary": [(models.Employee.base_salary, True), (models.Employee.id, True)],
+}
 
-def get_employees(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Employee).offset(skip).limit(limit).all()
+def get_employees(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, sort: str = "id"):
+    """Obtiene empleados paginados por offset (skip) o por cursor"""
+    return pagination.paginate(db.query(models.Employee), EMPLOYEE_SORTS, sort, cursor, skip, limit).all()
 
 def update_employee(db: Session, employee_id: int, employee_update: schemas.EmployeeUpdate):
-    db_employee = get_employee(db, employee_id)
-    if db_employee:
-        for key, value in employee_update.model_dump(exclude_unset=True).items():
-            if value is not None:
-                setattr(db_employee, key, value)
-        db.commit()
-        db.refresh(db_employee)
+    with unit_of_work(db):
+        db_employee = get_employee(db, employee_id)
+        if db_employee:
+            for key, value in employee_update.model_dump(exclude_unset=True).items():
+                if value is not None:
+                    setattr(db_employee, key, value)
+            payroll_operations.refresh_employee_payroll(db, [employee_id])
     return db_employee
 
+def employee_assignments_select(employee_ids: Iterable[int]):
+    """
+    (id, es miembro de un equipo, lidera un equipo) de los empleados indicados que
+    existen: una sola consulta, con EXISTS sobre los índices de las claves foráneas
+    """
+    in_team = select(models.TeamMember.programmer_id).where(
+        models.TeamMember.programmer_id == models.Employee.id).exists()
+    leads_team = select(models.Team.id).where(models.Team.leader_id == models.Employee.id).exists()
+    return select(models.Employee.id, in_team, leads_team).where(models.Employee.id.in_(list(employee_ids)))
+
+def delete_employees(db: Session, employee_ids: Iterable[int], versions: Optional[Dict[int, int]] = None) -> dict:
+    """
+    Elimina varios empleados en una sola transacción con un DELETE por bloque; su
+    fila de programador o líder, sus lenguajes y su nómina los borra la base de
+    datos (ON DELETE CASCADE). Los que no existen o están asignados a un equipo
+    se devuelven en conflicts. Con versions solo se borran esas versiones.
+    """
+    employee_ids = cascades.unique_ids(employee_ids)
+    with unit_of_work(db):
+        db.flush()
+        blocked = {}
+        for chunk in payroll_operations.chunked(employee_ids, cascades.DELETE_CHUNK_SIZE):
+            for employee_id, member, leader in db.execute(
+                employee_assignments_select(chunk)
+            ):
+                blocked[employee_id] = (
+                    "No se puede eliminar un líder asignado a un equipo" if leader
+                    else "No se puede eliminar un programador asignado a un equipo" if member else None
+                )
+
+        deleted, conflicts = [], []
+        for employee_id in employee_ids:
+            if employee_id not in blocked:
+                conflicts.append({"id": employee_id, "detail": "Empleado no encontrado"})
+            elif blocked[employee_id]:
+                conflicts.append({"id": employee_id, "detail": blocked[employee_id]})
+            else:
+                deleted.append(employee_id)
+
+        payroll_operations.forget_employee_payroll(db, deleted)
+        cascades.delete_by_ids(db, models.Employee.id, deleted, versions)
+    return {"deleted": deleted, "conflicts": conflicts}
+
 def delete_employee(db: Session, employee_id: int):
-    db_employee = get_employee(db, employee_id)
-    if db_employee:
-        db.delete(db_employee)
-        db.commit()
+    """Elimina un empleado con sus datos de programador o líder (solo la versión leída)"""
+    with unit_of_work(db):
+        db_employee = get_employee(db, employee_id)
+        if db_employee:
+            conflicts = delete_employees(db, [employee_id], {employee_id: db_employee.version})["conflicts"]
+            if conflicts:
+                raise ValueError(conflicts[0]["detail"])
     return db_employee
 
 def calculate_total_salary(db):
-    employees = db.query(models.Employee).all()
-    total = 0
-    for emp in employees:
-        total += calculate_salary(db, emp.id)
-    return total
+    return payroll_operations.get_payroll_total(db)
@@ -0,0 +1,198 @@
+import csv
+import io
+import json
+from pydantic import ValidationError
+from sqlalchemy import select, insert
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from app.models import models
+from app.schemas import schemas
+from app.api.operations import payroll_operations
+from app.api.operations.unit_of_work import unit_of_work
+
+# ---- IMPORTACIÓN MASIVA DE EMPLEADOS ----
+# Cada fila describe un empleado completo: los campos de EmployeeCreate más, según
+# type, los del programador (category y languages) o los del líder
+# (years_experience y projects_led). El archivo se lee fila a fila y se procesa por
+# bloques: se valida el bloque con los mismos esquemas que POST /programmers/ y
+# POST /leaders/, se comprueban sus cédulas con una sola consulta y se insertan las
+# filas válidas con INSERT masivos. Todo el archivo se confirma en una transacción.
+
+# Filas por bloque: 500 cédulas caben en un IN bajo el límite de 999 parámetros de SQLite
+IMPORT_CHUNK_SIZE = 500
+IMPORT_FORMATS = ("csv", "ndjson")
+IMPORT_EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+# Separador de lenguajes en la columna languages del CSV
+CSV_LANGUAGE_SEPARATOR = ";"
+# Categorías admitidas por la restricción programmer_category_check: una fila con otra
+# categoría haría fallar el INSERT de todo el bloque, así que se rechaza al validar
+PROGRAMMER_CATEGORIES = ("A", "B", "C")
+
+def import_format(format: Optional[str], filename: Optional[str] = None) -> str:
+    """Formato pedido o, si no se indica, el que corresponde a la extensión del archivo"""
+    if format is None and filename:
+        format = next(
+            (value for extension, value in IMPORT_EXTENSIONS.items() if filename.lower().endswith(extension)),
+            None
+        )
+    if format not in IMPORT_FORMATS:
+        raise ValueError(f"Formato de importación no soportado. Opciones: {', '.join(IMPORT_FORMATS)}")
+    return format
+
+def read_import_rows(stream, format: str) -> Iterator[Tuple[int, object]]:
+    """
+    Recorre un archivo binario (CSV con cabecera o NDJSON) sin cargarlo entero y
+    devuelve (número de fila, datos). Si una fila no se puede leer, datos es el
+    mensaje de error.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        yield from _parse_rows(text, format)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ValueError(f"No se pudo leer el archivo: {e}")
+    finally:
+        # El archivo pertenece a quien lo abrió
+        text.detach()
+
+def _parse_rows(text, format: str):
+    if format == "csv":
+        for row, record in enumerate(csv.DictReader(text), start=1):
+            languages = record.get("languages")
+            if languages is not None:
+                record["languages"] = languages.split(CSV_LANGUAGE_SEPARATOR)
+            yield row, {field: value for field, value in record.items() if field is not None and value not in ("", None)}
+    else:
+        row = 0
+        for line in text:
+            if not line.strip():
+                continue
+            row += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row, f"JSON inválido: {e.msg}"
+                continue
+            yield row, record if isinstance(record, dict) else "Cada línea debe ser un objeto JSON"
+
+def _validation_messages(error: ValidationError) -> List[str]:
+    messages = []
+    for item in error.errors():
+        location = [str(part) for part in item["loc"] if part != "employee_data"]
+        messages.append(f"{'.'.join(location)}: {item['msg']}" if location else item["msg"])
+    return messages
+
+def _validate_row(record: dict):
+    """Esquema de creación (ProgrammerCreate o LeaderCreate) de la fila"""
+    employee_data = {field: record[field] for field in schemas.EmployeeCreate.model_fields if field in record}
+    if record.get("type") == "leader":
+        return schemas.LeaderCreate(
+            employee_data=employee_data,
+            years_experience=record.get("years_experience"),
+            projects_led=record.get("projects_led", 0)
+        )
+    return schemas.ProgrammerCreate(
+        employee_id=0,
+        employee_data=employee_data,
+        category=record.get("category"),
+        languages=record.get("languages") or []
+    )
+
+def _import_chunk(db: Session, chunk: List[Tuple[int, object]], seen: set, report: dict) -> List[int]:
+    """Valida e inserta un bloque; devuelve los IDs de los empleados creados"""
+    def reject(row, identity_card, errors):
+        report["errors"].append({"row": row, "identity_card": identity_card, "errors": errors})
+
+    valid = []
+    for row, record in chunk:
+        if isinstance(record, str):
+            reject(row, None, [record])
+            continue
+        try:
+            item = _validate_row(record)
+        except ValidationError as e:
+            reject(row, record.get("identity_card"), _validation_messages(e))
+            continue
+        if isinstance(item, schemas.ProgrammerCreate) and item.category not in PROGRAMMER_CATEGORIES:
+            reject(row, item.employee_data.identity_card,
+                   [f"category: debe ser una de {', '.join(PROGRAMMER_CATEGORIES)}"])
+            continue
+        valid.append((row, item))
+
+    # Cédulas ya registradas: una consulta por bloque
+    cards = {item.employee_data.identity_card for _, item in valid}
+    existing = set(db.scalars(
+        select(models.Employee.identity_card).where(models.Employee.identity_card.in_(cards))
+    )) if cards else set()
+
+    accepted = []
+    for row, item in valid:
+        identity_card = item.employee_data.identity_card
+        if identity_card in existing:
+            reject(row, identity_card, [f"Ya existe un empleado con la cédula {identity_card}"])
+        elif identity_card in seen:
+            reject(row, identity_card, [f"La cédula {identity_card} está repetida en el archivo"])
+        else:
+            seen.add(identity_card)
+            accepted.append(item)
+    if not accepted:
+        return []
+
+    db.execute(insert(models.Employee), [
+        {**item.employee_data.model_dump(), "type": "leader" if isinstance(item, schemas.LeaderCreate) else "programmer"}
+        for item in accepted
+    ])
+    # IDs asignados, por cédula (en SQLite, RETURNING con orden garantizado insertaría fila a fila)
+    ids = dict(db.execute(
+        select(models.Employee.identity_card, models.Employee.id)
+        .where(models.Employee.identity_card.in_([item.employee_data.identity_card for item in accepted]))
+    ).all())
+
+    employee_ids = []
+    programmers, languages, leaders = [], [], []
+    for item in accepted:
+        employee_id = ids[item.employee_data.identity_card]
+        employee_ids.append(employee_id)
+        if isinstance(item, schemas.LeaderCreate):
+            leaders.append({
+                "employee_id": employee_id,
+                "years_experience": item.years_experience,
+                "projects_led": item.projects_led
+            })
+        else:
+            programmers.append({"employee_id": employee_id, "category": item.category})
+            languages.extend(
+                {"programmer_id": employee_id, "language": language} for language in dict.fromkeys(item.languages)
+            )
+    for model, rows in ((models.Programmer, programmers), (models.Leader, leaders),
+                        (models.ProgrammerLanguage, languages)):
+        if rows:
+            db.execute(insert(model), rows)
+
+    report["programmers"] += len(programmers)
+    report["leaders"] += len(leaders)
+    return employee_ids
+
+def import_employees(db: Session, rows: Iterable[Tuple[int, object]], chunk_size: int = IMPORT_CHUNK_SIZE) -> Dict:
+    """
+    Importa programadores y líderes desde rows (ver read_import_rows). Las filas
+    válidas se guardan en una sola transacción; las inválidas o con cédula repetida
+    se devuelven en el informe con su número de fila.
+    """
+    report = {"total": 0, "imported": 0, "programmers": 0, "leaders": 0, "errors": []}
+    seen = set()
+    employee_ids = []
+    chunk = []
+    with unit_of_work(db):
+        for row in rows:
+            report["total"] += 1
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                employee_ids.extend(_import_chunk(db, chunk, seen, report))
+                chunk = []
+        if chunk:
+            employee_ids.extend(_import_chunk(db, chunk, seen, report))
+
+        payroll_operations.refresh_employee_payroll(db, employee_ids)
+    report["imported"] = len(employee_ids)
+    return report
@@ -0,0 +1,32 @@
+from sqlalchemy import select, bindparam, inspect
+from sqlalchemy.orm import Session
+
+# ---- BÚSQUEDAS DE UNA SOLA FILA ----
+# get_employee, get_programmer, get_team, ... se llaman varias veces por petición.
+# En lugar de construir un db.query(...).filter(...) en cada llamada, cada búsqueda
+# usa una sentencia select() construida una sola vez con la clave como parámetro
+# ligado (SQLAlchemy reutiliza su forma compilada). Para las claves primarias se
+# mira antes el identity map de la sesión, como Session.get, pero si el objeto no
+# está se ejecuta la sentencia ya construida, que cuesta menos que la carga de
+# Session.get.
+
+def lookup_statement(column):
+    """Sentencia reutilizable que busca la entidad de column por igualdad con el parámetro "key" """
+    return select(column.class_).where(column == bindparam("key"))
+
+def get_by_key(db: Session, statement, key):
+    """Primera fila de statement para key (o None)"""
+    return db.scalars(statement, {"key": key}).first()
+
+def get_by_primary_key(db: Session, statement, model, key):
+    """
+    Como get_by_key, pero devuelve sin consultar el objeto que la sesión ya tenga
+    cargado. Las sesiones usan expire_on_commit=False, así que un commit no expira
+    nada; sí lo hacen un rollback y los borrados por conjuntos (cascades.delete_by_ids
+    llama a expire_all). Los objetos expirados se vuelven a leer con la sentencia,
+    para no devolver una fila que ya no existe.
+    """
+    instance = db.identity_map.get(db.identity_key(model, key))
+    if instance is not None and not inspect(instance).expired:
+        return instance
+    return get_by_key(db, statement, key)
@@ -0,0 +1,88 @@
+import base64
+import binascii
+import json
+from sqlalchemy import and_, or_
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# ---- PAGINACIÓN POR CURSOR (KEYSET) ----
+# Un orden es una lista de (columna, descendente) que termina siempre en la clave
+# primaria, para que el orden sea total. El cursor guarda los valores de esas
+# columnas en la última fila de la página; la página siguiente empieza
+# estrictamente después de ella, así que no hay que recorrer las filas anteriores
+# como ocurre con OFFSET.
+SortColumns = Sequence[Tuple[object, bool]]
+
+def sort_options(sorts: Dict[str, SortColumns]) -> str:
+    return ", ".join(sorts)
+
+def get_sort(sorts: Dict[str, SortColumns], sort: str) -> SortColumns:
+    """Devuelve las columnas del orden pedido o lanza ValueError si no está soportado"""
+    if sort not in sorts:
+        raise ValueError(f"Orden no soportado: '{sort}'. Opciones: {sort_options(sorts)}")
+    return sorts[sort]
+
+def encode_cursor(sort: str, values: List) -> str:
+    """Cursor opaco: JSON con el orden y los valores de la última fila, en base64 url-safe"""
+    payload = json.dumps({"sort": sort, "values": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort: str, size: int) -> List:
+    """Valida el cursor y devuelve los valores guardados; lanza ValueError si no es válido"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["values"]
+        cursor_sort = payload["sort"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValueError("Cursor inválido")
+    if cursor_sort != sort:
+        raise ValueError(f"El cursor corresponde al orden '{cursor_sort}', no a '{sort}'")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Cursor inválido")
+    # Solo escalares de columna: un dict o una lista llegarían como parámetro al SQL
+    if any(isinstance(value, bool) or not isinstance(value, (str, int, float, type(None))) for value in values):
+        raise ValueError("Cursor inválido")
+    return values
+
+def _after(columns: SortColumns, values: List):
+    """
+    Condición "fila posterior al cursor" para un orden de varias columnas:
+    (c1 > v1) OR (c1 = v1 AND c2 > v2) OR ... (con < en las columnas descendentes)
+    """
+    conditions = []
+    for index, (column, descending) in enumerate(columns):
+        equal = [col == value for (col, _), value in zip(columns[:index], values[:index])]
+        step = column < values[index] if descending else column > values[index]
+        conditions.append(and_(*equal, step))
+    return or_(*conditions)
+
+def paginate(query, sorts: Dict[str, SortColumns], sort: str = "id", cursor: Optional[str] = None,
+             skip: int = 0, limit: int = 100):
+    """
+    Aplica orden, cursor y límite a una consulta (Query o select).
+    Sin cursor se comporta como la paginación por offset de siempre, pero con orden estable.
+    """
+    columns = get_sort(sorts, sort)
+    if cursor:
+        query = query.where(_after(columns, decode_cursor(cursor, sort, len(columns))))
+    query = query.order_by(*[column.desc() if descending else column.asc() for column, descending in columns])
+    if skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+def next_cursor(items: List, sorts: Dict[str, SortColumns], sort: str, limit: int) -> Optional[str]:
+    """
+    Cursor de la página siguiente a partir de la última fila de items, o None si la
+    página no está llena (no hay más resultados). Acepta objetos ORM, filas o dicts.
+    """
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    read = last.get if isinstance(last, dict) else lambda key: getattr(last, key)
+    return encode_cursor(sort, [read(column.key) for column, _ in get_sort(sorts, sort)])
+
+def set_next_cursor(response, items: List, sorts: Dict[str, SortColumns], sort: str, limit: int):
+    """Publica el cursor de la página siguiente en la cabecera X-Next-Cursor"""
+    cursor = next_cursor(items, sorts, sort, limit)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
@@ -0,0 +1,68 @@
+import numpy as np
+from array import array
+from collections import defaultdict
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from app.schemas import schemas
+from app.api.operations import payroll_operations
+
+# ---- DISTRIBUCIÓN DE SALARIOS ----
+# Filas leídas del cursor por cada lote al recorrer la nómina
+STREAM_BATCH_SIZE = 5000
+# Grupo usado para los empleados sin proyecto asignado
+NO_PROJECT = "none"
+
+def describe_salaries(salaries: np.ndarray, bins: int = 10) -> schemas.SalaryDistribution:
+    """Resume un conjunto de salarios: mínimo, máximo, media, percentiles e histograma"""
+    p50, p90, p99 = np.percentile(salaries, [50, 90, 99])
+    counts, edges = np.histogram(salaries, bins=bins)
+    return schemas.SalaryDistribution(
+        count=int(salaries.size),
+        min=float(salaries.min()),
+        max=float(salaries.max()),
+        mean=float(salaries.mean()),
+        p50=float(p50),
+        p90=float(p90),
+        p99=float(p99),
+        histogram_edges=edges.tolist(),
+        histogram_counts=counts.tolist()
+    )
+
+def get_salary_distribution(db: Session, bins: int = 10) -> schemas.SalaryDistributionReport:
+    """
+    Calcula la distribución de salarios de toda la plantilla y su desglose por tipo
+    de empleado, categoría de programador y tipo de proyecto.
+
+    La nómina se recorre una sola vez en lotes de filas (sin objetos ORM) y los
+    salarios de cada grupo se acumulan en arreglos compactos de float.
+    """
+    overall = array('d')
+    groups = {
+        "by_employee_type": defaultdict(lambda: array('d')),
+        "by_category": defaultdict(lambda: array('d')),
+        "by_project_type": defaultdict(lambda: array('d')),
+    }
+
+    payroll = payroll_operations.payroll_select(dimensions=True).subquery("payroll")
+    query = select(
+        payroll.c.total_salary, payroll.c.type, payroll.c.category, payroll.c.project_type
+    ).execution_options(yield_per=STREAM_BATCH_SIZE)
+
+    for partition in db.execute(query).tuples().partitions():
+        for salary, employee_type, category, project_type in partition:
+            overall.append(salary)
+            groups["by_employee_type"][employee_type].append(salary)
+            if category is not None:
+                groups["by_category"][category].append(salary)
+            groups["by_project_type"][project_type or NO_PROJECT].append(salary)
+
+    def describe(values):
+        return describe_salaries(np.frombuffer(values, dtype=np.float64), bins)
+
+    return schemas.SalaryDistributionReport(
+        overall=describe(overall) if overall else None,
+        **{
+            name: {key: describe(values) for key, values in sorted(group.items())}
+            for name, group in groups.items()
+        }
+    )
@@ -0,0 +1,382 @@
+from contextlib import contextmanager
+from sqlalchemy.orm import Session, aliased, outerjoin
+from sqlalchemy import select, func, case, insert, update, delete
+from typing import Dict, Iterable, List, Optional
+from app.models import models
+from app.api.operations.unit_of_work import unit_of_work
+
+# ---- MOTOR DE NÓMINA ----
+# Coeficientes de la fórmula de salario (ver calculate_salary en utils.py)
+PROGRAMMER_PROJECT_RATE = 0.05
+PROGRAMMER_LANGUAGE_BONUS = 3
+LEADER_PROJECT_RATE = 0.10
+LEADER_EXPERIENCE_BONUS = 5
+
+# Empleados por consulta cuando se filtra por ID: el motor repite la lista IN
+# cuatro veces, así que 200 IDs se mantienen bajo el límite de 999 parámetros de SQLite
+PAYROLL_CHUNK_SIZE = 200
+
+def chunked(ids: Iterable[int], size: int = PAYROLL_CHUNK_SIZE):
+    """Divide una colección de IDs en listas de como máximo size elementos"""
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+def _payroll_source(ids: Optional[List[int]] = None):
+    """
+    Arma el FROM del motor de nómina y las columnas de entrada de la fórmula.
+
+    Los lenguajes, el equipo del programador y el equipo del líder se agregan en
+    subconsultas (una fila por empleado) y se unen con LEFT JOIN, de modo que la
+    nómina completa se resuelve en una sola sentencia SQL.
+    Si se indican ids, el filtro se aplica también dentro de las subconsultas.
+    """
+    language_counts = select(
+        models.ProgrammerLanguage.programmer_id.label("programmer_id"),
+        func.count().label("languages_count")
+    ).group_by(models.ProgrammerLanguage.programmer_id)
+
+    # Equipo del programador (el primero si hubiera varios, como hacía .first())
+    member_teams = select(
+        models.TeamMember.programmer_id.label("programmer_id"),
+        func.min(models.TeamMember.team_id).label("team_id")
+    ).group_by(models.TeamMember.programmer_id)
+
+    # Equipo que lidera el líder (el primero si lidera varios)
+    leader_teams = select(
+        models.Team.leader_id.label("leader_id"),
+        func.min(models.Team.id).label("team_id")
+    ).where(models.Team.leader_id.isnot(None)).group_by(models.Team.leader_id)
+
+    if ids is not None:
+        language_counts = language_counts.where(models.ProgrammerLanguage.programmer_id.in_(ids))
+        member_teams = member_teams.where(models.TeamMember.programmer_id.in_(ids))
+        leader_teams = leader_teams.where(models.Team.leader_id.in_(ids))
+
+    language_counts = language_counts.subquery("language_counts")
+    member_teams = member_teams.subquery("member_teams")
+    leader_teams = leader_teams.subquery("leader_teams")
+    programmer_project = aliased(models.Project, name="programmer_project")
+    leader_project = aliased(models.Project, name="leader_project")
+
+    source = outerjoin(
+        models.Employee, models.Programmer, models.Programmer.employee_id == models.Employee.id
+    ).outerjoin(
+        language_counts, language_counts.c.programmer_id == models.Employee.id
+    ).outerjoin(
+        member_teams, member_teams.c.programmer_id == models.Employee.id
+    ).outerjoin(
+        programmer_project, programmer_project.team_id == member_teams.c.team_id
+    ).outerjoin(
+        models.Leader, models.Leader.employee_id == models.Employee.id
+    ).outerjoin(
+        leader_teams, leader_teams.c.leader_id == models.Employee.id
+    ).outerjoin(
+        leader_project, leader_project.team_id == leader_teams.c.team_id
+    )
+
+    inputs = {
+        "employee_id": models.Employee.id,
+        "name": models.Employee.name,
+        "type": models.Employee.type,
+        "base_salary": models.Employee.base_salary,
+        "category": models.Programmer.category,
+        "languages_count": func.coalesce(language_counts.c.languages_count, 0),
+        "programmer_project_price": func.coalesce(programmer_project.price, 0.0),
+        "years_experience": func.coalesce(models.Leader.years_experience, 0),
+        "leader_project_price": func.coalesce(leader_project.price, 0.0),
+        "project_type": case(
+            (models.Employee.type == "programmer", programmer_project.type),
+            (models.Employee.type == "leader", leader_project.type)
+        ),
+    }
+    return source, inputs
+
+def payroll_inputs_select(employee_ids: Optional[Iterable[int]] = None):
+    """Consulta con los datos de entrada de la fórmula de salario, una fila por empleado"""
+    ids = list(employee_ids) if employee_ids is not None else None
+    source, inputs = _payroll_source(ids)
+    query = select(*[column.label(name) for name, column in inputs.items()]).select_from(source)
+    if ids is not None:
+        query = query.where(models.Employee.id.in_(ids))
+    return query
+
+def payroll_select(employee_ids: Optional[Iterable[int]] = None, dimensions: bool = False):
+    """
+    Construye una única consulta que calcula el salario total de cada empleado.
+    Con dimensions=True incluye además tipo de empleado, categoría y tipo de proyecto.
+    """
+    ids = list(employee_ids) if employee_ids is not None else None
+    source, inputs = _payroll_source(ids)
+
+    base_salary = inputs["base_salary"]
+    total_salary = case(
+        (
+            inputs["type"] == "programmer",
+            base_salary
+            + PROGRAMMER_PROJECT_RATE * inputs["programmer_project_price"]
+            + PROGRAMMER_LANGUAGE_BONUS * inputs["languages_count"]
+        ),
+        (
+            inputs["type"] == "leader",
+            base_salary
+            + LEADER_PROJECT_RATE * inputs["leader_project_price"]
+            + LEADER_EXPERIENCE_BONUS * inputs["years_experience"]
+        ),
+        else_=base_salary
+    )
+
+    query = select(
+        inputs["employee_id"].label("employee_id"),
+        inputs["name"].label("name"),
+        total_salary.label("total_salary"),
+        *([
+            inputs["type"].label("type"),
+            inputs["category"].label("category"),
+            inputs["project_type"].label("project_type")
+        ] if dimensions else [])
+    ).select_from(source)
+
+    if ids is not None:
+        query = query.where(models.Employee.id.in_(ids))
+    return query
+
+def get_payroll(db: Session, employee_ids: Optional[Iterable[int]] = None,
+                chunk_size: int = PAYROLL_CHUNK_SIZE) -> Dict[int, float]:
+    """
+    Devuelve {employee_id: salario_total} para los empleados indicados (o todos).
+    Con una lista de IDs se ejecuta una consulta por bloque de chunk_size empleados.
+    """
+    if employee_ids is None:
+        rows = db.execute(payroll_select()).all()
+        return {row.employee_id: float(row.total_salary) for row in rows}
+
+    payroll = {}
+    for chunk in chunked(set(employee_ids), chunk_size):
+        for row in db.execute(payroll_select(chunk)):
+            payroll[row.employee_id] = float(row.total_salary)
+    return payroll
+
+def _stored_payroll(db: Session, ids: Iterable[int]) -> Dict[int, float]:
+    """Lee las filas de employee_payroll de los empleados indicados, por bloques"""
+    stored = {}
+    for chunk in chunked(ids, 900):
+        stored.update(db.execute(
+            select(models.EmployeePayroll.employee_id, models.EmployeePayroll.total_salary)
+            .where(models.EmployeePayroll.employee_id.in_(chunk))
+        ).all())
+    return stored
+
+def calculate_payroll_total(db: Session) -> float:
+    """Suma la nómina completa en la base de datos con una sola consulta agregada"""
+    payroll = payroll_select().subquery("payroll")
+    total = db.execute(
+        select(func.coalesce(func.sum(payroll.c.total_salary), 0.0))
+    ).scalar()
+    return float(total)
+
+def get_payroll_ranking(db: Session, limit: int = 5, offset: int = 0, min_salary: Optional[float] = None) -> List:
+    """
+    Devuelve el ranking de salarios de toda la plantilla (mayor a menor).
+
+    Se lee de la nómina materializada usando el índice ix_employee_payroll_ranking,
+    por lo que solo se recorren las filas de la página solicitada.
+    """
+    payroll = models.EmployeePayroll
+    query = select(
+        payroll.employee_id, models.Employee.name, payroll.total_salary
+    ).join(models.Employee, models.Employee.id == payroll.employee_id)
+    if min_salary is not None:
+        query = query.where(payroll.total_salary >= min_salary)
+    query = query.order_by(
+        payroll.total_salary.desc(), payroll.employee_id.asc()
+    ).offset(offset).limit(limit)
+    return db.execute(query).all()
+
+# ---- NÓMINA MATERIALIZADA ----
+def get_payroll_total(db: Session) -> float:
+    """Lee el total acumulado de la nómina (O(1)); si aún no existe, lo calcula"""
+    total = db.execute(
+        select(models.PayrollSummary.total_salary).where(models.PayrollSummary.id == 1)
+    ).scalar()
+    if total is None:
+        return calculate_payroll_total(db)
+    return float(total)
+
+def rebuild_payroll(db: Session) -> float:
+    """
+    Recalcula por completo la nómina materializada y su total (no hace commit).
+    Se resuelve en la base de datos con INSERT ... SELECT, sin traer las filas a Python.
+    """
+    db.flush()
+    db.execute(delete(models.EmployeePayroll))
+    payroll = payroll_select().subquery("payroll")
+    db.execute(insert(models.EmployeePayroll).from_select(
+        ["employee_id", "total_salary"],
+        select(payroll.c.employee_id, payroll.c.total_salary)
+    ))
+
+    total, count = db.execute(select(
+        func.coalesce(func.sum(models.EmployeePayroll.total_salary), 0.0), func.count()
+    ).select_from(models.EmployeePayroll)).one()
+    db.execute(delete(models.PayrollSummary))
+    db.execute(insert(models.PayrollSummary).values(id=1, total_salary=total, employee_count=count))
+    return float(total)
+
+def _summary_exists(db: Session) -> bool:
+    return db.execute(
+        select(models.PayrollSummary.id).where(models.PayrollSummary.id == 1)
+    ).first() is not None
+
+def ensure_payroll(db: Session):
+    """Construye la nómina materializada si la base de datos todavía no la tiene"""
+    if not _summary_exists(db):
+        with unit_of_work(db):
+            rebuild_payroll(db)
+
+def _adjust_summary(db: Session, salary_delta: float, count_delta: int):
+    """Aplica la diferencia al total acumulado con un UPDATE atómico en SQL"""
+    if not salary_delta and not count_delta:
+        return
+    db.execute(
+        update(models.PayrollSummary)
+        .where(models.PayrollSummary.id == 1)
+        .values(
+            total_salary=models.PayrollSummary.total_salary + salary_delta,
+            employee_count=models.PayrollSummary.employee_count + count_delta
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+# ---- RECÁLCULO DIFERIDO ----
+# Dentro de deferred_payroll, refresh_employee_payroll solo anota los empleados y
+# el recálculo se hace una vez para todos al salir del bloque (antes del commit).
+# Lo usan las operaciones que encadenan muchas escrituras, como los lotes, para no
+# recalcular la nómina en cada paso. El resultado es el mismo: el recálculo compara
+# el estado final con lo guardado.
+_DEFERRED_KEY = "payroll_deferred_ids"
+
+@contextmanager
+def deferred_payroll(db: Session):
+    """Agrupa los recálculos de nómina del bloque en uno solo al terminar"""
+    if _DEFERRED_KEY in db.info:
+        # Bloque anidado: el externo hará el recálculo
+        yield
+        return
+    pending = db.info[_DEFERRED_KEY] = set()
+    try:
+        yield
+    finally:
+        db.info.pop(_DEFERRED_KEY, None)
+    refresh_employee_payroll(db, pending)
+
+def refresh_employee_payroll(db: Session, employee_ids: Iterable[int]):
+    """
+    Recalcula las filas de nómina de los empleados indicados y ajusta el total
+    acumulado con la diferencia. Los empleados que ya no existen se eliminan.
+    Debe llamarse antes del commit de la operación de escritura.
+    """
+    ids = {employee_id for employee_id in employee_ids if employee_id is not None}
+    if not ids:
+        return
+    deferred = db.info.get(_DEFERRED_KEY)
+    if deferred is not None:
+        deferred.update(ids)
+        return
+
+    db.flush()
+    if not _summary_exists(db):
+        rebuild_payroll(db)
+        return
+
+    current = get_payroll(db, ids)
+    stored = _stored_payroll(db, ids)
+
+    updated = [
+        {"employee_id": employee_id, "total_salary": total}
+        for employee_id, total in current.items()
+        if employee_id in stored and stored[employee_id] != total
+    ]
+    added = [
+        {"employee_id": employee_id, "total_salary": total}
+        for employee_id, total in current.items()
+        if employee_id not in stored
+    ]
+    removed = [employee_id for employee_id in stored if employee_id not in current]
+
+    if updated:
+        db.execute(update(models.EmployeePayroll), updated)
+    if added:
+        db.execute(insert(models.EmployeePayroll), added)
+    for chunk in chunked(removed, 900):
+        db.execute(delete(models.EmployeePayroll).where(models.EmployeePayroll.employee_id.in_(chunk)))
+
+    _adjust_summary(db, sum(current.values()) - sum(stored.values()), len(added) - len(removed))
+
+def forget_employee_payroll(db: Session, employee_ids: Iterable[int]):
+    """Quita de la nómina a los empleados indicados (llamar antes de borrarlos)"""
+    ids = {employee_id for employee_id in employee_ids if employee_id is not None}
+    if not ids:
+        return
+
+    stored = _stored_payroll(db, ids)
+    if not stored:
+        return
+
+    for chunk in chunked(stored, 900):
+        db.execute(delete(models.EmployeePayroll).where(models.EmployeePayroll.employee_id.in_(chunk)))
+    _adjust_summary(db, -sum(stored.values()), -len(stored))
+
+def team_employee_ids(db: Session, team_ids: Iterable[int]) -> set:
+    """Devuelve los IDs del líder y de los programadores de los equipos indicados"""
+    ids = {team_id for team_id in team_ids if team_id is not None}
+    if not ids:
+        return set()
+
+    db.flush()
+    members = db.execute(
+        select(models.TeamMember.programmer_id).where(models.TeamMember.team_id.in_(ids))
+    ).scalars().all()
+    leaders = db.execute(
+        select(models.Team.leader_id).where(models.Team.id.in_(ids), models.Team.leader_id.isnot(None))
+    ).scalars().all()
+    return set(members) | set(leaders)
+
+def refresh_team_payroll(db: Session, team_ids: Iterable[int], extra_employee_ids: Iterable[int] = ()):
+    """Recalcula la nómina del líder y los miembros de los equipos indicados"""
+    refresh_employee_payroll(db, team_employee_ids(db, team_ids) | set(extra_employee_ids))
+
+def verify_payroll(db: Session, tolerance: float = 0.01) -> dict:
+    """
+    Compara la nómina materializada con un recálculo completo.
+    Devuelve las diferencias encontradas por empleado y en el total acumulado.
+    """
+    expected = get_payroll(db)
+    stored = dict(db.execute(
+        select(models.EmployeePayroll.employee_id, models.EmployeePayroll.total_salary)
+    ).all())
+
+    mismatches = []
+    for employee_id in sorted(set(expected) | set(stored)):
+        expected_salary = expected.get(employee_id)
+        stored_salary = stored.get(employee_id)
+        if (expected_salary is None or stored_salary is None
+                or abs(expected_salary - stored_salary) > tolerance):
+            mismatches.append({
+                "employee_id": employee_id,
+                "expected": expected_salary,
+                "stored": stored_salary
+            })
+
+    expected_total = sum(expected.values())
+    stored_total = db.execute(
+        select(models.PayrollSummary.total_salary).where(models.PayrollSummary.id == 1)
+    ).scalar()
+    total_ok = stored_total is not None and abs(expected_total - stored_total) <= tolerance
+
+    return {
+        "ok": not mismatches and total_ok,
+        "mismatches": mismatches,
+        "expected_total": expected_total,
+        "stored_total": stored_total
+    }
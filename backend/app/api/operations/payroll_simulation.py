@@ -0,0 +1,114 @@
+import numpy as np
+from sqlalchemy.orm import Session
+from typing import List
+from app.schemas import schemas
+from app.api.operations import payroll_operations
+from app.api.operations.payroll_analytics import describe_salaries
+
+# ---- SIMULADOR DE NÓMINA (WHAT-IF) ----
+CATEGORY_CODES = {"A": 0, "B": 1, "C": 2}
+# Escenarios evaluados a la vez; acota la memoria a SCENARIO_BATCH_SIZE x empleados
+SCENARIO_BATCH_SIZE = 16
+
+class PayrollInputs:
+    """Entradas de la fórmula de salario en arreglos de NumPy (una posición por empleado)"""
+
+    def __init__(self, rows):
+        columns = list(zip(*rows)) if rows else [()] * 10
+        (employee_ids, _names, types, base_salaries, categories, languages_counts,
+         programmer_prices, years_experience, leader_prices, _project_types) = columns
+
+        self.employee_ids = np.array(employee_ids, dtype=np.int64)
+        self.base_salary = np.array(base_salaries, dtype=np.float64)
+        self.languages_count = np.array(languages_counts, dtype=np.float64)
+        self.programmer_project_price = np.array(programmer_prices, dtype=np.float64)
+        self.years_experience = np.array(years_experience, dtype=np.float64)
+        self.leader_project_price = np.array(leader_prices, dtype=np.float64)
+        self.is_programmer = np.array([t == "programmer" for t in types], dtype=bool)
+        self.is_leader = np.array([t == "leader" for t in types], dtype=bool)
+        # Código 3 = sin categoría (líderes o programadores sin registro)
+        self.category_code = np.array([CATEGORY_CODES.get(c, 3) for c in categories], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.employee_ids)
+
+def load_payroll_inputs(db: Session) -> PayrollInputs:
+    """Carga las entradas de la nómina con una sola consulta"""
+    rows = db.execute(payroll_operations.payroll_inputs_select()).all()
+    return PayrollInputs(rows)
+
+def baseline_scenario() -> schemas.PayrollScenario:
+    """Escenario con los coeficientes vigentes del motor de nómina"""
+    return schemas.PayrollScenario(
+        name="baseline",
+        programmer_project_rate=payroll_operations.PROGRAMMER_PROJECT_RATE,
+        programmer_language_bonus=payroll_operations.PROGRAMMER_LANGUAGE_BONUS,
+        leader_project_rate=payroll_operations.LEADER_PROJECT_RATE,
+        leader_experience_bonus=payroll_operations.LEADER_EXPERIENCE_BONUS
+    )
+
+def evaluate_scenarios(inputs: PayrollInputs, scenarios: List[schemas.PayrollScenario]) -> np.ndarray:
+    """
+    Evalúa todos los escenarios de una vez.
+    Devuelve una matriz (escenarios x empleados) con el salario total simulado.
+    """
+    def column(attribute):
+        return np.array([getattr(s, attribute) for s in scenarios], dtype=np.float64)[:, None]
+
+    # Lenguajes extra por categoría: matriz (escenarios x 4), la última columna es "sin categoría"
+    extra_by_category = np.zeros((len(scenarios), 4), dtype=np.float64)
+    for index, scenario in enumerate(scenarios):
+        for category, extra in scenario.extra_languages.items():
+            extra_by_category[index, CATEGORY_CODES[category]] = extra
+    languages = inputs.languages_count[None, :] + extra_by_category[:, inputs.category_code]
+
+    base = inputs.base_salary[None, :] * column("base_salary_factor")
+    programmer_salary = (
+        base
+        + column("programmer_project_rate") * inputs.programmer_project_price[None, :]
+        + column("programmer_language_bonus") * languages
+    )
+    leader_salary = (
+        base
+        + column("leader_project_rate") * inputs.leader_project_price[None, :]
+        + column("leader_experience_bonus") * (inputs.years_experience[None, :] + column("extra_years_experience"))
+    )
+    return np.where(
+        inputs.is_programmer[None, :], programmer_salary,
+        np.where(inputs.is_leader[None, :], leader_salary, base)
+    )
+
+def simulate_payroll(db: Session, scenarios: List[schemas.PayrollScenario],
+                     histogram_bins: int = 10) -> schemas.PayrollSimulationResult:
+    """
+    Carga la nómina una sola vez y evalúa los escenarios por lotes vectorizados.
+    Para cada escenario devuelve el total, la diferencia con la nómina vigente y la
+    distribución de salarios por empleado.
+    """
+    inputs = load_payroll_inputs(db)
+    baseline = evaluate_scenarios(inputs, [baseline_scenario()])[0]
+    baseline_total = float(baseline.sum())
+
+    results = []
+    for start in range(0, len(scenarios), SCENARIO_BATCH_SIZE):
+        batch = scenarios[start:start + SCENARIO_BATCH_SIZE]
+        salaries = evaluate_scenarios(inputs, batch)
+        totals = salaries.sum(axis=1)
+        affected = (np.abs(salaries - baseline[None, :]) > 1e-9).sum(axis=1)
+
+        for index, scenario in enumerate(batch):
+            delta = float(totals[index]) - baseline_total
+            results.append(schemas.PayrollScenarioResult(
+                name=scenario.name,
+                total=float(totals[index]),
+                delta=delta,
+                delta_percent=(delta / baseline_total * 100) if baseline_total else 0.0,
+                employees_affected=int(affected[index]),
+                distribution=describe_salaries(salaries[index], histogram_bins) if len(inputs) else None
+            ))
+
+    return schemas.PayrollSimulationResult(
+        employee_count=len(inputs),
+        baseline_total=baseline_total,
+        scenarios=results
+    )
@@ -1,128 +1,246 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select, func, insert, delete, tuple_
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from app.models import models
 from app.schemas import schemas
-from app.api.operations import employee_operations
+from app.api.operations import employee_operations, payroll_operations, pagination, lookups
+from app.api.operations.unit_of_work import unit_of_work
 
 # ---- OPERACIONES CRUD PARA PROGRAMADORES ----
 def create_programmer(db: Session, programmer: schemas.ProgrammerCreate):
     """Crea un nuevo programador con sus datos de empleado y lenguajes"""
-    # Crear el empleado primero
-    db_employee = models.Employee(
-        identity_card=programmer.employee_data.identity_card,
-        name=programmer.employee_data.name,
-        age=programmer.employee_data.age,
-        sex=programmer.employee_data.sex,
-        base_salary=programmer.employee_data.base_salary,
-        type="programmer"
-    )
-    db.add(db_employee)
-    db.commit()
-    db.refresh(db_employee)
-    
-    # Crear el programador
-    db_programmer = models.Programmer(
-        employee_id=db_employee.id,
-        category=programmer.category
-    )
-    db.add(db_programmer)
-    
-    # Agregar lenguajes si existen
-    if programmer.languages:
-        for language in programmer.languages:
-            db_language = models.ProgrammerLanguage(
-                programmer_id=db_employee.id,
-                language=language
-            )
-            db.add(db_language)
-    
-    db.commit()
-    db.refresh(db_programmer)
+    with unit_of_work(db):
+        # Crear el empleado primero (el flush le asigna el ID)
+        db_employee = models.Employee(
+            identity_card=programmer.employee_data.identity_card,
+            name=programmer.employee_data.name,
+            age=programmer.employee_data.age,
+            sex=programmer.employee_data.sex,
+            base_salary=programmer.employee_data.base_salary,
+            type="programmer"
+        )
+        db.add(db_employee)
+        db.flush()
+
+        # Crear el programador
+        db_programmer = models.Programmer(
+            employee_id=db_employee.id,
+            category=programmer.category
+        )
+        db.add(db_programmer)
+        # ProgrammerLanguage no tiene relación ORM con Programmer, así que el flush no
+        # sabe ordenar sus INSERT: el programador se inserta antes
+        db.flush()
+
+        # Agregar lenguajes si existen
+        if programmer.languages:
+            for language in programmer.languages:
+                db_language = models.ProgrammerLanguage(
+                    programmer_id=db_employee.id,
+                    language=language
+                )
+                db.add(db_language)
+
+        payroll_operations.refresh_employee_payroll(db, [db_employee.id])
     return db_programmer
 
+_PROGRAMMER_BY_ID = lookups.lookup_statement(models.Programmer.employee_id)
+
 def get_programmer(db: Session, programmer_id: int):
     """Obtiene un programador por su ID"""
-    return db.query(models.Programmer).filter(models.Programmer.employee_id == programmer_id).first()
+    return lookups.get_by_primary_key(db, _PROGRAMMER_BY_ID, models.Programmer, programmer_id)
 
 def get_programmers(db: Session, skip: int = 0, limit: int = 100):
     """Obtiene todos los programadores con paginación"""
     return db.query(models.Programmer).offset(skip).limit(limit).all()
 
+# Separador de group_concat: un carácter de control que no aparece en los nombres de lenguajes
+LANGUAGE_SEPARATOR = "\x1f"
+
+PROGRAMMER_SORTS = {
+    "id": [(models.Programmer.employee_id, False)],
+    "category": [(models.Programmer.category, False), (models.Programmer.employee_id, False)],
+}
+
+def _programmer_page_select(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, sort: str = "id"):
+    """
+    Página de programadores con sus lenguajes agregados en SQL (group_concat).
+    Primero se recorta la página y después se unen los lenguajes, así el GROUP BY
+    solo procesa las filas de la página.
+    """
+    page = pagination.paginate(
+        select(models.Programmer.employee_id, models.Programmer.category),
+        PROGRAMMER_SORTS, sort, cursor, skip, limit
+    ).subquery("page")
+    order = [
+        page.c[column.key].desc() if descending else page.c[column.key].asc()
+        for column, descending in PROGRAMMER_SORTS[sort]
+    ]
+    return select(
+        page.c.employee_id,
+        page.c.category,
+        func.group_concat(models.ProgrammerLanguage.language, LANGUAGE_SEPARATOR).label("languages")
+    ).outerjoin(
+        models.ProgrammerLanguage, models.ProgrammerLanguage.programmer_id == page.c.employee_id
+    ).group_by(page.c.employee_id, page.c.category).order_by(*order)
+
+def _programmer_listing(rows) -> List[dict]:
+    return [
+        {
+            "employee_id": row.employee_id,
+            "category": row.category,
+            "languages": sorted(row.languages.split(LANGUAGE_SEPARATOR)) if row.languages else []
+        }
+        for row in rows
+    ]
+
+def list_programmers(db: Session, skip: int = 0, limit: int = 100,
+                     cursor: Optional[str] = None, sort: str = "id") -> List[dict]:
+    """Obtiene una página de programadores con sus lenguajes en una sola consulta"""
+    return _programmer_listing(db.execute(_programmer_page_select(skip, limit, cursor, sort)).all())
+
+def iter_programmers(db: Session, batch_size: int = 1000) -> Iterator[dict]:
+    """
+    Recorre todos los programadores por lotes (paginación por cursor), con una
+    consulta por lote. Pensado para respuestas en streaming.
+    """
+    cursor = None
+    while True:
+        batch = list_programmers(db, limit=batch_size, cursor=cursor)
+        yield from batch
+        cursor = pagination.next_cursor(batch, PROGRAMMER_SORTS, "id", batch_size)
+        if cursor is None:
+            return
+
 def update_programmer(db: Session, programmer_id: int, programmer_update: schemas.ProgrammerUpdate):
     """Actualiza los datos de un programador"""
-    db_programmer = get_programmer(db, programmer_id)
-    if db_programmer:
-        # Actualizar datos básicos
-        if programmer_update.category:
-            db_programmer.category = programmer_update.category
-        
-        # Actualizar lenguajes si se proporcionan
-        if programmer_update.languages is not None:
-            # Eliminar lenguajes existentes
-            db.query(models.ProgrammerLanguage).filter(
-                models.ProgrammerLanguage.programmer_id == programmer_id
-            ).delete()
-            
-            # Agregar nuevos lenguajes
-            for language in programmer_update.languages:
-                db_language = models.ProgrammerLanguage(
-                    programmer_id=programmer_id,
-                    language=language
-                )
-                db.add(db_language)
-        
-        db.commit()
-        db.refresh(db_programmer)
+    with unit_of_work(db):
+        db_programmer = get_programmer(db, programmer_id)
+        if db_programmer:
+            changed = False
+            # Actualizar datos básicos
+            if programmer_update.category and programmer_update.category != db_programmer.category:
+                db_programmer.category = programmer_update.category
+                changed = True
+
+            # Actualizar lenguajes si se proporcionan: solo se tocan los que cambian
+            if programmer_update.languages is not None:
+                stored = _stored_languages(db, [programmer_id])
+                change = _apply_language_changes(db, {programmer_id: programmer_update.languages}, stored)
+                changed = changed or bool(change[programmer_id]["added"] or change[programmer_id]["removed"])
+
+            if changed:
+                payroll_operations.refresh_employee_payroll(db, [programmer_id])
     return db_programmer
 
+# ---- LENGUAJES POR DIFERENCIA ----
+# Al actualizar lenguajes se compara la lista pedida con la guardada y solo se
+# borran los que sobran y se insertan los que faltan; los que se mantienen no se
+# reescriben. Los cambios de varios programadores se aplican con un DELETE y un
+# INSERT para todos.
+
+# Pares (programmer_id, language) por DELETE: cada par usa dos parámetros y su ID otro
+# más en el filtro por programmer_id, así que 300 pares quedan bajo el límite de 999 de SQLite
+LANGUAGE_PAIRS_PER_DELETE = 300
+
+def _stored_languages(db: Session, programmer_ids: List[int]) -> Dict[int, Set[str]]:
+    """Lenguajes guardados de los programadores que existen (los que no existen no aparecen)"""
+    stored = {}
+    for chunk in payroll_operations.chunked(programmer_ids, 900):
+        for programmer_id, language in db.query(
+            models.Programmer.employee_id, models.ProgrammerLanguage.language
+        ).outerjoin(
+            models.ProgrammerLanguage, models.ProgrammerLanguage.programmer_id == models.Programmer.employee_id
+        ).filter(models.Programmer.employee_id.in_(chunk)):
+            languages = stored.setdefault(programmer_id, set())
+            if language is not None:
+                languages.add(language)
+    return stored
+
+def _apply_language_changes(db: Session, requested: Dict[int, List[str]],
+                            stored: Dict[int, Set[str]]) -> Dict[int, dict]:
+    """Borra e inserta solo las diferencias; devuelve lo añadido y quitado por programador"""
+    changes = {}
+    removals, additions = [], []
+    for programmer_id, languages in requested.items():
+        wanted = list(dict.fromkeys(languages))
+        current = stored.get(programmer_id, set())
+        added = [language for language in wanted if language not in current]
+        removed = sorted(current.difference(wanted))
+        changes[programmer_id] = {"added": added, "removed": removed}
+        removals.extend((programmer_id, language) for language in removed)
+        additions.extend({"programmer_id": programmer_id, "language": language} for language in added)
+
+    for chunk in payroll_operations.chunked(removals, LANGUAGE_PAIRS_PER_DELETE):
+        db.execute(
+            # Sin el filtro por programmer_id, SQLite resuelve el IN de pares recorriendo toda la tabla
+            delete(models.ProgrammerLanguage).where(
+                models.ProgrammerLanguage.programmer_id.in_({programmer_id for programmer_id, _ in chunk}),
+                tuple_(models.ProgrammerLanguage.programmer_id, models.ProgrammerLanguage.language).in_(chunk)
+            ),
+            execution_options={"synchronize_session": False}
+        )
+    if additions:
+        db.execute(insert(models.ProgrammerLanguage), additions)
+    return changes
+
+def update_programmers_languages(db: Session, updates: Iterable[Tuple[int, List[str]]]) -> dict:
+    """
+    Reemplaza los lenguajes de varios programadores en una sola transacción,
+    aplicando solo las diferencias. Los programadores inexistentes o repetidos en
+    la solicitud se devuelven en conflicts y no se modifican.
+    """
+    requested, conflicts = {}, []
+    for programmer_id, languages in updates:
+        if programmer_id in requested:
+            conflicts.append({"programmer_id": programmer_id, "detail": "El programador está repetido en la solicitud"})
+        else:
+            requested[programmer_id] = languages
+
+    with unit_of_work(db):
+        stored = _stored_languages(db, list(requested))
+        for programmer_id in [programmer_id for programmer_id in requested if programmer_id not in stored]:
+            conflicts.append({"programmer_id": programmer_id, "detail": "Programador no encontrado"})
+            del requested[programmer_id]
+
+        changes = _apply_language_changes(db, requested, stored)
+        payroll_operations.refresh_employee_payroll(
+            db, [programmer_id for programmer_id, change in changes.items() if change["added"] or change["removed"]]
+        )
+    return {
+        "changes": [{"programmer_id": programmer_id, **change} for programmer_id, change in changes.items()],
+        "conflicts": conflicts
+    }
+
 def delete_programmer(db: Session, programmer_id: int):
-    """Elimina un programador y sus datos relacionados"""
-    # Verificar si el programador está asignado a algún equipo
-    team_member = db.query(models.TeamMember).filter(
-        models.TeamMember.programmer_id == programmer_id
-    ).first()
-    
-    if team_member:
-        raise ValueError("No se puede eliminar un programador asignado a un equipo")
-    
-    # Primero eliminar los lenguajes asociados
-    db.query(models.ProgrammerLanguage).filter(
-        models.ProgrammerLanguage.programmer_id == programmer_id
-    ).delete()
-    
-    # Luego eliminar el programador
-    db.query(models.Programmer).filter(
-        models.Programmer.employee_id == programmer_id
-    ).delete()
-    
-    # Finalmente eliminar el empleado
-    db_employee = db.query(models.Employee).filter(
-        models.Employee.id == programmer_id
-    ).first()
-    
-    if db_employee:
-        db.delete(db_employee)
-        db.commit()
-        return True
-    return False
+    """Elimina un programador y sus datos relacionados (lenguajes, empleado y nómina)"""
+    with unit_of_work(db):
+        if not get_programmer(db, programmer_id):
+            return False
+        conflicts = employee_operations.delete_employees(db, [programmer_id])["conflicts"]
+        if conflicts:
+            raise ValueError(conflicts[0]["detail"])
+    return True
 
 def add_programmer_language(db: Session, programmer_id: int, language: str):
     """Añade un lenguaje a un programador"""
-    db_language = models.ProgrammerLanguage(
-        programmer_id=programmer_id,
-        language=language
-    )
-    db.add(db_language)
-    db.commit()
-    db.refresh(db_language)
+    with unit_of_work(db):
+        db_language = models.ProgrammerLanguage(
+            programmer_id=programmer_id,
+            language=language
+        )
+        db.add(db_language)
+        payroll_operations.refresh_employee_payroll(db, [programmer_id])
     return db_language
 
 def remove_programmer_language(db: Session, programmer_id: int, language: str):
     """Elimina un lenguaje específico de un programador"""
-    db.query(models.ProgrammerLanguage).filter(
-        models.ProgrammerLanguage.programmer_id == programmer_id,
-        models.ProgrammerLanguage.language == language
-    ).delete()
-    db.commit()
+    with unit_of_work(db):
+        db.query(models.ProgrammerLanguage).filter(
+            models.ProgrammerLanguage.programmer_id == programmer_id,
+            models.ProgrammerLanguage.language == language
+        ).delete()
+        payroll_operations.refresh_employee_payroll(db, [programmer_id])
     return True
 
 def get_programmer_languages(db: Session, programmer_id: int):
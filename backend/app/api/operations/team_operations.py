@@ -1,7 +1,11 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update, delete
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
 from app.models import models
 from app.schemas import schemas
-from app.api.operations import programmer_operations, leader_operations
+from app.api.operations import programmer_operations, leader_operations, payroll_operations, pagination, lookups, cascades
+from app.api.operations.unit_of_work import unit_of_work
 
 # ---- OPERACIONES CRUD PARA EQUIPOS (TEAMS) ----
 def create_team(db: Session, team: schemas.TeamCreate):
@@ -9,102 +13,123 @@ def create_team(db: Session, team: schemas.TeamCreate):
     Crea un nuevo equipo con su líder.
     Valida que el líder exista si se especifica uno.
     """
-    # Verificar que el líder exista si se especifica
-    if team.leader_id:
-        db_leader = db.query(models.Leader).filter(
-            models.Leader.employee_id == team.leader_id
-        ).first()
-        if not db_leader:
-            raise ValueError("El líder especificado no existe")
-
-    # Crear el equipo
-    db_team = models.Team(
-        name=team.name,
-        leader_id=team.leader_id
-    )
-    db.add(db_team)
-    db.commit()
-    db.refresh(db_team)
-    
-    return db_team
+    with unit_of_work(db):
+        # Verificar que el líder exista si se especifica
+        if team.leader_id:
+            db_leader = db.query(models.Leader).filter(
+                models.Leader.employee_id == team.leader_id
+            ).first()
+            if not db_leader:
+                raise ValueError("El líder especificado no existe")
+
+        # Crear el equipo
+        db_team = models.Team(
+            name=team.name,
+            leader_id=team.leader_id
+        )
+        db.add(db_team)
+        db.flush()
+        payroll_operations.refresh_team_payroll(db, [db_team.id])
     return db_team
 
+_TEAM_BY_ID = lookups.lookup_statement(models.Team.id)
+
 def get_team(db: Session, team_id: int):
     """Obtiene un equipo por su ID, incluyendo su líder y miembros"""
-    return db.query(models.Team).filter(models.Team.id == team_id).first()
+    return lookups.get_by_primary_key(db, _TEAM_BY_ID, models.Team, team_id)
+
+TEAM_SORTS = {
+    "id": [(models.Team.id, False)],
+    "name": [(models.Team.name, False), (models.Team.id, False)],
+}
 
-def get_teams(db: Session, skip: int = 0, limit: int = 100):
-    """Obtiene todos los equipos con paginación"""
-    return db.query(models.Team).offset(skip).limit(limit).all()
+def get_teams(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, sort: str = "id"):
+    """Obtiene todos los equipos con paginación por offset o por cursor"""
+    return pagination.paginate(db.query(models.Team), TEAM_SORTS, sort, cursor, skip, limit).all()
 
 def update_team(db: Session, team_id: int, team: schemas.TeamCreate):
     """Actualizar un equipo"""
-    db_team = db.query(models.Team).filter(models.Team.id == team_id).first()
-    if not db_team:
-        return None
-    
-    # Actualizar los campos
-    db_team.name = team.name
-    db_team.leader_id = team.leader_id
-    
-    db.commit()
-    db.refresh(db_team)
-    return db_team
+    with unit_of_work(db):
+        db_team = get_team(db, team_id)
+        if not db_team:
+            return None
 
-def delete_team(db: Session, team_id: int):
-    """Elimina un equipo, sus miembros y desasocia su proyecto (si existe)"""
-    db_team = get_team(db, team_id)
-    if not db_team:
-        raise ValueError("Equipo no encontrado")
+        # El líder anterior también puede cambiar de salario
+        previous_employees = payroll_operations.team_employee_ids(db, [team_id])
 
-    # Verificar si hay un proyecto asociado a este equipo
-    db_project = db.query(models.Project).filter(
-        models.Project.team_id == team_id
-    ).first()
+        # Actualizar los campos
+        db_team.name = team.name
+        db_team.leader_id = team.leader_id
 
-    # Desasociar proyecto si existe
-    if db_project:
-        db_project.team_id = None
-        db.add(db_project)
+        payroll_operations.refresh_team_payroll(db, [team_id], previous_employees)
+    return db_team
 
-    # Eliminar miembros del equipo
-    db.query(models.TeamMember).filter(
-        models.TeamMember.team_id == team_id
-    ).delete()
+def delete_teams(db: Session, team_ids: Iterable[int], versions: Optional[Dict[int, int]] = None) -> dict:
+    """
+    Elimina varios equipos en una sola transacción. Sus miembros los borra la base
+    de datos (ON DELETE CASCADE) y sus proyectos quedan sin equipo; el líder y los
+    miembros pierden el proyecto, así que se recalcula su nómina. Con versions solo
+    se borran esas versiones.
+    """
+    team_ids = cascades.unique_ids(team_ids)
+    with unit_of_work(db):
+        db.flush()
+        found, affected_employees = set(), set()
+        for chunk in payroll_operations.chunked(team_ids, cascades.DELETE_CHUNK_SIZE):
+            found.update(db.scalars(select(models.Team.id).where(models.Team.id.in_(chunk))))
+            affected_employees |= payroll_operations.team_employee_ids(db, chunk)
+            # El ON DELETE SET NULL lo haría la base de datos, pero así también cambia
+            # la versión (y el ETag) de los proyectos desasociados
+            db.execute(
+                update(models.Project).where(models.Project.team_id.in_(chunk))
+                .values(team_id=None, version=models.Project.version + 1),
+                execution_options={"synchronize_session": False}
+            )
+        deleted = [team_id for team_id in team_ids if team_id in found]
+        cascades.delete_by_ids(db, models.Team.id, deleted, versions)
+        payroll_operations.refresh_employee_payroll(db, affected_employees)
+    return {
+        "deleted": deleted,
+        "conflicts": [{"id": team_id, "detail": "Equipo no encontrado"} for team_id in team_ids if team_id not in found]
+    }
 
-    # Eliminar el equipo
-    db.delete(db_team)
-    db.commit()
+def delete_team(db: Session, team_id: int):
+    """Elimina un equipo, sus miembros y desasocia su proyecto (si existe), solo en la versión leída"""
+    with unit_of_work(db):
+        db_team = get_team(db, team_id)
+        if not db_team:
+            raise ValueError("Equipo no encontrado")
+        delete_teams(db, [team_id], {team_id: db_team.version})
     return True
 
 def add_team_member(db: Session, team_id: int, programmer_id: int):
     """Añade un programador a un equipo existente"""
-    # Verificar que el programador no esté en otro equipo
-    existing_member = db.query(models.TeamMember).filter(
-        models.TeamMember.programmer_id == programmer_id
-    ).first()
-    if existing_member:
-        raise ValueError("El programador ya está en otro equipo")
+    with unit_of_work(db):
+        # Verificar que el programador no esté en otro equipo
+        existing_member = db.query(models.TeamMember).filter(
+            models.TeamMember.programmer_id == programmer_id
+        ).first()
+        if existing_member:
+            raise ValueError("El programador ya está en otro equipo")
 
-    # Verificar que el programador exista
-    db_programmer = db.query(models.Programmer).filter(
-        models.Programmer.employee_id == programmer_id
-    ).first()
-    if not db_programmer:
-        raise ValueError("Programador no encontrado")
+        # Verificar que el programador exista
+        db_programmer = db.query(models.Programmer).filter(
+            models.Programmer.employee_id == programmer_id
+        ).first()
+        if not db_programmer:
+            raise ValueError("Programador no encontrado")
 
-    # Verificar que el equipo exista
-    db_team = get_team(db, team_id)
-    if not db_team:
-        raise ValueError("Equipo no encontrado")
+        # Verificar que el equipo exista
+        db_team = get_team(db, team_id)
+        if not db_team:
+            raise ValueError("Equipo no encontrado")
 
-    db_member = models.TeamMember(
-        team_id=team_id,
-        programmer_id=programmer_id
-    )
-    db.add(db_member)
-    db.commit()
-    db.refresh(db_member)
+        db_member = models.TeamMember(
+            team_id=team_id,
+            programmer_id=programmer_id
+        )
+        db.add(db_member)
+        payroll_operations.refresh_employee_payroll(db, [programmer_id])
     return db_member
 
 def remove_team_member(db: Session, team_id: int, programmer_id: int):
@@ -130,59 +155,152 @@ def remove_team_member(db: Session, team_id: int, programmer_id: int):
         raise ValueError("El programador no está en este equipo")
 
     try:
-        db.delete(db_member)
-        db.commit()
+        with unit_of_work(db):
+            db.delete(db_member)
+            payroll_operations.refresh_employee_payroll(db, [programmer_id])
         return True
     except Exception as e:
-        db.rollback()
         raise ValueError(f"Error al remover el miembro del equipo: {str(e)}")
 
+def _existing_programmers(db: Session, programmer_ids: List[int]) -> set:
+    found = set()
+    for chunk in payroll_operations.chunked(programmer_ids, 900):
+        found.update(employee_id for employee_id, in db.query(models.Programmer.employee_id).filter(
+            models.Programmer.employee_id.in_(chunk)
+        ))
+    return found
+
+def _current_teams(db: Session, programmer_ids: List[int]) -> Dict[int, int]:
+    """Equipo actual (programmer_id -> team_id) de los programadores que tienen uno"""
+    teams = {}
+    for chunk in payroll_operations.chunked(programmer_ids, 900):
+        teams.update(db.query(models.TeamMember.programmer_id, models.TeamMember.team_id).filter(
+            models.TeamMember.programmer_id.in_(chunk)
+        ).all())
+    return teams
+
+def add_team_members(db: Session, team_id: int, programmer_ids: Iterable[int]) -> dict:
+    """
+    Añade varios programadores a un equipo en una sola transacción. La existencia
+    de los programadores y si ya tienen equipo se comprueban con una consulta para
+    todos; los que no se pueden añadir se devuelven en conflicts con el motivo.
+    """
+    programmer_ids = cascades.unique_ids(programmer_ids)
+    with unit_of_work(db):
+        if not get_team(db, team_id):
+            raise ValueError("Equipo no encontrado")
+
+        existing = _existing_programmers(db, programmer_ids)
+        current_teams = _current_teams(db, programmer_ids)
+        added, conflicts = [], []
+        for programmer_id in programmer_ids:
+            if programmer_id not in existing:
+                conflicts.append({"programmer_id": programmer_id, "detail": "Programador no encontrado"})
+            elif current_teams.get(programmer_id) == team_id:
+                conflicts.append({"programmer_id": programmer_id, "detail": "El programador ya está en este equipo"})
+            elif programmer_id in current_teams:
+                conflicts.append({"programmer_id": programmer_id, "detail": "El programador ya está en otro equipo"})
+            else:
+                added.append(programmer_id)
+
+        if added:
+            db.execute(insert(models.TeamMember), [
+                {"team_id": team_id, "programmer_id": programmer_id} for programmer_id in added
+            ])
+            payroll_operations.refresh_employee_payroll(db, added)
+    return {"team_id": team_id, "programmer_ids": added, "conflicts": conflicts}
+
+def remove_team_members(db: Session, team_id: int, programmer_ids: Iterable[int]) -> dict:
+    """
+    Quita varios programadores de un equipo con un solo DELETE. Los que no existen
+    o no son miembros del equipo se devuelven en conflicts.
+    """
+    programmer_ids = cascades.unique_ids(programmer_ids)
+    with unit_of_work(db):
+        if not get_team(db, team_id):
+            raise ValueError("Equipo no encontrado")
+
+        existing = _existing_programmers(db, programmer_ids)
+        current_teams = _current_teams(db, programmer_ids)
+        removed, conflicts = [], []
+        for programmer_id in programmer_ids:
+            if programmer_id not in existing:
+                conflicts.append({"programmer_id": programmer_id, "detail": "Programador no encontrado"})
+            elif current_teams.get(programmer_id) != team_id:
+                conflicts.append({"programmer_id": programmer_id, "detail": "El programador no está en este equipo"})
+            else:
+                removed.append(programmer_id)
+
+        for chunk in payroll_operations.chunked(removed, 900):
+            db.execute(
+                delete(models.TeamMember).where(
+                    models.TeamMember.team_id == team_id, models.TeamMember.programmer_id.in_(chunk)
+                ),
+                execution_options={"synchronize_session": False}
+            )
+        payroll_operations.refresh_employee_payroll(db, removed)
+    return {"team_id": team_id, "programmer_ids": removed, "conflicts": conflicts}
+
+def get_members_for_teams(db: Session, team_ids: Iterable[int]) -> Dict[int, List[dict]]:
+    """
+    Obtiene los programadores de varios equipos a la vez, agrupados por team_id.
+    Usa una consulta que une miembros, programadores y empleados y otra para todos
+    los lenguajes, en lugar de tres consultas por miembro.
+    """
+    team_ids = list(set(team_ids))
+    members = {team_id: [] for team_id in team_ids}
+
+    rows = []
+    for chunk in payroll_operations.chunked(team_ids, 900):
+        rows.extend(db.query(
+            models.TeamMember.team_id,
+            models.Programmer.employee_id,
+            models.Programmer.category,
+            models.Employee.name,
+            models.Employee.identity_card,
+            models.Employee.age,
+            models.Employee.sex,
+            models.Employee.base_salary,
+            models.Employee.type
+        ).join(
+            models.Programmer, models.Programmer.employee_id == models.TeamMember.programmer_id
+        ).join(
+            models.Employee, models.Employee.id == models.Programmer.employee_id
+        ).filter(
+            models.TeamMember.team_id.in_(chunk)
+        ).order_by(models.TeamMember.team_id, models.TeamMember.programmer_id).all())
+
+    # Lenguajes de todos los miembros, agrupados en memoria
+    languages = defaultdict(list)
+    for chunk in payroll_operations.chunked([row.employee_id for row in rows], 900):
+        for programmer_id, language in db.query(
+            models.ProgrammerLanguage.programmer_id, models.ProgrammerLanguage.language
+        ).filter(
+            models.ProgrammerLanguage.programmer_id.in_(chunk)
+        ).order_by(models.ProgrammerLanguage.programmer_id, models.ProgrammerLanguage.language):
+            languages[programmer_id].append(language)
+
+    for row in rows:
+        members[row.team_id].append({
+            "team_member_id": row.employee_id,
+            "programmer_id": row.employee_id,
+            "employee": {
+                "id": row.employee_id,
+                "name": row.name,
+                "identity_card": row.identity_card,
+                "age": row.age,
+                "sex": row.sex,
+                "base_salary": row.base_salary,
+                "type": row.type
+            },
+            "category": row.category,
+            "languages": languages[row.employee_id]
+        })
+    return members
+
 def get_team_members(db: Session, team_id: int):
     """Obtiene todos los programadores de un equipo específico"""
-    # Primero obtener los miembros del equipo
-    team_members = db.query(models.TeamMember).filter(
-        models.TeamMember.team_id == team_id
-    ).all()
-    
-    # Luego, para cada miembro, obtenemos la información completa del programador
-    # incluyendo su información de empleado
-    result = []
-    for member in team_members:
-        # Obtener el programador
-        programmer = db.query(models.Programmer).filter(
-            models.Programmer.employee_id == member.programmer_id
-        ).first()
-        
-        if programmer:
-            # Obtener el empleado
-            employee = db.query(models.Employee).filter(
-                models.Employee.id == programmer.employee_id
-            ).first()
-            
-            if employee:
-                # Obtener los lenguajes del programador
-                languages = db.query(models.ProgrammerLanguage.language).filter(
-                    models.ProgrammerLanguage.programmer_id == programmer.employee_id
-                ).all()
-                
-                # Añadir a resultados con toda la información
-                result.append({
-                    "team_member_id": member.programmer_id,
-                    "programmer_id": programmer.employee_id,
-                    "employee": {
-                        "id": employee.id,
-                        "name": employee.name,
-                        "identity_card": employee.identity_card,
-                        "age": employee.age,
-                        "sex": employee.sex,
-                        "base_salary": employee.base_salary,
-                        "type": employee.type
-                    },
-                    "category": programmer.category,
-                    "languages": [lang[0] for lang in languages]
-                })
-    
-    return result
+    return get_members_for_teams(db, [team_id])[team_id]
 
 def get_team_by_leader(db: Session, leader_id: int):
     """Obtiene el equipo que lidera un líder específico"""
@@ -0,0 +1,44 @@
+from contextlib import contextmanager
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from app.api.operations.versioning import StaleVersionError
+
+# ---- UNIDAD DE TRABAJO ----
+# Cada operación de escritura agrupa sus pasos en "with unit_of_work(db):". Dentro
+# del bloque solo se hace flush (los IDs generados ya quedan en los objetos); el
+# bloque más externo confirma una sola vez al terminar o deshace todo si algún paso
+# falla. Las unidades se pueden anidar: si una operación llama a otra, la interna
+# no confirma y todo queda en la transacción de la externa.
+# Las sesiones se crean con expire_on_commit=False, así que después del commit los
+# objetos conservan sus valores y no hace falta un refresh (otro SELECT) para
+# devolverlos.
+
+_DEPTH_KEY = "unit_of_work_depth"
+
+@contextmanager
+def unit_of_work(db: Session):
+    """Transacción de una operación: commit único en el bloque externo, rollback si falla"""
+    depth = db.info.get(_DEPTH_KEY, 0)
+    db.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield db
+        if depth == 0:
+            db.commit()
+        else:
+            db.flush()
+    except StaleDataError as e:
+        # Un UPDATE/DELETE con version_id_col no encontró la versión leída: otra
+        # petición cambió la fila entre la lectura y la escritura
+        if depth == 0:
+            db.rollback()
+        raise StaleVersionError() from e
+    except Exception:
+        if depth == 0:
+            db.rollback()
+        raise
+    finally:
+        db.info[_DEPTH_KEY] = depth
+
+def in_unit_of_work(db: Session) -> bool:
+    """True si hay una unidad de trabajo abierta en la sesión"""
+    return db.info.get(_DEPTH_KEY, 0) > 0
@@ -2,8 +2,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.models import models
 from app.schemas import schemas
-from typing import List
-from app.api.operations import employee_operations, programmer_operations, leader_operations, project_operations
+from typing import Dict, Iterable, List, Optional
+from app.api.operations import employee_operations, programmer_operations, leader_operations, team_operations, project_operations, payroll_operations
 
 # ---- FUNCIONES DE UTILIDAD ----
 
@@ -20,43 +20,23 @@ def calculate_salary(db: Session, employee_id: int) -> float:
     Si no tiene proyecto:
     Programador: salario_básico + 3 * cantidad_lenguajes
     Líder: salario_básico + 5 * años_experiencia
+
+    El cálculo se delega en el motor de nómina (payroll_operations), que resuelve
+    todo en una sola consulta SQL.
     """
-    employee = db.query(models.Employee).filter(models.Employee.id == employee_id).first()
-    if not employee:
+    salaries = calculate_salaries(db, [employee_id])
+    if employee_id not in salaries:
         raise ValueError("Empleado no encontrado")
+    return salaries[employee_id]
 
-    base_salary = employee.base_salary
-    total_salary = base_salary
-
-    if employee.type == "programmer":
-        programmer = db.query(models.Programmer).filter(models.Programmer.employee_id == employee_id).first()
-        # Cantidad de lenguajes
-        languages_count = db.query(models.ProgrammerLanguage).filter(
-            models.ProgrammerLanguage.programmer_id == employee_id
-        ).count()
-        # Proyecto asignado
-        from app.api.operations.utils import get_project_by_programmer_identity
-        project = None
-        try:
-            project = get_project_by_programmer_identity(db, employee.identity_card)
-        except Exception:
-            project = None
-        if project:
-            total_salary += 0.05 * project.price
-        total_salary += 3 * languages_count
-
-    elif employee.type == "leader":
-        leader = db.query(models.Leader).filter(models.Leader.employee_id == employee_id).first()
-        years_exp = leader.years_experience if leader else 0
-        # Proyecto asignado
-        project = db.query(models.Project).filter(models.Project.team_id == 
-            db.query(models.Team).filter(models.Team.leader_id == employee_id).first().id
-        ).first() if db.query(models.Team).filter(models.Team.leader_id == employee_id).first() else None
-        if project:
-            total_salary += 0.10 * project.price
-        total_salary += 5 * years_exp
-
-    return float(total_salary)
+def calculate_salaries(db: Session, employee_ids: Iterable[int],
+                       chunk_size: int = payroll_operations.PAYROLL_CHUNK_SIZE) -> Dict[int, float]:
+    """
+    Calcula el salario total de varios empleados a la vez.
+    Devuelve {employee_id: salario}; los IDs inexistentes no aparecen en el resultado.
+    Se ejecuta una consulta por cada bloque de chunk_size IDs, sin importar cuántos sean.
+    """
+    return payroll_operations.get_payroll(db, employee_ids, chunk_size=chunk_size)
 
 def get_earliest_finishing_project(db: Session):
     """Obtiene el proyecto que termina más pronto (menor tiempo estimado)"""
@@ -71,22 +51,21 @@ def count_projects_by_type(db: Session) -> List[schemas.ProjectTypeCount]:
     
     return [schemas.ProjectTypeCount(project_type=result.type, count=result.count) for result in results]
 
-def get_highest_paid_employees(db: Session, limit: int = 5) -> List[schemas.SalaryInfo]:
-    """Obtiene los empleados mejor pagados calculando su salario total"""
-    employees = employee_operations.get_employees(db)
-    salary_info = []
-    
-    for employee in employees:
-        total_salary = calculate_salary(db, employee.id)
-        salary_info.append(schemas.SalaryInfo(
-            employee_id=employee.id,
-            name=employee.name,
-            total_salary=total_salary
-        ))
-    
-    # Ordenar por salario total descendente y limitar
-    salary_info.sort(key=lambda x: x.total_salary, reverse=True)
-    return salary_info[:limit]
+def get_highest_paid_employees(db: Session, limit: int = 5, offset: int = 0,
+                               min_salary: Optional[float] = None) -> List[schemas.SalaryInfo]:
+    """
+    Obtiene los empleados mejor pagados calculando su salario total.
+    Considera a toda la plantilla; offset y min_salary permiten paginar el ranking.
+    """
+    ranking = payroll_operations.get_payroll_ranking(db, limit=limit, offset=offset, min_salary=min_salary)
+    return [
+        schemas.SalaryInfo(
+            employee_id=row.employee_id,
+            name=row.name,
+            total_salary=float(row.total_salary)
+        )
+        for row in ranking
+    ]
 
 def get_programmers_by_project(db: Session, project_id: int):
     """Obtiene todos los programadores asignados a un proyecto específico"""
@@ -189,16 +168,16 @@ def format_project_to_txt(db: Session, project_with_details: schemas.ProjectWith
         lines.append(f"Herramienta de desarrollo: {mm.development_tool}")
 
     # Equipo
-    team = db.query(models.Team).filter(models.Team.id == project.team_id).first()
+    team = team_operations.get_team(db, project.team_id)
     lines.append("\n=== Equipo Asociado ===")
     lines.append(f"Nombre del equipo: {team.name if team else '-'}")
 
     # Líder
     leader_name = "-"
     if team and team.leader_id:
-        leader = db.query(models.Leader).filter(models.Leader.employee_id == team.leader_id).first()
+        leader = leader_operations.get_leader(db, team.leader_id)
         if leader:
-            employee = db.query(models.Employee).filter(models.Employee.id == leader.employee_id).first()
+            employee = employee_operations.get_employee(db, leader.employee_id)
             if employee:
                 leader_name = employee.name
     lines.append(f"Líder: {leader_name}")
@@ -227,11 +206,7 @@ def get_total_salary(db: Session = Depends(get_db)):
     """
     Devuelve el total de la nómina mensual sumando el salario de todos los empleados.
     """
-    from app.api.operations.utils import calculate_salary
     from app.api.operations import employee_operations
 
-    employees = employee_operations.get_employees(db)
-    total = 0
-    for emp in employees:
-        total += calculate_salary(db, emp.id)
+    total = employee_operations.calculate_total_salary(db)
     return {"total": total}
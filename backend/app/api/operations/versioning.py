@@ -0,0 +1,75 @@
+import hashlib
+from fastapi import Response
+from sqlalchemy import inspect
+from typing import Iterable, Optional
+
+# ---- VERSIONES DE FILA Y ETAGS ----
+# Employee, Team y Project tienen una columna version que el ORM incrementa en cada
+# UPDATE (version_id_col) y que también comprueba: el UPDATE o DELETE lleva
+# "WHERE version = <la leída>", así que si otra petición confirmó un cambio entre la
+# lectura y la escritura, la escritura falla en vez de pisarlo.
+#
+# Las rutas derivan de la versión ETags fuertes: el de un recurso es su tabla, ID y
+# versión; el de una página de listado, un hash de los (ID, versión) de sus filas y
+# de cualquier otro dato que muestre (los salarios). Con If-None-Match igual al
+# ETag actual se responde 304 sin serializar nada; If-Match en PUT/DELETE rechaza
+# la escritura con 412 si el recurso cambió desde que el cliente lo leyó.
+
+class StaleVersionError(ValueError):
+    """El recurso cambió desde la versión que conocía el cliente"""
+
+    def __init__(self, message: str = "El recurso fue modificado por otra petición; vuelva a leerlo"):
+        super().__init__(message)
+
+def resource_etag(instance) -> str:
+    """ETag fuerte de una fila versionada"""
+    identity = "-".join(str(value) for value in inspect(instance).identity)
+    return f'"{instance.__tablename__}-{identity}-v{instance.version}"'
+
+def page_etag(items: Iterable, *extra) -> str:
+    """ETag fuerte de una página de filas versionadas (y de los datos extra que se muestren con ellas)"""
+    digest = hashlib.sha1()
+    for item in items:
+        digest.update(f"{inspect(item).identity}:{item.version};".encode())
+    for value in extra:
+        digest.update(repr(value).encode())
+    return f'"{digest.hexdigest()}"'
+
+def _etags(header: str):
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = True) -> bool:
+    """
+    True si la cabecera (If-None-Match o If-Match) incluye el ETag o es "*".
+    If-None-Match usa la comparación débil (se ignora el prefijo W/); If-Match, la fuerte.
+    """
+    if not header:
+        return False
+    for tag in _etags(header):
+        if tag == "*":
+            return True
+        if weak and tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+def conditional_response(response: Response, if_none_match: Optional[str], etag: str) -> Optional[Response]:
+    """
+    Publica el ETag en response y, si el cliente ya tiene esa representación
+    (If-None-Match), devuelve un 304 con las mismas cabeceras; si no, None.
+    """
+    response.headers["ETag"] = etag
+    if etag_matches(if_none_match, etag):
+        headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+        return Response(status_code=304, headers=headers)
+    return None
+
+def check_if_match(if_match: Optional[str], instance) -> None:
+    """
+    Lanza StaleVersionError si If-Match no corresponde a la versión actual del
+    recurso. Si el recurso no existe no comprueba nada: la operación responde 404.
+    """
+    if if_match is not None and instance is not None \
+            and not etag_matches(if_match, resource_etag(instance), weak=False):
+        raise StaleVersionError()
@@ -15,5 +15,35 @@ class Settings:
     ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
     ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+    # Caché de analytics: segundos de vida por entrada y cantidad máxima de entradas
+    ANALYTICS_CACHE_TTL = float(os.getenv("ANALYTICS_CACHE_TTL", "300"))
+    ANALYTICS_CACHE_SIZE = int(os.getenv("ANALYTICS_CACHE_SIZE", "256"))
+    # Métricas SQL por petición: línea de log por petición y presupuesto de consultas
+    # (0 = sin límite; en los tests, una petición que lo supera responde 500)
+    DB_QUERY_LOG = os.getenv("DB_QUERY_LOG", "False").lower() == "true"
+    DB_QUERY_BUDGET = int(os.getenv("DB_QUERY_BUDGET", "0"))
+    # Perfil del motor SQLite (PRAGMAs que se aplican a cada conexión nueva).
+    # WAL deja leer mientras otra conexión escribe; busy_timeout hace esperar a los
+    # escritores en lugar de fallar con "database is locked".
+    DB_JOURNAL_MODE = os.getenv("DB_JOURNAL_MODE", "WAL")
+    DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+    DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+    DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "65536"))  # caché de páginas por conexión
+    DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))  # bytes; 0 = sin mmap
+    DB_TEMP_STORE = os.getenv("DB_TEMP_STORE", "MEMORY")
+    # Pool de conexiones del engine: pool_size conexiones se conservan abiertas y
+    # max_overflow limita las extra (-1 = sin límite). Con un límite, las peticiones que
+    # superan pool_size + max_overflow esperan turno en el bucle de eventos antes de
+    # abrir su sesión, sin ocupar un hilo del threadpool (ver pool_slot en database.py).
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))  # pool de lectura
+    DB_WRITE_POOL_SIZE = int(os.getenv("DB_WRITE_POOL_SIZE", "2"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))  # pool de lectura
+    # SQLite admite un solo escritor: más conexiones de escritura solo esperan el bloqueo
+    DB_WRITE_MAX_OVERFLOW = int(os.getenv("DB_WRITE_MAX_OVERFLOW", "0"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Réplica para las lecturas; sin ella, las lecturas abren la base SQLite en modo solo lectura
+    DB_READ_REPLICA_URL = os.getenv("DB_READ_REPLICA_URL", "")
+    # Acceso asíncrono: las rutas pasan a ser async y usan un engine aiosqlite
+    DB_ASYNC = os.getenv("DB_ASYNC", "False").lower() == "true"
 
 settings = Settings()
\ No newline at end of file
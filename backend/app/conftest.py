@@ -0,0 +1,22 @@
+"""
+Configuración compartida de los tests
+
+Los tests no escriben en project_management.db: antes de que se importe la
+aplicación (los engines se crean al importar app.database.database), DATABASE_URL
+pasa a apuntar a una base SQLite temporal que se borra al terminar la sesión.
+Las utilidades que importan los tests están en app/testing_utils.py.
+"""
+import os
+import shutil
+import tempfile
+
+_DATABASE_DIR = tempfile.mkdtemp(prefix="gestor-proyectos-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DATABASE_DIR}/test.db"
+
+def pytest_sessionfinish(session, exitstatus):
+    """Cierra las conexiones y borra la base temporal"""
+    from app.database.database import engine, read_engine
+
+    read_engine.dispose()
+    engine.dispose()
+    shutil.rmtree(_DATABASE_DIR, ignore_errors=True)
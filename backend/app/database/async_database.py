@@ -0,0 +1,88 @@
+"""
+Acceso asíncrono a la base de datos (DB_ASYNC=true)
+
+El engine asíncrono usa aiosqlite con el mismo perfil que el síncrono (PRAGMAs,
+pool y contador de consultas). Las operaciones no se duplican: se ejecutan sobre
+la Session síncrona de cada AsyncSession dentro del puente greenlet de
+SQLAlchemy (ver app/api/async_routes.py), así que la E/S se espera sin ocupar un
+hilo del threadpool.
+"""
+from typing import Dict, Optional
+from fastapi import Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.config import settings
+from app.database.database import (
+    DATABASE_URL, READ_DATABASE_URL, READ_METHODS, apply_sqlite_profile, engine_options, instrument_engine
+)
+
+# Driver asíncrono para cada driver síncrono soportado
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url(url: str) -> str:
+    """Traduce la URL síncrona a la de su driver asíncrono"""
+    parsed = make_url(url)
+    if parsed.drivername not in ASYNC_DRIVERS:
+        raise ValueError(f"No hay driver asíncrono configurado para '{parsed.drivername}'")
+    return parsed.set(drivername=ASYNC_DRIVERS[parsed.drivername]).render_as_string(hide_password=False)
+
+def create_async_db_engine(url: str, config=settings, read_only: bool = False, pool_size: Optional[int] = None,
+                           max_overflow: Optional[int] = None):
+    """Engine asíncrono con el perfil configurado e instrumentado como el síncrono"""
+    options = engine_options(url, config, pool_size, max_overflow)
+    if "pool_size" in options:
+        # aiosqlite usa NullPool por defecto: una conexión (y un hilo) nueva por sesión
+        options["poolclass"] = AsyncAdaptedQueuePool
+    async_engine = create_async_engine(async_database_url(url), **options)
+    if url.startswith("sqlite"):
+        apply_sqlite_profile(async_engine.sync_engine, config, read_only)
+    instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+# Fábricas de AsyncSession por uso ("read" / "write"), creadas la primera vez que se piden
+_sessionmakers: Dict[str, async_sessionmaker] = {}
+
+def get_async_sessionmaker(role: str = "write") -> async_sessionmaker:
+    """Fábrica de AsyncSession del pool de escritura o del de solo lectura"""
+    if role not in _sessionmakers:
+        if role == "read" and READ_DATABASE_URL:
+            bind = create_async_db_engine(READ_DATABASE_URL, read_only=True)
+        elif role == "read":
+            bind = get_async_sessionmaker("write").kw["bind"]
+        else:
+            bind = create_async_db_engine(
+                DATABASE_URL, pool_size=settings.DB_WRITE_POOL_SIZE, max_overflow=settings.DB_WRITE_MAX_OVERFLOW
+            )
+        _sessionmakers[role] = async_sessionmaker(
+            bind=bind, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    return _sessionmakers[role]
+
+async def dispose_async_engine():
+    """
+    Cierra las conexiones de los engines asíncronos. Hay que llamarla al apagar la
+    aplicación: cada conexión aiosqlite tiene un hilo propio que impide terminar
+    el proceso mientras siga abierta.
+    """
+    engines = {maker.kw["bind"] for maker in _sessionmakers.values()}
+    _sessionmakers.clear()
+    for async_engine in engines:
+        await async_engine.dispose()
+
+# ---- DEPENDENCIAS ASÍNCRONAS (equivalentes a get_read_db, get_write_db y get_db) ----
+async def get_async_read_db():
+    async with get_async_sessionmaker("read")() as db:
+        yield db
+
+async def get_async_write_db():
+    async with get_async_sessionmaker("write")() as db:
+        yield db
+
+async def get_async_db(request: Request = None):
+    role = "read" if request is not None and request.method in READ_METHODS else "write"
+    async with get_async_sessionmaker(role)() as db:
+        yield db
@@ -1,9 +1,18 @@
+from fastapi import Depends, Request
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
 import os
+import time
+import anyio
 from dotenv import load_dotenv
 import pathlib
+from app.config import settings
 
 # Cargar variables de entorno
 load_dotenv()
@@ -14,30 +23,258 @@ BASE_DIR = pathlib.Path(__file__).parent.parent.parent.absolute()
 # Obtener la URL de la base de datos del archivo .env o usar SQLite por defecto
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{BASE_DIR}/project_management.db")
 
-# Crear el engine de SQLAlchemy
-engine = create_engine(
-    DATABASE_URL, 
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-)
+# ---- PERFIL DEL MOTOR SQLITE ----
+def sqlite_pragmas(config=settings, read_only: bool = False) -> Dict[str, object]:
+    """
+    PRAGMAs que se aplican a cada conexión SQLite nueva, tomados de Settings.
+    Las conexiones de solo lectura no pueden cambiar el modo de diario y además
+    rechazan cualquier escritura (query_only).
+    """
+    pragmas = {
+        "foreign_keys": "ON",  # restricciones de clave foránea
+        "journal_mode": config.DB_JOURNAL_MODE,
+        "synchronous": config.DB_SYNCHRONOUS,
+        "busy_timeout": config.DB_BUSY_TIMEOUT_MS,
+        "cache_size": -config.DB_CACHE_SIZE_KB,  # negativo = KiB en lugar de páginas
+        "mmap_size": config.DB_MMAP_SIZE,
+        "temp_store": config.DB_TEMP_STORE,
+    }
+    if read_only:
+        del pragmas["journal_mode"]
+        pragmas["query_only"] = "ON"
+    return pragmas
+
+def _is_memory_database(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+def engine_options(url: str, config=settings, pool_size: Optional[int] = None,
+                   max_overflow: Optional[int] = None) -> Dict[str, object]:
+    """
+    Argumentos de create_engine para el perfil configurado: tamaño explícito del pool
+    (salvo en SQLite en memoria, que usa su propio pool) y, en SQLite, la espera de
+    bloqueo del driver. Los comparten el engine síncrono y el asíncrono.
+    """
+    options = {}
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False, "timeout": config.DB_BUSY_TIMEOUT_MS / 1000}
+        if _is_memory_database(url):
+            return options
+    if max_overflow is None:
+        max_overflow = config.DB_MAX_OVERFLOW
+    options.update(pool_size=pool_size or config.DB_POOL_SIZE, max_overflow=max_overflow,
+                   pool_timeout=config.DB_POOL_TIMEOUT)
+    return options
 
-# Configuración específica para SQLite para habilitar las restricciones de clave foránea
-@event.listens_for(engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
-    if DATABASE_URL.startswith("sqlite"):
+def apply_sqlite_profile(sync_engine, config=settings, read_only: bool = False):
+    """Registra los PRAGMAs del perfil para cada conexión nueva del engine"""
+    pragmas = sqlite_pragmas(config, read_only)
+
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
         cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
         cursor.close()
 
-# Crear la clase SessionLocal
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def create_db_engine(url: str, config=settings, read_only: bool = False, pool_size: Optional[int] = None,
+                     max_overflow: Optional[int] = None):
+    """Crea el engine con el perfil configurado (PRAGMAs por conexión en SQLite y pool explícito)"""
+    db_engine = create_engine(url, **engine_options(url, config, pool_size, max_overflow))
+    if url.startswith("sqlite"):
+        apply_sqlite_profile(db_engine, config, read_only)
+    return db_engine
+
+def read_only_url(url: str) -> str:
+    """La misma base SQLite abierta como URI con mode=ro: el driver no permite escribir"""
+    parsed = make_url(url)
+    return parsed.set(
+        database=f"file:{parsed.database}", query={**parsed.query, "mode": "ro", "uri": "true"}
+    ).render_as_string(hide_password=False)
+
+def read_database_url(url: str = DATABASE_URL, config=settings) -> Optional[str]:
+    """
+    URL del pool de lectura: la réplica configurada o, en SQLite en archivo, la misma
+    base en modo solo lectura. None si las lecturas deben usar el engine de escritura.
+    """
+    if config.DB_READ_REPLICA_URL:
+        return config.DB_READ_REPLICA_URL
+    if url.startswith("sqlite") and not _is_memory_database(url):
+        return read_only_url(url)
+    return None
+
+# Valores numéricos que devuelve SQLite al consultar estos PRAGMAs
+_PRAGMA_NAMES = {
+    "synchronous": {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"},
+    "temp_store": {0: "DEFAULT", 1: "FILE", 2: "MEMORY"},
+    "foreign_keys": {0: "OFF", 1: "ON"},
+    "query_only": {0: "OFF", 1: "ON"},
+}
+
+def engine_profile(bind=None) -> Dict[str, object]:
+    """Perfil que está en vigor de verdad: PRAGMAs leídos de una conexión y tamaño del pool"""
+    bind = bind or engine
+    profile = {}
+    if bind.dialect.name == "sqlite":
+        with bind.connect() as connection:
+            for name in [*sqlite_pragmas(), "query_only"]:
+                value = connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+                profile[name] = _PRAGMA_NAMES.get(name, {}).get(value, value)
+    pool = bind.pool
+    profile["pool"] = type(pool).__name__
+    if hasattr(pool, "size"):
+        profile["pool_size"] = pool.size()
+        profile["max_overflow"] = pool._max_overflow
+    return profile
+
+def describe_engine_profile(bind=None) -> str:
+    return ", ".join(f"{name}={value}" for name, value in engine_profile(bind).items())
+
+# Crear los engines de SQLAlchemy: un pool pequeño para las escrituras (SQLite solo
+# admite un escritor a la vez) y otro de conexiones de solo lectura para las consultas
+engine = create_db_engine(
+    DATABASE_URL, pool_size=settings.DB_WRITE_POOL_SIZE, max_overflow=settings.DB_WRITE_MAX_OVERFLOW
+)
+READ_DATABASE_URL = read_database_url()
+read_engine = create_db_engine(READ_DATABASE_URL, read_only=True) if READ_DATABASE_URL else engine
+
+# ---- CONTADOR DE CONSULTAS POR PETICIÓN ----
+class QueryStats:
+    """Sentencias SQL ejecutadas y tiempo acumulado en la base de datos"""
+
+    def __init__(self, budget: int = 0):
+        self.count = 0
+        self.time = 0.0  # segundos
+        self.budget = budget  # 0 = sin límite
+        self.exceeded = False
+
+    @property
+    def time_ms(self) -> float:
+        return self.time * 1000
+
+# El middleware de métricas crea un QueryStats por petición; fuera de una petición vale None.
+# El objeto es mutable, así que lo comparten los hilos del threadpool que copian el contexto.
+query_stats: ContextVar = ContextVar("query_stats", default=None)
+
+class QueryBudgetExceeded(RuntimeError):
+    """La petición intentó ejecutar más sentencias que DB_QUERY_BUDGET"""
+
+    def __init__(self, stats: QueryStats):
+        super().__init__(f"Query budget exceeded: more than {stats.budget} queries")
+
+def track_queries(budget: int = 0) -> QueryStats:
+    """
+    Empieza a contar las consultas del contexto actual y devuelve el acumulador.
+    Con budget > 0, la sentencia que lo supera no se ejecuta: lanza
+    QueryBudgetExceeded y la unidad de trabajo abierta se deshace.
+    """
+    stats = QueryStats(budget)
+    query_stats.set(stats)
+    return stats
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+    stats = query_stats.get()
+    if stats is not None and stats.budget and stats.count >= stats.budget:
+        # handle_error (_discard_query_timer) retira el cronómetro recién añadido
+        stats.exceeded = True
+        raise QueryBudgetExceeded(stats)
+
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.time += elapsed
+
+def _discard_query_timer(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_time"):
+        connection.info["query_start_time"].pop()
+
+def instrument_engine(sync_engine):
+    """Cuenta y cronometra en query_stats las sentencias que ejecuta el engine"""
+    event.listen(sync_engine, "before_cursor_execute", _start_query_timer)
+    event.listen(sync_engine, "after_cursor_execute", _record_query)
+    event.listen(sync_engine, "handle_error", _discard_query_timer)
+
+instrument_engine(engine)
+if read_engine is not engine:
+    instrument_engine(read_engine)
+
+# Crear las clases de sesión: SessionLocal escribe, ReadSessionLocal solo lee.
+# expire_on_commit=False: tras el commit de una operación los objetos conservan sus
+# valores y se pueden devolver sin volver a leerlos (ver unit_of_work)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine)
 
 # Crear la clase Base
 Base = declarative_base()
 
-# Función para obtener la sesión de base de datos
-def get_db():
+# ---- TURNOS DE CONEXIÓN ----
+# En modo síncrono una petición retiene su conexión entre varios pasos del threadpool
+# (dependencias, endpoint, cierre de la sesión). Si esperase la conexión dentro de un
+# hilo, bastaría con más peticiones que hilos para que todos quedasen esperando a las
+# sesiones que ya tienen conexión y no consiguen hilo para devolverla. Por eso cada
+# sesión de petición toma antes un turno del pool en el bucle de eventos: nunca hay
+# más sesiones abiertas que conexiones y ningún hilo espera en el pool.
+_pool_slots: Dict[object, Optional[anyio.Semaphore]] = {}
+
+def pool_capacity(bind) -> Optional[int]:
+    """Conexiones que puede abrir el pool del engine; None si no tiene límite"""
+    pool = bind.pool
+    if not isinstance(pool, QueuePool) or pool._max_overflow < 0:
+        return None
+    return pool.size() + pool._max_overflow
+
+@asynccontextmanager
+async def pool_slot(bind):
+    """Reserva un turno del pool de bind hasta salir del bloque"""
+    if bind not in _pool_slots:
+        capacity = pool_capacity(bind)
+        _pool_slots[bind] = anyio.Semaphore(capacity) if capacity else None
+    slots = _pool_slots[bind]
+    if slots is None:
+        yield
+        return
+    async with slots:
+        yield
+
+async def read_pool_slot():
+    async with pool_slot(read_engine):
+        yield
+
+async def write_pool_slot():
+    async with pool_slot(engine):
+        yield
+
+async def db_pool_slot(request: Request = None):
+    async with pool_slot(read_engine if request is not None and request.method in READ_METHODS else engine):
+        yield
+
+# ---- DEPENDENCIAS DE SESIÓN ----
+# Métodos HTTP que no modifican datos: get_db les da una sesión del pool de lectura
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+def get_read_db(slot: None = Depends(read_pool_slot)):
+    """Sesión del pool de solo lectura"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_write_db(slot: None = Depends(write_pool_slot)):
+    """Sesión del pool de escritura"""
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Función para obtener la sesión de base de datos
+def get_db(request: Request = None, slot: None = Depends(db_pool_slot)):
+    """Sesión de lectura para las peticiones GET/HEAD/OPTIONS y de escritura para el resto"""
+    if request is not None and request.method in READ_METHODS:
+        yield from get_read_db()
+    else:
+        yield from get_write_db()
@@ -0,0 +1,182 @@
+"""
+Migraciones del esquema para bases de datos existentes
+
+create_all solo crea las tablas que faltan: no añade índices ni columnas a tablas
+que ya existen ni cambia sus claves foráneas. Este módulo lleva los archivos
+project_management.db antiguos al esquema declarado en los modelos. Es un paso
+explícito que se ejecuta una vez antes de servir (python -m app.initialize_db), no
+en cada worker al importar la aplicación; también se puede lanzar a mano:
+
+    python -m app.database.migrations
+"""
+from contextlib import contextmanager
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+from typing import Dict, List, Tuple
+from app.database.database import Base, engine
+
+def _missing_columns(connection) -> List[Tuple[object, object]]:
+    """(tabla, columna) de las columnas declaradas en los modelos que aún no existen"""
+    import app.models.models  # noqa: F401  (registra las tablas en Base.metadata)
+
+    inspector = inspect(connection)
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        missing += [(table, column) for column in table.columns if column.name not in existing]
+    return missing
+
+def add_missing_columns(connection) -> List[str]:
+    """
+    Añade con ALTER TABLE ... ADD COLUMN las columnas declaradas en los modelos que
+    aún no existen; devuelve "tabla.columna" de cada una. SQLite solo admite así
+    columnas que no sean clave ni únicas y, si son NOT NULL, con server_default.
+    """
+    preparer = connection.dialect.identifier_preparer
+    added = []
+    for table, column in _missing_columns(connection):
+        definition = CreateColumn(column).compile(dialect=connection.dialect)
+        connection.exec_driver_sql(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {definition}")
+        added.append(f"{table.name}.{column.name}")
+    return added
+
+def _declared_foreign_keys(table) -> Dict[Tuple[str, str, str], str]:
+    """(columna, tabla referida, columna referida) -> regla ON DELETE declarada en el modelo"""
+    return {
+        (fk.parent.name, fk.column.table.name, fk.column.name): (fk.ondelete or "NO ACTION").upper()
+        for fk in table.foreign_keys
+    }
+
+def _stored_foreign_keys(connection, table_name: str) -> Dict[Tuple[str, str, str], str]:
+    """Lo mismo leído de la base de datos (el inspector de SQLite no devuelve ON DELETE)"""
+    rows = connection.exec_driver_sql(f"PRAGMA foreign_key_list('{table_name}')").all()
+    return {(row[3], row[2], row[4]): row[6].upper() for row in rows}
+
+def _outdated_foreign_keys(connection) -> List[object]:
+    """Tablas SQLite cuyas claves foráneas no tienen las reglas ON DELETE del modelo"""
+    import app.models.models  # noqa: F401  (registra las tablas en Base.metadata)
+
+    if connection.dialect.name != "sqlite":
+        return []
+    inspector = inspect(connection)
+    return [
+        table for table in Base.metadata.sorted_tables
+        if table.foreign_keys and inspector.has_table(table.name)
+        and _stored_foreign_keys(connection, table.name) != _declared_foreign_keys(table)
+    ]
+
+def _rebuild_table(connection, table, columns: List[str]):
+    """
+    Recrea la tabla con el esquema del modelo conservando sus filas, como indica
+    SQLite para los cambios que ALTER TABLE no admite: tabla nueva, copia, borrado
+    de la antigua y renombrado.
+    """
+    preparer = connection.dialect.identifier_preparer
+    name = preparer.format_table(table)
+    temporary = preparer.quote(f"_rebuild_{table.name}")
+    ddl = str(CreateTable(table).compile(dialect=connection.dialect)).strip()
+    connection.exec_driver_sql(ddl.replace(f"CREATE TABLE {name}", f"CREATE TABLE {temporary}", 1))
+    column_list = ", ".join(preparer.quote(column) for column in columns)
+    connection.exec_driver_sql(f"INSERT INTO {temporary} ({column_list}) SELECT {column_list} FROM {name}")
+    connection.exec_driver_sql(f"DROP TABLE {name}")
+    connection.exec_driver_sql(f"ALTER TABLE {temporary} RENAME TO {name}")
+    for index in table.indexes:
+        connection.execute(CreateIndex(index, if_not_exists=True))
+
+def update_foreign_keys(connection) -> List[str]:
+    """
+    Recrea las tablas SQLite cuyas claves foráneas no tienen las reglas ON DELETE
+    del modelo; devuelve sus nombres. Necesita foreign_keys desactivado y una
+    transacción abierta (ver _migration_connection); al final se comprueba que no
+    quedaron referencias rotas.
+    """
+    rebuilt = []
+    for table in _outdated_foreign_keys(connection):
+        existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+        _rebuild_table(connection, table, [column.name for column in table.columns if column.name in existing])
+        rebuilt.append(table.name)
+    if rebuilt:
+        broken = connection.exec_driver_sql("PRAGMA foreign_key_check").all()
+        if broken:
+            raise RuntimeError(f"Referencias rotas tras recrear {', '.join(rebuilt)}: {broken[:5]}")
+    return rebuilt
+
+def _missing_indexes(connection) -> List[object]:
+    """Índices declarados en los modelos que aún no existen"""
+    import app.models.models  # noqa: F401  (registra las tablas en Base.metadata)
+
+    inspector = inspect(connection)
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing += [index for index in sorted(table.indexes, key=lambda index: index.name) if index.name not in existing]
+    return missing
+
+def create_missing_indexes(connection) -> List[str]:
+    """Crea los índices declarados en los modelos que aún no existen; devuelve sus nombres"""
+    created = []
+    for index in _missing_indexes(connection):
+        connection.execute(CreateIndex(index, if_not_exists=True))
+        created.append(index.name)
+    return created
+
+@contextmanager
+def _migration_connection(bind):
+    """
+    Conexión con el esquema bloqueado mientras se migra. En SQLite, BEGIN IMMEDIATE
+    toma el bloqueo de escritura antes de leer el esquema: si otro proceso migra a la
+    vez, este espera (busy_timeout) y después encuentra el esquema ya actualizado.
+    foreign_keys se desactiva antes porque SQLite no permite cambiarlo dentro de una
+    transacción y recrear una tabla lo necesita.
+    """
+    with bind.connect() as connection:
+        if bind.dialect.name != "sqlite":
+            with connection.begin():
+                yield connection
+            return
+        connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        connection.commit()
+        try:
+            # pysqlite solo abre la transacción antes de un INSERT/UPDATE/DELETE;
+            # sin este BEGIN cada CREATE/DROP se confirmaría por separado
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+            yield connection
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+            connection.commit()
+
+def pending_migrations(bind=None) -> List[str]:
+    """Descripción de los cambios que aplicaría run_migrations, sin aplicarlos"""
+    bind = bind or engine
+    with bind.connect() as connection:
+        changes = [f"columna {table.name}.{column.name}" for table, column in _missing_columns(connection)]
+        rebuilt = _outdated_foreign_keys(connection)
+        changes += [f"claves foráneas de {table.name}" for table in rebuilt]
+        # Las tablas recreadas ya reciben sus índices
+        return changes + [
+            f"índice {index.name}" for index in _missing_indexes(connection) if index.table not in rebuilt
+        ]
+
+def run_migrations(bind=None) -> List[str]:
+    """Aplica todas las migraciones pendientes en una transacción y devuelve una descripción de cada cambio"""
+    bind = bind or engine
+    with _migration_connection(bind) as connection:
+        # Primero las columnas, por si algún índice nuevo las usa
+        changes = [f"columna {name}" for name in add_missing_columns(connection)]
+        changes += [f"claves foráneas de {name}" for name in update_foreign_keys(connection)]
+        return changes + [f"índice {name}" for name in create_missing_indexes(connection)]
+
+if __name__ == "__main__":
+    Base.metadata.create_all(bind=engine)
+    changes = run_migrations(engine)
+    for change in changes:
+        print(f"  + {change}")
+    print("✅ Esquema actualizado" if changes else "✅ El esquema ya estaba actualizado")
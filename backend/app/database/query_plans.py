@@ -0,0 +1,110 @@
+"""
+Revisión de los planes de ejecución de las consultas más frecuentes
+
+Ejecuta EXPLAIN QUERY PLAN sobre cada consulta de hot_queries() y
+señala las que recorren una tabla completa (cualquier SCAN <tabla>, también
+"SCAN <tabla> USING INDEX", que lee el índice entero). Lo usan los tests y
+también se puede lanzar a mano:
+
+    python -m app.database.query_plans
+"""
+import re
+import sys
+from sqlalchemy import select
+from typing import Dict, List, Optional
+from app.database.database import engine
+from app.models import models
+
+def hot_queries() -> Dict[str, object]:
+    """Consultas de las operaciones que filtran, unen u ordenan por columnas indexadas"""
+    from app.api.operations import payroll_operations, employee_operations
+
+    return {
+        "equipo por líder": select(models.Team).where(models.Team.leader_id == 1),
+        "equipo de un programador": select(models.TeamMember).where(models.TeamMember.programmer_id == 1),
+        "miembros de un equipo": select(models.TeamMember).where(models.TeamMember.team_id == 1),
+        "proyecto de un equipo": select(models.Project).where(models.Project.team_id == 1),
+        "proyectos por tipo": select(models.Project).where(models.Project.type == "management"),
+        "proyecto que termina antes": select(models.Project).order_by(models.Project.estimated_time.asc()).limit(1),
+        "empleados por tipo": select(models.Employee).where(models.Employee.type == "leader"),
+        "programador por carnet": select(models.Employee).where(
+            models.Employee.identity_card == "00000000", models.Employee.type == "programmer"
+        ),
+        "lenguajes de un programador": select(models.ProgrammerLanguage.language).where(
+            models.ProgrammerLanguage.programmer_id == 1
+        ),
+        "programadores por lenguaje": select(models.ProgrammerLanguage.programmer_id).where(
+            models.ProgrammerLanguage.language == "Python"
+        ),
+        "programadores por framework": select(models.Programmer).join(
+            models.TeamMember, models.TeamMember.programmer_id == models.Programmer.employee_id
+        ).join(
+            models.Team, models.Team.id == models.TeamMember.team_id
+        ).join(
+            models.Project, models.Project.team_id == models.Team.id
+        ).join(
+            models.ManagementProject, models.ManagementProject.project_id == models.Project.id
+        ).where(models.ManagementProject.framework == "Django").distinct(),
+        "nómina de algunos empleados": payroll_operations.payroll_select([1, 2, 3]),
+        "empleados que se pueden borrar": employee_operations.employee_assignments_select([1, 2, 3]),
+        "ranking de salarios": select(models.EmployeePayroll).order_by(
+            models.EmployeePayroll.total_salary.desc(), models.EmployeePayroll.employee_id.asc()
+        ).limit(5),
+        "empleados por nombre (cursor)": select(models.Employee).where(
+            (models.Employee.name > "M") | ((models.Employee.name == "M") & (models.Employee.id > 10))
+        ).order_by(models.Employee.name, models.Employee.id).limit(100),
+        "proyectos por precio (cursor)": select(models.Project).where(
+            models.Project.price < 5000.0
+        ).order_by(models.Project.price.desc(), models.Project.id.desc()).limit(100),
+    }
+
+# Recorridos de índice permitidos: ORDER BY ... LIMIT que lee el índice en orden y
+# se detiene tras las primeras filas (consulta -> índice)
+ORDERED_INDEX_SCANS = {
+    "proyecto que termina antes": "ix_projects_estimated_time",
+    "ranking de salarios": "ix_employee_payroll_ranking",
+}
+
+def explain(bind, statement) -> List[str]:
+    """Devuelve las líneas de EXPLAIN QUERY PLAN de una consulta"""
+    sql = str(statement.compile(bind=bind, compile_kwargs={"literal_binds": True}))
+    with bind.connect() as connection:
+        return [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+def full_table_scans(plan: List[str], allowed_index: Optional[str] = None) -> List[str]:
+    """
+    Pasos del plan que recorren una tabla entera, directamente o a través de uno de
+    sus índices; solo las búsquedas (SEARCH) no cuentan. Tampoco cuentan los
+    recorridos de subconsultas materializadas, que son tablas temporales, ni el
+    recorrido de allowed_index.
+    """
+    temporary = {"CONSTANT"}  # SCAN CONSTANT ROW: SELECT sin tabla
+    for step in plan:
+        match = re.match(r"(?:MATERIALIZE|CO-ROUTINE) (\S+)", step)
+        if match:
+            temporary.add(match.group(1))
+
+    scans = []
+    for step in plan:
+        match = re.match(r"SCAN (\S+)(?: USING (?:COVERING )?INDEX (\S+))?", step)
+        if match and match.group(1) not in temporary and (allowed_index is None or match.group(2) != allowed_index):
+            scans.append(step)
+    return scans
+
+def check_query_plans(bind=None) -> Dict[str, List[str]]:
+    """Devuelve {consulta: pasos con recorrido completo} para las consultas que fallan"""
+    bind = bind or engine
+    failures = {}
+    for name, statement in hot_queries().items():
+        scans = full_table_scans(explain(bind, statement), ORDERED_INDEX_SCANS.get(name))
+        if scans:
+            failures[name] = scans
+    return failures
+
+if __name__ == "__main__":
+    failures = check_query_plans()
+    for name, scans in failures.items():
+        print(f"❌ {name}: {'; '.join(scans)}")
+    if not failures:
+        print(f"✅ Ninguna de las {len(hot_queries())} consultas frecuentes recorre una tabla completa")
+    sys.exit(1 if failures else 0)
@@ -3,6 +3,7 @@ Script para inicializar la base de datos SQLite
 """
 from app.database.database import engine
 from app.models.models import Base
+from app.database.migrations import run_migrations
 
 def init_db():
     """
@@ -10,6 +11,8 @@ def init_db():
     """
     print("Creando tablas en la base de datos SQLite...")
     Base.metadata.create_all(bind=engine)
+    for change in run_migrations(engine):
+        print(f"  + {change}")
     print("¡Base de datos inicializada con éxito!")
 
 if __name__ == "__main__":
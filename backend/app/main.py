@@ -1,17 +1,55 @@
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database.database import engine
+from app.database.database import engine, read_engine, SessionLocal, describe_engine_profile
 from app.models import models
 from app.api.api import api_router
 from app.config import settings
+from app.api.operations.payroll_operations import ensure_payroll
+from app.api.metrics import QueryMetricsMiddleware
+from app.api.async_routes import async_router
+from app.database.migrations import pending_migrations
+from app.database.async_database import dispose_async_engine
+
+# Logger de la base de datos: migraciones pendientes y perfil al arrancar y, con
+# DB_QUERY_LOG=true, una línea JSON por petición (ver app/api/metrics.py)
+db_logger = logging.getLogger("app.db")
+if not db_logger.handlers:
+    db_logger.setLevel(logging.INFO)
+    db_logger.addHandler(logging.StreamHandler())
 
 # Crear las tablas en la base de datos
 models.Base.metadata.create_all(bind=engine)
 
+# Las migraciones de las bases existentes son un paso aparte que se ejecuta una vez antes
+# de servir (python -m app.initialize_db): cada worker importa este módulo y no deben
+# recrear tablas a la vez. Aquí solo se avisa si el esquema no está al día
+pending = pending_migrations(engine)
+if pending:
+    db_logger.warning("Migraciones pendientes (ejecute python -m app.initialize_db): %s", ", ".join(pending))
+
+# Dejar constancia del perfil del motor que ha tomado efecto (no el configurado)
+db_logger.info("Perfil de la base de datos (escritura): %s", describe_engine_profile(engine))
+if read_engine is not engine:
+    db_logger.info("Perfil de la base de datos (lectura): %s", describe_engine_profile(read_engine))
+db_logger.info("Modo de acceso a la base de datos: %s", "async (aiosqlite)" if settings.DB_ASYNC else "síncrono")
+
+# Construir la nómina materializada si la base de datos aún no la tiene
+with SessionLocal() as db:
+    ensure_payroll(db)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Las conexiones aiosqlite tienen hilos propios: cerrarlas para que el proceso termine
+    await dispose_async_engine()
+
 app = FastAPI(
     title="Sistema de Gestión de Proyectos",
     description="API para gestionar empleados, equipos y proyectos de una empresa",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configurar CORS de manera más segura
@@ -42,8 +80,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Registrar el router principal de la API
-app.include_router(api_router)
+# Consultas SQL y tiempo de base de datos por petición
+app.add_middleware(QueryMetricsMiddleware)
+
+# Registrar el router principal de la API (con rutas async si DB_ASYNC=true)
+app.include_router(async_router(api_router) if settings.DB_ASYNC else api_router)
 
 @app.get("/")
 def read_root():
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, CheckConstraint, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, CheckConstraint, Boolean, DateTime, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -15,26 +15,34 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+# Reglas ON DELETE de las claves foráneas (las aplica SQLite con foreign_keys=ON):
+# borrar un empleado borra su fila de programador o líder, los lenguajes y la
+# nómina; borrar un equipo borra sus miembros y deja su proyecto sin equipo, y
+# borrar un proyecto borra su detalle de gestión o multimedia. Un líder al frente
+# de un equipo o un programador miembro de uno no se pueden borrar (RESTRICT).
 class Employee(Base):
     __tablename__ = "employees"
     
     id = Column(Integer, primary_key=True, index=True)
     identity_card = Column(String(20), unique=True, nullable=False)
-    name = Column(String(100), nullable=False)
+    name = Column(String(100), nullable=False, index=True)
     age = Column(Integer, nullable=False)
     sex = Column(String(10), nullable=False)
-    base_salary = Column(Float, nullable=False)  # Cambiado de DECIMAL a Float para SQLite
-    type = Column(String(20), nullable=False)
+    base_salary = Column(Float, nullable=False, index=True)  # Cambiado de DECIMAL a Float para SQLite
+    type = Column(String(20), nullable=False, index=True)
+    # Versión de la fila: el ORM la incrementa en cada UPDATE (ver versioning.py)
+    version = Column(Integer, nullable=False, server_default="1")
     
     __table_args__ = (
         CheckConstraint("type IN ('programmer', 'leader')", name='employee_type_check'),
     )
+    __mapper_args__ = {"version_id_col": version}
 
 class Programmer(Base):
     __tablename__ = "programmers"
     
-    employee_id = Column(Integer, ForeignKey('employees.id'), primary_key=True)
-    category = Column(String(1), nullable=False)  # Cambiado de CHAR a String para SQLite
+    employee_id = Column(Integer, ForeignKey('employees.id', ondelete="CASCADE"), primary_key=True)
+    category = Column(String(1), nullable=False, index=True)  # Cambiado de CHAR a String para SQLite
     
     employee = relationship("Employee")
     
@@ -45,14 +53,14 @@ class Programmer(Base):
 class ProgrammerLanguage(Base):
     __tablename__ = "programmer_languages"
     
-    programmer_id = Column(Integer, ForeignKey('programmers.employee_id'), primary_key=True)
-    language = Column(String(50), primary_key=True)
+    programmer_id = Column(Integer, ForeignKey('programmers.employee_id', ondelete="CASCADE"), primary_key=True)
+    language = Column(String(50), primary_key=True, index=True)
 
 class Leader(Base):
     __tablename__ = "leaders"
     
-    employee_id = Column(Integer, ForeignKey('employees.id'), primary_key=True)
-    years_experience = Column(Integer, nullable=False)
+    employee_id = Column(Integer, ForeignKey('employees.id', ondelete="CASCADE"), primary_key=True)
+    years_experience = Column(Integer, nullable=False, index=True)
     projects_led = Column(Integer, nullable=False)
     
     employee = relationship("Employee")
@@ -61,49 +69,82 @@ class Team(Base):
     __tablename__ = "teams"
     
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(100), nullable=False)
-    leader_id = Column(Integer, ForeignKey('leaders.employee_id'))
+    name = Column(String(100), nullable=False, index=True)
+    leader_id = Column(Integer, ForeignKey('leaders.employee_id', ondelete="RESTRICT"), index=True)
+    version = Column(Integer, nullable=False, server_default="1")
     
     leader = relationship("Leader")
     project = relationship("Project", back_populates="team", uselist=False)
+    
+    __mapper_args__ = {"version_id_col": version}
 
 class TeamMember(Base):
     __tablename__ = "team_members"
     
-    team_id = Column(Integer, ForeignKey('teams.id'), primary_key=True)
-    programmer_id = Column(Integer, ForeignKey('programmers.employee_id'), primary_key=True)
+    team_id = Column(Integer, ForeignKey('teams.id', ondelete="CASCADE"), primary_key=True)
+    # Índice propio: en la clave primaria compuesta solo es la segunda columna
+    programmer_id = Column(Integer, ForeignKey('programmers.employee_id', ondelete="RESTRICT"), primary_key=True, index=True)
 
 class Project(Base):
     __tablename__ = "projects"
     
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(100), nullable=False)
+    name = Column(String(100), nullable=False, index=True)
     description = Column(Text)
-    estimated_time = Column(Integer, nullable=False)
-    price = Column(Float, nullable=False)  # Cambiado de DECIMAL a Float para SQLite
-    type = Column(String(20), nullable=False)
-    team_id = Column(Integer, ForeignKey('teams.id'), unique=True)
+    estimated_time = Column(Integer, nullable=False, index=True)
+    price = Column(Float, nullable=False, index=True)  # Cambiado de DECIMAL a Float para SQLite
+    type = Column(String(20), nullable=False, index=True)
+    team_id = Column(Integer, ForeignKey('teams.id', ondelete="SET NULL"), unique=True)
+    version = Column(Integer, nullable=False, server_default="1")
     
     team = relationship("Team", back_populates="project")
     
     __table_args__ = (
         CheckConstraint("type IN ('management', 'multimedia')", name='project_type_check'),
     )
+    __mapper_args__ = {"version_id_col": version}
 
 class ManagementProject(Base):
     __tablename__ = "management_projects"
     
-    project_id = Column(Integer, ForeignKey('projects.id'), primary_key=True)
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete="CASCADE"), primary_key=True)
     database_type = Column(String(50), nullable=False)
     programming_language = Column(String(50), nullable=False)
-    framework = Column(String(50), nullable=False)
+    framework = Column(String(50), nullable=False, index=True)
 
 class MultimediaProject(Base):
     __tablename__ = "multimedia_projects"
     
-    project_id = Column(Integer, ForeignKey('projects.id'), primary_key=True)
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete="CASCADE"), primary_key=True)
     development_tool = Column(String(20), nullable=False)
     
     __table_args__ = (
         CheckConstraint("development_tool IN ('flash', 'director')", name='multimedia_tool_check'),
-    )
\ No newline at end of file
+    )
+
+# Nómina materializada: salario total vigente de cada empleado
+class EmployeePayroll(Base):
+    __tablename__ = "employee_payroll"
+    
+    employee_id = Column(Integer, ForeignKey('employees.id', ondelete="CASCADE"), primary_key=True)
+    total_salary = Column(Float, nullable=False)
+    
+    __table_args__ = (
+        # Índice para el ranking de salarios (ORDER BY total_salary DESC, employee_id)
+        Index('ix_employee_payroll_ranking', total_salary.desc(), employee_id),
+    )
+
+# Total acumulado de la nómina de la empresa (una sola fila, id = 1)
+class PayrollSummary(Base):
+    __tablename__ = "payroll_summary"
+    
+    id = Column(Integer, primary_key=True)
+    total_salary = Column(Float, nullable=False, default=0.0)
+    employee_count = Column(Integer, nullable=False, default=0)
+
+# Número de transacciones confirmadas que escribieron cada tabla (ver app/api/cache.py)
+class CacheGeneration(Base):
+    __tablename__ = "cache_generations"
+    
+    table_name = Column(String(50), primary_key=True)
+    generation = Column(Integer, nullable=False, default=0)
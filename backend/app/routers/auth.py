@@ -6,11 +6,13 @@ from app.database.database import get_db
 from app.schemas.auth_schemas import UserCreate, UserResponse, Token, LoginRequest
 from app.api.auth import create_user, authenticate_user, create_access_token
 from app.api.dependencies import get_current_active_user
+from app.api.async_routes import cpu_bound
 from app.config import settings
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 @router.post("/register", response_model=UserResponse)
+@cpu_bound  # bcrypt
 def register_user(user: UserCreate, db: Session = Depends(get_db)):
     """Registrar nuevo usuario admin"""
     try:
@@ -23,6 +25,7 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
         )
 
 @router.post("/login", response_model=Token)
+@cpu_bound  # bcrypt
 def login_user(user_credentials: LoginRequest, db: Session = Depends(get_db)):
     """Iniciar sesión"""
     user = authenticate_user(db, user_credentials.username, user_credentials.password)
@@ -42,6 +45,7 @@ def login_user(user_credentials: LoginRequest, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/token", response_model=Token)
+@cpu_bound  # bcrypt
 def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """Endpoint alternativo para login (compatible con OAuth2)"""
     user = authenticate_user(db, form_data.username, form_data.password)
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.database.database import get_db
+from app.schemas.schemas import BatchRequest, BatchResponse
+from app.api import operations
+from app.api.dependencies import get_current_active_user
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+@router.post("/", response_model=BatchResponse)
+def run_batch(batch: BatchRequest, db: Session = Depends(get_db), current_user = Depends(get_current_active_user)):
+    """
+    Ejecutar varias operaciones en orden con una sola transacción. Si una falla no
+    se guarda ninguna y el error indica su posición en el lote.
+    """
+    try:
+        return {"results": operations.run_batch(db, batch.operations)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
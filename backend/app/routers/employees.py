@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Response, UploadFile
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database.database import get_db
 from app.models import models
 from app.api.operations import (
@@ -9,8 +9,13 @@ from app.api.operations import (
     get_employees as get_employees_op,
     update_employee as update_employee_op,
     delete_employee as delete_employee_op,
+    delete_employees as delete_employees_op,
 )
-from app.api.operations.utils import calculate_salary
+from app.api.operations.utils import calculate_salary, calculate_salaries
+from app.api.operations.employee_operations import EMPLOYEE_SORTS
+from app.api.operations.pagination import set_next_cursor
+from app.api.operations.versioning import StaleVersionError, check_if_match, conditional_response, page_etag, resource_etag
+from app.api.operations.import_operations import import_format, read_import_rows, import_employees
 from app.schemas import schemas
 
 router = APIRouter(prefix="/employees", tags=["employees"])
@@ -35,8 +40,28 @@ def create_employee(employee: schemas.EmployeeCreate, db: Session = Depends(get_
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
 
+@router.post("/import", response_model=schemas.ImportReport)
+def import_employees_file(
+    file: UploadFile = File(..., description="CSV con cabecera o NDJSON, una fila por empleado"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db)
+):
+    """
+    Importa programadores y líderes desde un archivo. Cada fila lleva los datos del
+    empleado y, según type, category y languages (separados por ";" en CSV) o
+    years_experience y projects_led. El formato se toma de la extensión del archivo
+    si no se indica. Las filas válidas se guardan en una sola transacción y las
+    rechazadas se listan en el informe.
+    """
+    try:
+        rows = read_import_rows(file.file, import_format(format, file.filename))
+        return import_employees(db, rows)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/{employee_id}", response_model=schemas.Employee)
-def get_employee(employee_id: int, db: Session = Depends(get_db)):
+def get_employee(employee_id: int, response: Response, if_none_match: Optional[str] = Header(None),
+                 db: Session = Depends(get_db)):
     try:
         db_employee = get_employee_op(db, employee_id=employee_id)
         if db_employee is None:
@@ -44,16 +69,49 @@ def get_employee(employee_id: int, db: Session = Depends(get_db)):
                 status_code=404, 
                 detail=f"Empleado con ID {employee_id} no encontrado"
             )
-        return db_employee
+        return conditional_response(response, if_none_match, resource_etag(db_employee)) or db_employee
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al obtener empleado: {str(e)}")
 
-@router.get("/", response_model=List[schemas.Employee])
-def get_employees(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return get_employees_op(db, skip=skip, limit=limit)
+@router.get("/", response_model=List[schemas.EmployeeWithSalary])
+def get_employees(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1),
+    include_salary: bool = False,
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Lista de empleados. Admite paginación por offset (skip) o por cursor: si la página
+    está llena, la cabecera X-Next-Cursor trae el cursor de la siguiente. La cabecera
+    ETag cambia cuando cambia algún empleado de la página (o su salario).
+    """
+    try:
+        employees = get_employees_op(db, skip=skip, limit=limit, cursor=cursor, sort=sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_next_cursor(response, employees, EMPLOYEE_SORTS, sort, limit)
+
+    # Salarios de toda la página en una sola consulta por bloque
+    salaries = calculate_salaries(db, [employee.id for employee in employees]) if include_salary else {}
+    unchanged = conditional_response(response, if_none_match, page_etag(employees, sorted(salaries.items())))
+    if unchanged:
+        return unchanged
+    if not include_salary:
+        return employees
+    return [
+        schemas.EmployeeWithSalary.model_validate(employee).model_copy(
+            update={"total_salary": salaries.get(employee.id)}
+        )
+        for employee in employees
+    ]
 
 @router.put("/{employee_id}", response_model=schemas.Employee)
-def update_employee(employee_id: int, employee_update: schemas.EmployeeUpdate, db: Session = Depends(get_db)):
+def update_employee(employee_id: int, employee_update: schemas.EmployeeUpdate, response: Response,
+                    if_match: Optional[str] = Header(None), db: Session = Depends(get_db)):
     try:
         # Verificar si el empleado existe
         existing_employee = get_employee_op(db, employee_id=employee_id)
@@ -62,6 +120,8 @@ def update_employee(employee_id: int, employee_update: schemas.EmployeeUpdate, d
                 status_code=404, 
                 detail=f"Empleado con ID {employee_id} no encontrado"
             )
+        # Rechazar la escritura si el cliente no tiene la versión actual
+        check_if_match(if_match, existing_employee)
         
         # Si se está actualizando la cédula, verificar que no exista otro empleado con esa cédula
         if employee_update.identity_card:
@@ -77,7 +137,10 @@ def update_employee(employee_id: int, employee_update: schemas.EmployeeUpdate, d
                 )
         
         db_employee = update_employee_op(db, employee_id=employee_id, employee_update=employee_update)
+        response.headers["ETag"] = resource_etag(db_employee)
         return db_employee
+    except StaleVersionError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
@@ -85,8 +148,13 @@ def update_employee(employee_id: int, employee_update: schemas.EmployeeUpdate, d
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al actualizar empleado: {str(e)}")
 
+@router.delete("/bulk", response_model=schemas.BulkDeleteResult)
+def delete_employees(request: schemas.BulkDelete, db: Session = Depends(get_db)):
+    """Eliminar varios empleados en una transacción; los que no se pueden eliminar se devuelven en conflicts"""
+    return delete_employees_op(db, employee_ids=request.ids)
+
 @router.delete("/{employee_id}")
-def delete_employee(employee_id: int, db: Session = Depends(get_db)):
+def delete_employee(employee_id: int, if_match: Optional[str] = Header(None), db: Session = Depends(get_db)):
     try:
         # Verificar si el empleado existe
         existing_employee = get_employee_op(db, employee_id=employee_id)
@@ -95,30 +163,15 @@ def delete_employee(employee_id: int, db: Session = Depends(get_db)):
                 status_code=404, 
                 detail=f"Empleado con ID {employee_id} no encontrado"
             )
-        
-        # Verificar si el empleado es un líder asignado a un equipo
-        if existing_employee.type == "leader":
-            team = db.query(models.Team).filter(models.Team.leader_id == employee_id).first()
-            if team:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"No se puede eliminar el líder porque está asignado al equipo '{team.name}'"
-                )
-        
-        # Verificar si el empleado es un programador asignado a un equipo
-        if existing_employee.type == "programmer":
-            team_member = db.query(models.TeamMember).filter(
-                models.TeamMember.programmer_id == employee_id
-            ).first()
-            if team_member:
-                team = db.query(models.Team).filter(models.Team.id == team_member.team_id).first()
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"No se puede eliminar el programador porque está asignado a un equipo"
-                )
-        
-        success = delete_employee_op(db, employee_id=employee_id)
+        check_if_match(if_match, existing_employee)
+
+        # Un líder o programador asignado a un equipo no se puede eliminar (ValueError)
+        delete_employee_op(db, employee_id=employee_id)
         return {"message": f"Empleado con ID {employee_id} eliminado exitosamente"}
+    except StaleVersionError as e:
+        raise HTTPException(status_code=412, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database.database import get_db
 from app.api import operations
 from app.schemas import schemas
@@ -22,8 +22,14 @@ def get_leader(leader_id: int, db: Session = Depends(get_db)):
     return db_leader
 
 @router.get("/", response_model=List[schemas.Leader])
-def get_leaders(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return operations.get_leaders(db, skip=skip, limit=limit)
+def get_leaders(response: Response, skip: int = 0, limit: int = Query(100, ge=1),
+                cursor: Optional[str] = None, sort: str = "id", db: Session = Depends(get_db)):
+    try:
+        leaders = operations.get_leaders(db, skip=skip, limit=limit, cursor=cursor, sort=sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    operations.set_next_cursor(response, leaders, operations.LEADER_SORTS, sort, limit)
+    return leaders
 
 @router.put("/{leader_id}", response_model=schemas.Leader)
 def update_leader(leader_id: int, leader_update: schemas.LeaderUpdate, db: Session = Depends(get_db)):
@@ -37,7 +43,10 @@ def update_leader(leader_id: int, leader_update: schemas.LeaderUpdate, db: Sessi
 
 @router.delete("/{leader_id}")
 def delete_leader(leader_id: int, db: Session = Depends(get_db)):
-    success = operations.delete_leader(db, leader_id=leader_id)
+    try:
+        success = operations.delete_leader(db, leader_id=leader_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not success:
         raise HTTPException(status_code=404, detail="Leader not found")
     return {"message": "Leader deleted successfully"}
\ No newline at end of file
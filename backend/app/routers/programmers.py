@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database.database import get_db
+from app.api.async_routes import streaming_response
 from app.api import operations
 from app.schemas import schemas
 from app.schemas.schemas import ProgrammerOut
-from app.models import models
 
 router = APIRouter(prefix="/programmers", tags=["programmers"])
 
@@ -24,21 +25,40 @@ def get_programmer(programmer_id: int, db: Session = Depends(get_db)):
     return db_programmer
 
 @router.get("/", response_model=List[ProgrammerOut])
-def get_programmers(db: Session = Depends(get_db)):
-    programmers = db.query(models.Programmer).all()
-    result = []
-    for prog in programmers:
-        # Obtener lenguajes de este programador
-        languages = db.query(models.ProgrammerLanguage.language).filter(
-            models.ProgrammerLanguage.programmer_id == prog.employee_id
-        ).all()
-        languages_list = [lang[0] for lang in languages]
-        result.append({
-            "employee_id": prog.employee_id,
-            "category": prog.category,
-            "languages": languages_list
-        })
-    return result
+def get_programmers(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: Session = Depends(get_db)
+):
+    """
+    Lista paginada de programadores con sus lenguajes (por offset o por cursor;
+    la cabecera X-Next-Cursor trae el cursor de la página siguiente).
+    Con format=ndjson se ignora la paginación y se envían todos los programadores
+    en streaming, un objeto JSON por línea.
+    """
+    if format == "ndjson":
+        lines = (json.dumps(programmer) + "\n" for programmer in operations.iter_programmers(db))
+        return streaming_response(lines, media_type="application/x-ndjson")
+    try:
+        programmers = operations.list_programmers(db, skip=skip, limit=limit, cursor=cursor, sort=sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    operations.set_next_cursor(response, programmers, operations.PROGRAMMER_SORTS, sort, limit)
+    return programmers
+
+@router.put("/languages", response_model=schemas.ProgrammerLanguagesBatchResult)
+def update_programmers_languages(batch: schemas.ProgrammerLanguagesBatch, db: Session = Depends(get_db)):
+    """Reemplaza los lenguajes de varios programadores; solo se escriben los que cambian"""
+    try:
+        return operations.update_programmers_languages(
+            db, [(update.programmer_id, update.languages) for update in batch.updates]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.put("/{programmer_id}", response_model=schemas.Programmer)
 def update_programmer(programmer_id: int, programmer_update: schemas.ProgrammerUpdate, db: Session = Depends(get_db)):
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database.database import get_db
+from app.api.async_routes import streaming_response
 from app.api import operations
 from app.schemas import schemas
-from fastapi.responses import StreamingResponse
 from app.api.operations.utils import format_project_to_txt
 
 router = APIRouter(prefix="/projects", tags=["projects"])
@@ -17,29 +17,54 @@ def create_project(project: schemas.ProjectCreate, db: Session = Depends(get_db)
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{project_id}", response_model=schemas.Project)
-def get_project(project_id: int, db: Session = Depends(get_db)):
+def get_project(project_id: int, response: Response, if_none_match: Optional[str] = Header(None),
+                db: Session = Depends(get_db)):
     db_project = operations.get_project(db, project_id=project_id)
     if db_project is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    return db_project
+    return operations.conditional_response(response, if_none_match, operations.resource_etag(db_project)) or db_project
 
 @router.get("/", response_model=List[schemas.Project])
-def get_projects(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return operations.get_projects(db, skip=skip, limit=limit)
+def get_projects(response: Response, skip: int = 0, limit: int = Query(100, ge=1),
+                 cursor: Optional[str] = None, sort: str = "id", if_none_match: Optional[str] = Header(None),
+                 db: Session = Depends(get_db)):
+    try:
+        projects = operations.get_projects(db, skip=skip, limit=limit, cursor=cursor, sort=sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    operations.set_next_cursor(response, projects, operations.PROJECT_SORTS, sort, limit)
+    return operations.conditional_response(response, if_none_match, operations.page_etag(projects)) or projects
 
 @router.put("/{project_id}", response_model=schemas.Project)
-def update_project(project_id: int, project_update: schemas.ProjectUpdate, db: Session = Depends(get_db)):
+def update_project(project_id: int, project_update: schemas.ProjectUpdate, response: Response,
+                   if_match: Optional[str] = Header(None), db: Session = Depends(get_db)):
     try:
+        # La sesión conserva el proyecto leído: el UPDATE lleva su versión
+        current = operations.get_project(db, project_id=project_id)
+        operations.check_if_match(if_match, current)
         db_project = operations.update_project(db, project_id=project_id, project_update=project_update)
         if db_project is None:
             raise HTTPException(status_code=404, detail="Project not found")
+        response.headers["ETag"] = operations.resource_etag(db_project)
         return db_project
+    except operations.StaleVersionError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.delete("/bulk", response_model=schemas.BulkDeleteResult)
+def delete_projects(request: schemas.BulkDelete, db: Session = Depends(get_db)):
+    return operations.delete_projects(db, project_ids=request.ids)
+
 @router.delete("/{project_id}")
-def delete_project(project_id: int, db: Session = Depends(get_db)):
-    success = operations.delete_project(db, project_id=project_id)
+def delete_project(project_id: int, if_match: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    try:
+        # La sesión conserva el proyecto leído: el DELETE lleva su versión
+        db_project = operations.get_project(db, project_id=project_id)
+        operations.check_if_match(if_match, db_project)
+        success = operations.delete_project(db, project_id=project_id)
+    except operations.StaleVersionError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     if not success:
         raise HTTPException(status_code=404, detail="Project not found")
     return {"message": "Project deleted successfully"}
@@ -62,7 +87,7 @@ def export_project_txt(project_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Project not found")
     txt_content = format_project_to_txt(db, project_with_details)
     filename = f"proyecto_{project_id}.txt"
-    return StreamingResponse(
+    return streaming_response(
         iter([txt_content]),
         media_type="text/plain",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
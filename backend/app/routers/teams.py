@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database.database import get_db
-from app.schemas.schemas import Team, TeamCreate
+from app.schemas.schemas import Team, TeamCreate, TeamMembersBulk, TeamMembersBulkResult, BulkDelete, BulkDeleteResult
 from app.api import operations
 from app.api.dependencies import get_current_active_user
 
@@ -17,35 +17,61 @@ def create_team(team: TeamCreate, db: Session = Depends(get_db), current_user =
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/", response_model=List[Team])
-def read_teams(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user = Depends(get_current_active_user)):
-    """Obtener lista de equipos"""
-    teams = operations.get_teams(db, skip=skip, limit=limit)
-    return teams
+def read_teams(response: Response, skip: int = 0, limit: int = Query(100, ge=1), cursor: Optional[str] = None,
+               sort: str = "id", if_none_match: Optional[str] = Header(None),
+               db: Session = Depends(get_db), current_user = Depends(get_current_active_user)):
+    """Obtener lista de equipos (paginación por offset o por cursor)"""
+    try:
+        teams = operations.get_teams(db, skip=skip, limit=limit, cursor=cursor, sort=sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    operations.set_next_cursor(response, teams, operations.TEAM_SORTS, sort, limit)
+    return operations.conditional_response(response, if_none_match, operations.page_etag(teams)) or teams
 
 @router.get("/{team_id}", response_model=Team)
-def read_team(team_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_active_user)):
+def read_team(team_id: int, response: Response, if_none_match: Optional[str] = Header(None),
+              db: Session = Depends(get_db), current_user = Depends(get_current_active_user)):
     """Obtener equipo por ID"""
     db_team = operations.get_team(db, team_id=team_id)
     if db_team is None:
         raise HTTPException(status_code=404, detail="Equipo no encontrado")
-    return db_team
+    return operations.conditional_response(response, if_none_match, operations.resource_etag(db_team)) or db_team
 
 @router.put("/{team_id}", response_model=Team)
-def update_team(team_id: int, team: TeamCreate, db: Session = Depends(get_db), current_user = Depends(get_current_active_user)):
-    """Actualizar equipo"""
-    db_team = operations.update_team(db, team_id=team_id, team=team)
+def update_team(team_id: int, team: TeamCreate, response: Response, if_match: Optional[str] = Header(None),
+                db: Session = Depends(get_db), current_user = Depends(get_current_active_user)):
+    """Actualizar equipo (con If-Match, solo si no cambió desde que se leyó)"""
+    try:
+        # La sesión conserva el equipo leído: el UPDATE lleva su versión
+        current = operations.get_team(db, team_id=team_id)
+        operations.check_if_match(if_match, current)
+        db_team = operations.update_team(db, team_id=team_id, team=team)
+    except operations.StaleVersionError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     if db_team is None:
         raise HTTPException(status_code=404, detail="Equipo no encontrado")
+    response.headers["ETag"] = operations.resource_etag(db_team)
     return db_team
 
+@router.delete("/bulk", response_model=BulkDeleteResult)
+def delete_teams(request: BulkDelete, db: Session = Depends(get_db), current_user = Depends(get_current_active_user)):
+    """Eliminar varios equipos en una transacción; los que no existen se devuelven en conflicts"""
+    return operations.delete_teams(db, team_ids=request.ids)
+
 @router.delete("/{team_id}")
-def delete_team(team_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_active_user)):
-    """Eliminar equipo"""
+def delete_team(team_id: int, if_match: Optional[str] = Header(None),
+                db: Session = Depends(get_db), current_user = Depends(get_current_active_user)):
+    """Eliminar equipo (con If-Match, solo si no cambió desde que se leyó)"""
     try:
+        # La sesión conserva el equipo leído: el DELETE lleva su versión
+        db_team = operations.get_team(db, team_id=team_id)
+        operations.check_if_match(if_match, db_team)
         success = operations.delete_team(db, team_id=team_id)
         if not success:
             raise HTTPException(status_code=404, detail="Equipo no encontrado")
         return {"message": "Equipo eliminado exitosamente"}
+    except operations.StaleVersionError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -77,6 +103,22 @@ def add_team_member(team_id: int, request: dict, db: Session = Depends(get_db),
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/{team_id}/members/bulk", response_model=TeamMembersBulkResult)
+def add_team_members(team_id: int, request: TeamMembersBulk, db: Session = Depends(get_db), current_user = Depends(get_current_active_user)):
+    """Agregar varios miembros a un equipo; los que no se pueden añadir se devuelven en conflicts"""
+    try:
+        return operations.add_team_members(db, team_id=team_id, programmer_ids=request.programmer_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/{team_id}/members/bulk", response_model=TeamMembersBulkResult)
+def remove_team_members(team_id: int, request: TeamMembersBulk, db: Session = Depends(get_db), current_user = Depends(get_current_active_user)):
+    """Remover varios miembros de un equipo; los que no son miembros se devuelven en conflicts"""
+    try:
+        return operations.remove_team_members(db, team_id=team_id, programmer_ids=request.programmer_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.delete("/{team_id}/members/{programmer_id}")
 def remove_team_member(team_id: int, programmer_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_active_user)):
     """Remover miembro de un equipo"""
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
-from app.database.database import get_db
+from typing import List, Optional
+from app.database.database import get_db, get_read_db
 from app.api import operations
 from app.schemas import schemas
+from app.api.cache import analytics_cache, PAYROLL_TABLES, PROJECT_TABLES
+from app.api.metrics import route_metrics
+from app.api.async_routes import cpu_bound
 
 # Router para utils (combinación de analytics, multimedia_projects y management_projects)
 router = APIRouter()
@@ -13,24 +16,75 @@ analytics_router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 @analytics_router.get("/earliest-project", response_model=schemas.Project)
 def get_earliest_finishing_project(db: Session = Depends(get_db)):
-    project = operations.get_earliest_finishing_project(db)
+    def load():
+        project = operations.get_earliest_finishing_project(db)
+        return schemas.Project.model_validate(project) if project else None
+    
+    project = analytics_cache.get_or_set(("earliest-project",), PROJECT_TABLES, load, db=db)
     if project is None:
         raise HTTPException(status_code=404, detail="No projects found")
     return project
 
 @analytics_router.get("/projects-count", response_model=List[schemas.ProjectTypeCount])
 def count_projects_by_type(db: Session = Depends(get_db)):
-    return operations.count_projects_by_type(db)
+    return analytics_cache.get_or_set(
+        ("projects-count",), PROJECT_TABLES, lambda: operations.count_projects_by_type(db), db=db
+    )
 
 @analytics_router.get("/highest-paid-employees", response_model=List[schemas.SalaryInfo])
-def get_highest_paid_employees(limit: int = 5, db: Session = Depends(get_db)):
-    return operations.get_highest_paid_employees(db, limit=limit)
+def get_highest_paid_employees(
+    limit: int = Query(5, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    min_salary: Optional[float] = None,
+    db: Session = Depends(get_db)
+):
+    """Ranking de salarios de toda la plantilla, paginable con offset y min_salary"""
+    return analytics_cache.get_or_set(
+        ("highest-paid-employees", limit, offset, min_salary),
+        PAYROLL_TABLES,
+        lambda: operations.get_highest_paid_employees(db, limit=limit, offset=offset, min_salary=min_salary),
+        db=db
+    )
 
 @analytics_router.get("/total-salary")
 def get_total_salary(db: Session = Depends(get_db)):
-    total = operations.calculate_total_salary(db)  # Suponiendo que hay una función para esto
+    total = analytics_cache.get_or_set(
+        ("total-salary",), PAYROLL_TABLES, lambda: operations.calculate_total_salary(db), db=db
+    )
     return {"total": total}
 
+@analytics_router.get("/cache-stats")
+def get_cache_stats():
+    """Contadores de la caché de analytics (aciertos, fallos, invalidaciones...)"""
+    return analytics_cache.stats()
+
+@analytics_router.get("/query-stats")
+def get_query_stats():
+    """Consultas SQL y tiempo de base de datos acumulados por ruta desde el arranque"""
+    return route_metrics.snapshot()
+
+@analytics_router.get("/salary-distribution", response_model=schemas.SalaryDistributionReport)
+@cpu_bound  # numpy
+def get_salary_distribution(bins: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)):
+    """
+    Distribución de salarios (mínimo, máximo, media, p50/p90/p99 e histograma) de toda
+    la plantilla, desglosada por tipo de empleado, categoría y tipo de proyecto.
+    """
+    return analytics_cache.get_or_set(
+        ("salary-distribution", bins), PAYROLL_TABLES, lambda: operations.get_salary_distribution(db, bins=bins),
+        db=db
+    )
+
+@analytics_router.post("/payroll-simulation", response_model=schemas.PayrollSimulationResult)
+@cpu_bound  # numpy
+def simulate_payroll(request: schemas.PayrollSimulationRequest, db: Session = Depends(get_read_db)):
+    """
+    Evalúa escenarios hipotéticos de nómina (coeficientes, subidas de salario base,
+    lenguajes o años de experiencia adicionales) y los compara con la nómina vigente.
+    Es un POST pero no escribe nada, así que usa el pool de lectura.
+    """
+    return operations.simulate_payroll(db, request.scenarios, histogram_bins=request.histogram_bins)
+
 # ================= MANAGEMENT PROJECTS ROUTES =================
 management_projects_router = APIRouter(prefix="/management-projects", tags=["management-projects"])
 
@@ -49,9 +103,15 @@ def get_management_project(project_id: int, db: Session = Depends(get_db)):
     return db_management_project
 
 @management_projects_router.get("/", response_model=List[schemas.ManagementProject])
-def get_all_management_projects(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Obtiene todos los proyectos de gestión"""
-    return operations.get_all_management_projects(db=db, skip=skip, limit=limit)
+def get_all_management_projects(response: Response, skip: int = 0, limit: int = Query(100, ge=1),
+                                cursor: Optional[str] = None, sort: str = "id", db: Session = Depends(get_db)):
+    """Obtiene todos los proyectos de gestión (paginación por offset o por cursor)"""
+    try:
+        projects = operations.get_all_management_projects(db=db, skip=skip, limit=limit, cursor=cursor, sort=sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    operations.set_next_cursor(response, projects, operations.MANAGEMENT_PROJECT_SORTS, sort, limit)
+    return projects
 
 @management_projects_router.put("/{project_id}", response_model=schemas.ManagementProject)
 def update_management_project(project_id: int, management_update: schemas.ManagementProjectBase, db: Session = Depends(get_db)):
@@ -99,9 +159,15 @@ def get_multimedia_project(project_id: int, db: Session = Depends(get_db)):
     return db_multimedia_project
 
 @multimedia_projects_router.get("/", response_model=List[schemas.MultimediaProject])
-def get_all_multimedia_projects(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Obtiene todos los proyectos multimedia"""
-    return operations.get_all_multimedia_projects(db=db, skip=skip, limit=limit)
+def get_all_multimedia_projects(response: Response, skip: int = 0, limit: int = Query(100, ge=1),
+                                cursor: Optional[str] = None, sort: str = "id", db: Session = Depends(get_db)):
+    """Obtiene todos los proyectos multimedia (paginación por offset o por cursor)"""
+    try:
+        projects = operations.get_all_multimedia_projects(db=db, skip=skip, limit=limit, cursor=cursor, sort=sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    operations.set_next_cursor(response, projects, operations.MULTIMEDIA_PROJECT_SORTS, sort, limit)
+    return projects
 
 @multimedia_projects_router.put("/{project_id}", response_model=schemas.MultimediaProject)
 def update_multimedia_project(project_id: int, multimedia_update: schemas.MultimediaProjectBase, db: Session = Depends(get_db)):
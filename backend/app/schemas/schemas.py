@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 # ---- ESQUEMAS BASE ----
@@ -34,6 +34,9 @@ class Employee(EmployeeBase):
     class Config:
         from_attributes = True
 
+class EmployeeWithSalary(Employee):
+    total_salary: Optional[float] = Field(None, description="Salario total (solo si se solicita)")
+
 # ---- ESQUEMAS PARA PROGRAMADORES ----
 class ProgrammerBase(BaseModel):
     employee_id: int
@@ -57,6 +60,26 @@ class ProgrammerUpdate(BaseModel):
     category: Optional[str] = None
     languages: Optional[List[str]] = None
 
+class ProgrammerLanguagesUpdate(BaseModel):
+    programmer_id: int
+    languages: List[str] = Field(..., description="Lista completa de lenguajes del programador")
+
+class ProgrammerLanguagesBatch(BaseModel):
+    updates: List[ProgrammerLanguagesUpdate] = Field(..., min_length=1)
+
+class ProgrammerLanguagesChange(BaseModel):
+    programmer_id: int
+    added: List[str] = []
+    removed: List[str] = []
+
+class ProgrammerConflict(BaseModel):
+    programmer_id: int
+    detail: str
+
+class ProgrammerLanguagesBatchResult(BaseModel):
+    changes: List[ProgrammerLanguagesChange] = []
+    conflicts: List[ProgrammerConflict] = []
+
 class Programmer(ProgrammerBase):
     employee_id: int
     employee: Employee
@@ -119,6 +142,18 @@ class TeamMember(TeamMemberBase):
     class Config:
         from_attributes = True
 
+class TeamMembersBulk(BaseModel):
+    programmer_ids: List[int] = Field(..., min_length=1, description="IDs de los programadores")
+
+class TeamMemberConflict(BaseModel):
+    programmer_id: int
+    detail: str
+
+class TeamMembersBulkResult(BaseModel):
+    team_id: int
+    programmer_ids: List[int] = Field(..., description="Programadores añadidos o quitados")
+    conflicts: List[TeamMemberConflict] = []
+
 # ---- ESQUEMAS PARA PROYECTOS ----
 class ProjectBase(BaseModel):
     name: str = Field(..., min_length=2, max_length=100, description="Nombre del proyecto")
@@ -141,6 +176,7 @@ class ProjectUpdate(BaseModel):
 
 class Project(ProjectBase):
     id: int
+    team_id: Optional[int] = Field(None, description="ID del equipo asignado (None si se borró el equipo)")
 
     class Config:
         from_attributes = True
@@ -190,4 +226,103 @@ class ProjectWithDetails(BaseModel):
 
 class TeamWithProject(BaseModel):
     team: Team
-    project: Optional[Project] = None
\ No newline at end of file
+    project: Optional[Project] = None
+
+# ---- ESQUEMAS PARA SIMULACIÓN DE NÓMINA ----
+class PayrollScenario(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100, description="Nombre del escenario")
+    programmer_project_rate: float = Field(0.05, ge=0, description="Porcentaje del precio del proyecto para programadores")
+    programmer_language_bonus: float = Field(3, ge=0, description="Bono por cada lenguaje de programación")
+    leader_project_rate: float = Field(0.10, ge=0, description="Porcentaje del precio del proyecto para líderes")
+    leader_experience_bonus: float = Field(5, ge=0, description="Bono por cada año de experiencia del líder")
+    base_salary_factor: float = Field(1.0, gt=0, description="Multiplicador del salario base (1.05 = +5%)")
+    extra_languages: Dict[str, int] = Field({}, description="Lenguajes adicionales por categoría de programador (A, B, C)")
+    extra_years_experience: int = Field(0, ge=0, description="Años de experiencia adicionales para los líderes")
+
+    @validator('extra_languages')
+    def validate_extra_languages(cls, v):
+        invalid = [category for category in v if category not in ("A", "B", "C")]
+        if invalid:
+            raise ValueError(f"Categorías no válidas: {', '.join(invalid)}")
+        negative = [category for category, count in v.items() if count < 0]
+        if negative:
+            raise ValueError(f"La cantidad de lenguajes adicionales no puede ser negativa: {', '.join(negative)}")
+        return v
+
+class PayrollSimulationRequest(BaseModel):
+    scenarios: List[PayrollScenario] = Field(..., min_length=1, max_length=200, description="Escenarios a evaluar")
+    histogram_bins: int = Field(10, ge=1, le=100, description="Cantidad de intervalos del histograma")
+
+class SalaryDistribution(BaseModel):
+    count: int = 0
+    min: float
+    max: float
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    histogram_edges: List[float] = []
+    histogram_counts: List[int] = []
+
+class PayrollScenarioResult(BaseModel):
+    name: str
+    total: float
+    delta: float
+    delta_percent: float
+    employees_affected: int
+    distribution: Optional[SalaryDistribution] = None
+
+class PayrollSimulationResult(BaseModel):
+    employee_count: int
+    baseline_total: float
+    scenarios: List[PayrollScenarioResult]
+
+class SalaryDistributionReport(BaseModel):
+    overall: Optional[SalaryDistribution] = None
+    by_employee_type: Dict[str, SalaryDistribution] = {}
+    by_category: Dict[str, SalaryDistribution] = {}
+    by_project_type: Dict[str, SalaryDistribution] = {}
+
+# ---- ESQUEMAS PARA IMPORTACIÓN MASIVA ----
+class ImportRowError(BaseModel):
+    row: int = Field(..., description="Número de fila de datos en el archivo (desde 1)")
+    identity_card: Optional[str] = None
+    errors: List[str]
+
+class ImportReport(BaseModel):
+    total: int = Field(..., description="Filas leídas")
+    imported: int = Field(..., description="Empleados creados")
+    programmers: int
+    leaders: int
+    errors: List[ImportRowError] = []
+
+# ---- ESQUEMAS PARA BORRADOS EN BLOQUE ----
+class BulkDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, description="IDs de los registros a eliminar")
+
+class BulkDeleteConflict(BaseModel):
+    id: int
+    detail: str
+
+class BulkDeleteResult(BaseModel):
+    deleted: List[int] = Field(..., description="IDs eliminados")
+    conflicts: List[BulkDeleteConflict] = []
+
+# ---- ESQUEMAS PARA LOTES DE OPERACIONES ----
+class BatchOperationRequest(BaseModel):
+    op: str = Field(..., description="Nombre de la operación, por ejemplo create_team")
+    args: Dict[str, Any] = Field({}, description="Argumentos de la operación; \"$alias\" usa el ID creado por otra anterior")
+    ref: Optional[str] = Field(None, pattern=r"^\w+$", description="Alias para referenciar el ID que crea esta operación")
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperationRequest] = Field(..., min_length=1)
+
+class BatchOperationResult(BaseModel):
+    index: int
+    op: str
+    ref: Optional[str] = None
+    id: Optional[int] = Field(None, description="ID de lo creado o modificado, si la operación lo tiene")
+    result: Any = None
+
+class BatchResponse(BaseModel):
+    results: List[BatchOperationResult]
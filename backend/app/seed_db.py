@@ -0,0 +1,300 @@
+"""
+Script para poblar la base de datos con datos sintéticos
+
+Genera empleados (programadores y líderes), lenguajes, equipos, miembros y
+proyectos de gestión y multimedia. Con la misma semilla y los mismos parámetros
+el resultado es siempre idéntico.
+
+Uso:
+    python -m app.seed_db --employees 100000
+    python -m app.seed_db --employees 1000000 --leader-ratio 0.05 --seed 7 --reset
+"""
+import argparse
+import random
+import sys
+import time
+from itertools import combinations
+from sqlalchemy import create_engine, delete, func, insert, select
+from sqlalchemy.pool import NullPool
+from app.database.database import engine
+from app.api.cache import PAYROLL_TABLES, bump_shared_generations
+from app.models import models
+from app.models.models import Base
+
+LANGUAGES = ["Python", "Java", "Javascript", "Go", "Rust", "C#", "Php", "Kotlin", "Swift", "Ruby"]
+FRAMEWORKS = ["Django", "Spring", "React", "Laravel", "Rails", "Fastapi"]
+DATABASES = ["Postgresql", "Mysql", "Sqlite", "Oracle"]
+DEVELOPMENT_TOOLS = ["flash", "director"]
+
+# Filas por executemany y filas por transacción
+BATCH_SIZE = 10000
+TRANSACTION_SIZE = 200000
+
+# Pragmas de SQLite para la carga masiva: sin fsync y con una caché grande. Solo se
+# aplican a la conexión del seeder. El modo de diario no se toca: pasar de WAL a
+# otro modo exige que no haya más conexiones abiertas (las de la aplicación).
+LOAD_PRAGMAS = (
+    "PRAGMA foreign_keys=OFF",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-262144",
+)
+
+TABLE_COLUMNS = {
+    "employees": ("id", "identity_card", "name", "age", "sex", "base_salary", "type"),
+    "leaders": ("employee_id", "years_experience", "projects_led"),
+    "programmers": ("employee_id", "category"),
+    "programmer_languages": ("programmer_id", "language"),
+    "teams": ("id", "name", "leader_id"),
+    "team_members": ("team_id", "programmer_id"),
+    "projects": ("id", "name", "description", "estimated_time", "price", "type", "team_id"),
+    "management_projects": ("project_id", "database_type", "programming_language", "framework"),
+    "multimedia_projects": ("project_id", "development_tool"),
+}
+
+class SeedConfig:
+    """Parámetros de la generación de datos"""
+
+    def __init__(self, employees: int, seed: int = 42, leader_ratio: float = 0.1,
+                 min_languages: int = 1, max_languages: int = 4, membership_ratio: float = 0.85,
+                 project_ratio: float = 0.8, management_ratio: float = 0.5):
+        if employees < 1:
+            raise ValueError("Se necesita al menos un empleado")
+        if not 0 < leader_ratio <= 1:
+            raise ValueError("leader_ratio debe estar entre 0 y 1")
+        if not 0 <= min_languages <= max_languages <= len(LANGUAGES):
+            raise ValueError(f"El número de lenguajes debe estar entre 0 y {len(LANGUAGES)}")
+        for name, ratio in (("membership_ratio", membership_ratio), ("project_ratio", project_ratio),
+                            ("management_ratio", management_ratio)):
+            if not 0 <= ratio <= 1:
+                raise ValueError(f"{name} debe estar entre 0 y 1")
+        self.employees = employees
+        self.seed = seed
+        self.leader_ratio = leader_ratio
+        self.min_languages = min_languages
+        self.max_languages = max_languages
+        self.membership_ratio = membership_ratio
+        self.project_ratio = project_ratio
+        self.management_ratio = management_ratio
+
+    @property
+    def leaders(self) -> int:
+        return max(1, int(self.employees * self.leader_ratio))
+
+    def rng(self, table: str) -> random.Random:
+        """Generador propio por tabla: cada tabla es reproducible por separado"""
+        return random.Random(f"{self.seed}:{table}")
+
+# ---- GENERADORES DE FILAS ----
+# Cada generador produce tuplas en el orden de columnas declarado en TABLE_COLUMNS.
+# Los valores se derivan de rng.random() en lugar de randint/choice, que son
+# varias veces más lentos y dominan el tiempo de generación con millones de filas.
+# Los IDs se asignan a partir de los máximos existentes, así que se puede sembrar
+# sobre una base con datos. Los líderes ocupan los primeros IDs y cada uno tiene un equipo.
+def _employee_rows(config, first_employee):
+    random = config.rng("employees").random
+    leaders = config.leaders
+    for offset in range(config.employees):
+        employee_id = first_employee + offset
+        yield (
+            employee_id, f"S{config.seed}-{employee_id:07d}", f"Empleado {employee_id}",
+            18 + int(random() * 53), "M" if random() < 0.5 else "F", float(800 + int(random() * 4201)),
+            "leader" if offset < leaders else "programmer"
+        )
+
+def _leader_rows(config, first_employee):
+    random = config.rng("leaders").random
+    for offset in range(config.leaders):
+        yield (first_employee + offset, 1 + int(random() * 30), int(random() * 21))
+
+def _programmer_ids(config, first_employee):
+    return range(first_employee + config.leaders, first_employee + config.employees)
+
+def _programmer_rows(config, first_employee):
+    random = config.rng("programmers").random
+    for programmer_id in _programmer_ids(config, first_employee):
+        yield (programmer_id, "ABC"[int(random() * 3)])
+
+def _language_rows(config, first_employee):
+    random = config.rng("languages").random
+    # Todas las combinaciones posibles de lenguajes, agrupadas por tamaño
+    choices = [list(combinations(LANGUAGES, size)) for size in range(config.min_languages, config.max_languages + 1)]
+    for programmer_id in _programmer_ids(config, first_employee):
+        options = choices[int(random() * len(choices))]
+        for language in options[int(random() * len(options))]:
+            yield (programmer_id, language)
+
+def _team_rows(config, first_employee, first_team):
+    for offset in range(config.leaders):
+        yield (first_team + offset, f"Equipo {first_team + offset}", first_employee + offset)
+
+def _member_rows(config, first_employee, first_team):
+    random = config.rng("team_members").random
+    leaders = config.leaders
+    for programmer_id in _programmer_ids(config, first_employee):
+        if random() < config.membership_ratio:
+            yield (first_team + int(random() * leaders), programmer_id)
+
+def _project_plan(config, first_team, first_project):
+    """Decide qué equipos tienen proyecto y de qué tipo: [(project_id, team_id, type)]"""
+    rng = config.rng("projects")
+    plan = []
+    for offset in range(config.leaders):
+        if rng.random() < config.project_ratio:
+            project_type = "management" if rng.random() < config.management_ratio else "multimedia"
+            plan.append((first_project + len(plan), first_team + offset, project_type))
+    return plan
+
+def _project_rows(config, plan):
+    rng = config.rng("project_data")
+    for project_id, team_id, project_type in plan:
+        yield (
+            project_id, f"Proyecto {project_id}", f"Proyecto sintético {project_id}",
+            rng.randint(10, 2000), float(rng.randint(1000, 200000)), project_type, team_id
+        )
+
+def _management_rows(config, plan):
+    rng = config.rng("management_projects")
+    for project_id, _, project_type in plan:
+        if project_type == "management":
+            yield (project_id, rng.choice(DATABASES), rng.choice(LANGUAGES), rng.choice(FRAMEWORKS))
+
+def _multimedia_rows(config, plan):
+    rng = config.rng("multimedia_projects")
+    for project_id, _, project_type in plan:
+        if project_type == "multimedia":
+            yield (project_id, rng.choice(DEVELOPMENT_TOOLS))
+
+# ---- CARGA ----
+def _next_id(connection, column) -> int:
+    return (connection.execute(select(func.max(column))).scalar() or 0) + 1
+
+def _bulk_insert(connection, table, rows) -> int:
+    """
+    Inserta las tuplas con executemany por lotes y confirma cada TRANSACTION_SIZE filas.
+    En SQLite las tuplas van directamente al cursor del driver, sin el procesamiento
+    por fila de SQLAlchemy.
+    """
+    columns = TABLE_COLUMNS[table.name]
+    if connection.dialect.name == "sqlite":
+        sql = f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        dbapi_connection = connection.connection
+        cursor = dbapi_connection.cursor()
+        execute = lambda batch: cursor.executemany(sql, batch)
+        commit = dbapi_connection.commit
+    else:
+        statement = insert(table)
+        execute = lambda batch: connection.execute(statement, [dict(zip(columns, row)) for row in batch])
+        commit = connection.commit
+
+    inserted = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            execute(batch)
+            inserted += len(batch)
+            batch = []
+            if inserted % TRANSACTION_SIZE == 0:
+                commit()
+    if batch:
+        execute(batch)
+        inserted += len(batch)
+    commit()
+    return inserted
+
+def seed_database(config: SeedConfig, bind=None, reset: bool = False, build_payroll: bool = True,
+                  verbose: bool = False) -> dict:
+    """
+    Llena la base de datos según config y devuelve cuántas filas se insertaron por tabla.
+    Usa una conexión propia (sin pool) para que los pragmas de carga no afecten a la aplicación.
+    Sin build_payroll se borra el resumen de la nómina, para que ensure_payroll la
+    reconstruya al arrancar la aplicación en lugar de servir la anterior.
+    """
+    bind = bind or engine
+    is_sqlite = bind.dialect.name == "sqlite"
+    if reset:
+        Base.metadata.drop_all(bind=bind)
+    Base.metadata.create_all(bind=bind)
+
+    loader = create_engine(bind.url, poolclass=NullPool)
+    counts = {}
+    with loader.connect() as connection:
+        if is_sqlite:
+            for pragma in LOAD_PRAGMAS:
+                connection.exec_driver_sql(pragma)
+            connection.commit()
+
+        first_employee = _next_id(connection, models.Employee.id)
+        first_team = _next_id(connection, models.Team.id)
+        first_project = _next_id(connection, models.Project.id)
+        connection.commit()
+        plan = _project_plan(config, first_team, first_project)
+
+        for model, rows in (
+            (models.Employee, _employee_rows(config, first_employee)),
+            (models.Leader, _leader_rows(config, first_employee)),
+            (models.Programmer, _programmer_rows(config, first_employee)),
+            (models.ProgrammerLanguage, _language_rows(config, first_employee)),
+            (models.Team, _team_rows(config, first_employee, first_team)),
+            (models.TeamMember, _member_rows(config, first_employee, first_team)),
+            (models.Project, _project_rows(config, plan)),
+            (models.ManagementProject, _management_rows(config, plan)),
+            (models.MultimediaProject, _multimedia_rows(config, plan)),
+        ):
+            started = time.perf_counter()
+            counts[model.__tablename__] = _bulk_insert(connection, model.__table__, rows)
+            if verbose:
+                print(f"  {model.__tablename__}: {counts[model.__tablename__]} filas en {time.perf_counter() - started:.1f}s")
+
+    if build_payroll:
+        # Import diferido: las operaciones importan la aplicación completa de esquemas
+        from sqlalchemy.orm import Session
+        from app.api.operations.payroll_operations import rebuild_payroll
+        started = time.perf_counter()
+        with Session(bind=loader) as db:
+            rebuild_payroll(db)
+            db.commit()
+        if verbose:
+            print(f"  employee_payroll: reconstruida en {time.perf_counter() - started:.1f}s")
+    with loader.begin() as connection:
+        if not build_payroll:
+            connection.execute(delete(models.PayrollSummary.__table__))
+        # Las filas se insertaron sin Session: avisar a la caché de analytics de los procesos en marcha
+        bump_shared_generations(connection, set(counts) | PAYROLL_TABLES)
+    loader.dispose()
+    return counts
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pobla la base de datos con datos sintéticos")
+    parser.add_argument("--employees", type=int, default=10000, help="Cantidad de empleados a generar")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla de la generación")
+    parser.add_argument("--leader-ratio", type=float, default=0.1, help="Proporción de líderes (uno por equipo)")
+    parser.add_argument("--min-languages", type=int, default=1, help="Mínimo de lenguajes por programador")
+    parser.add_argument("--max-languages", type=int, default=4, help="Máximo de lenguajes por programador")
+    parser.add_argument("--membership-ratio", type=float, default=0.85, help="Proporción de programadores con equipo")
+    parser.add_argument("--project-ratio", type=float, default=0.8, help="Proporción de equipos con proyecto")
+    parser.add_argument("--management-ratio", type=float, default=0.5, help="Proporción de proyectos de gestión")
+    parser.add_argument("--reset", action="store_true", help="Borra y recrea las tablas antes de sembrar")
+    parser.add_argument("--skip-payroll", action="store_true", help="No reconstruye la nómina materializada (la aplicación la reconstruye al arrancar)")
+    args = parser.parse_args(argv)
+
+    try:
+        config = SeedConfig(
+            args.employees, seed=args.seed, leader_ratio=args.leader_ratio,
+            min_languages=args.min_languages, max_languages=args.max_languages,
+            membership_ratio=args.membership_ratio, project_ratio=args.project_ratio,
+            management_ratio=args.management_ratio
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"Sembrando {config.employees} empleados ({config.leaders} líderes) con semilla {config.seed}...")
+    started = time.perf_counter()
+    seed_database(config, reset=args.reset, build_payroll=not args.skip_payroll, verbose=True)
+    print(f"✅ Base de datos poblada en {time.perf_counter() - started:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
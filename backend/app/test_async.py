@@ -0,0 +1,190 @@
+import inspect
+import json
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from app.main import app as sync_app, lifespan
+from app.api.api import api_router
+from app.api.async_routes import async_router
+from app.api.metrics import QueryMetricsMiddleware
+from app.testing_utils import employee_payload, generate_unique_id
+
+def build_async_app():
+    """La misma API que app.main con DB_ASYNC=true"""
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(QueryMetricsMiddleware)
+    app.include_router(async_router(api_router))
+    return app
+
+def test_async_routes_are_coroutines_with_the_same_paths():
+    async_app = build_async_app()
+    sync_routes = {(route.path, tuple(sorted(route.methods))) for route in api_router.routes if isinstance(route, APIRoute)}
+    async_routes = {(route.path, tuple(sorted(route.methods))) for route in async_app.routes if isinstance(route, APIRoute)}
+    assert async_routes == sync_routes
+    cpu_bound = {"/auth/register", "/auth/login", "/auth/token", "/analytics/salary-distribution",
+                 "/analytics/payroll-simulation"}
+    for route in async_app.routes:
+        if isinstance(route, APIRoute) and "db" in inspect.signature(route.endpoint).parameters:
+            # bcrypt y numpy siguen en el threadpool para no bloquear el bucle de eventos
+            assert inspect.iscoroutinefunction(route.endpoint) == (route.path not in cpu_bound), route.path
+
+def test_async_mode_matches_sync_mode():
+    sync_client = TestClient(sync_app)
+    with TestClient(build_async_app()) as client:
+        credentials = {"username": f"async{generate_unique_id()}", "password": "secret123"}
+        response = client.post("/auth/register", json={**credentials, "email": f"{credentials['username']}@example.com"})
+        assert response.status_code == 200
+        token = client.post("/auth/login", json=credentials).json()["access_token"]
+        # Dependencias encadenadas (get_current_active_user -> get_current_user -> get_db)
+        me = client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+        assert me.json()["username"] == credentials["username"]
+
+        created = client.post("/programmers/", json={
+            "employee_id": 0,
+            "category": "A",
+            "employee_data": employee_payload("Programador Async", sex="F"),
+            "languages": ["Python", "Rust"]
+        })
+        assert created.status_code == 200
+        programmer_id = created.json()["employee_id"]
+        assert int(created.headers["X-DB-Queries"]) > 0
+
+        for path in (f"/programmers/{programmer_id}", f"/employees/{programmer_id}",
+                     f"/programmers/?limit=1000", f"/employees/{programmer_id}/salary"):
+            response = client.get(path)
+            assert response.status_code == 200, path
+            assert response.json() == sync_client.get(path).json(), path
+
+        # El streaming avanza dentro del puente greenlet
+        lines = [json.loads(line) for line in client.get("/programmers/?format=ndjson").text.splitlines()]
+        assert {"employee_id": programmer_id, "category": "A", "languages": ["Python", "Rust"]} in lines
+
+        assert client.delete(f"/programmers/{programmer_id}").status_code == 200
+        assert client.get(f"/programmers/{programmer_id}").status_code == 404
+
+def test_every_async_route_validates_its_response_model():
+    """Recorre todas las rutas en modo async; las lecturas deben responder igual que en modo síncrono"""
+    sync_client = TestClient(sync_app)
+    visited = set()
+
+    with TestClient(build_async_app()) as client:
+        def call(method, template, status=200, compare=True, **kwargs):
+            visited.add((method, template))
+            url = template.format(**{key: kwargs.pop(key) for key in list(kwargs) if "{" + key + "}" in template})
+            kwargs.setdefault("headers", headers)
+            response = client.request(method, url, **kwargs)
+            assert response.status_code == status, (method, url, response.text)
+            if method == "GET" and compare:
+                expected = sync_client.request(method, url, **kwargs)
+                assert response.content == expected.content, url
+            return response.json() if "json" in response.headers.get("content-type", "") else response.text
+
+        # Autenticación
+        headers = {}
+        credentials = {"username": f"rutas{generate_unique_id()}", "password": "secret123"}
+        call("POST", "/auth/register", json={**credentials, "email": f"{credentials['username']}@example.com"})
+        headers = {"Authorization": f"Bearer {call('POST', '/auth/login', json=credentials)['access_token']}"}
+        call("POST", "/auth/token", data=credentials)
+        call("GET", "/auth/me", compare=False)
+        call("GET", "/auth/protected", compare=False)
+
+        # Líderes, equipos y programadores
+        leader_id = call("POST", "/leaders/", json={
+            "years_experience": 4, "projects_led": 1, "employee_data": employee_payload("Líder Rutas", "leader")
+        })["employee_id"]
+        call("GET", "/leaders/{leader_id}", leader_id=leader_id)
+        call("GET", "/leaders/", params={"limit": 1000})
+        call("PUT", "/leaders/{leader_id}", leader_id=leader_id, json={"projects_led": 2})
+        team_ids = [call("POST", "/teams/", json={"name": f"Equipo Rutas {index}", "leader_id": leader}).get("id")
+                    for index, leader in enumerate([leader_id, None, None, None])]
+        call("GET", "/teams/{team_id}", team_id=team_ids[0])
+        call("GET", "/teams/", params={"limit": 1000})
+        call("PUT", "/teams/{team_id}", team_id=team_ids[0], json={"name": "Equipo Rutas"})
+        programmers = [call("POST", "/programmers/", json={
+            "employee_id": 0, "category": "B", "employee_data": employee_payload(f"Programador Rutas {index}"),
+            "languages": ["Python", "Go"]
+        }) for index in range(3)]
+        programmer_ids = [programmer["employee_id"] for programmer in programmers]
+        call("GET", "/programmers/{programmer_id}", programmer_id=programmer_ids[0])
+        call("GET", "/programmers/", params={"limit": 1000})
+        call("PUT", "/programmers/languages", json={"updates": [
+            {"programmer_id": programmer_ids[1], "languages": ["Python", "Rust"]}
+        ]})
+        call("PUT", "/programmers/{programmer_id}", programmer_id=programmer_ids[0], json={"category": "A"})
+        call("GET", "/programmers/{programmer_id}/languages", programmer_id=programmer_ids[1])
+        call("POST", "/teams/{team_id}/members", team_id=team_ids[0], json={"programmer_id": programmer_ids[0]})
+        call("POST", "/teams/{team_id}/members/bulk", team_id=team_ids[0], json={"programmer_ids": programmer_ids[1:]})
+        call("GET", "/teams/{team_id}/members", team_id=team_ids[0])
+
+        # Proyectos
+        def project_data(name, project_type, team_id):
+            return {"name": name, "estimated_time": 120, "price": 3000.0, "type": project_type, "team_id": team_id}
+
+        management_id = call("POST", "/management-projects/", json={
+            "database_type": "SQLite", "programming_language": "Python", "framework": "FastAPI",
+            "project_data": project_data("Gestión Rutas", "management", team_ids[0])
+        })["project_id"]
+        call("GET", "/management-projects/{project_id}", project_id=management_id)
+        call("GET", "/management-projects/", params={"limit": 1000})
+        call("PUT", "/management-projects/{project_id}", project_id=management_id, json={
+            "database_type": "SQLite", "programming_language": "Python", "framework": "Django"
+        })
+        multimedia_id = call("POST", "/multimedia-projects/", json={
+            "development_tool": "flash", "project_data": project_data("Multimedia Rutas", "multimedia", team_ids[1])
+        })["project_id"]
+        call("GET", "/multimedia-projects/{project_id}", project_id=multimedia_id)
+        call("GET", "/multimedia-projects/", params={"limit": 1000})
+        call("PUT", "/multimedia-projects/{project_id}", project_id=multimedia_id, json={"development_tool": "director"})
+        project_ids = [call("POST", "/projects/", json=project_data(f"Proyecto Rutas {index}", "management", team_id))["id"]
+                       for index, team_id in enumerate(team_ids[2:])]
+        call("GET", "/projects/{project_id}", project_id=management_id)
+        call("GET", "/projects/", params={"limit": 1000})
+        call("PUT", "/projects/{project_id}", project_id=management_id, json={"price": 3500.0})
+        call("GET", "/projects/by-type/{project_type}", project_type="management")
+        call("GET", "/projects/{project_id}/details", project_id=management_id)
+        call("GET", "/projects/{project_id}/export-txt", project_id=management_id)
+        call("GET", "/programmers/by-project/{project_id}", project_id=management_id)
+        call("GET", "/programmers/by-framework/{framework}", framework="Django")
+        call("GET", "/programmers/by-identity/{identity_card}/project",
+             identity_card=programmers[0]["employee"]["identity_card"])
+
+        # Analíticas
+        call("GET", "/analytics/earliest-project")
+        call("GET", "/analytics/projects-count")
+        call("GET", "/analytics/highest-paid-employees")
+        call("GET", "/analytics/total-salary")
+        call("GET", "/analytics/cache-stats", compare=False)
+        call("GET", "/analytics/query-stats", compare=False)
+        call("GET", "/analytics/salary-distribution")
+        call("POST", "/analytics/payroll-simulation", json={"scenarios": [{"name": "Base"}]})
+
+        # Empleados y lotes
+        employee_id = call("POST", "/employees/", json=employee_payload("Empleado Rutas"))["id"]
+        imported = "identity_card,name,age,sex,base_salary,type,category,languages,years_experience,projects_led\n" \
+                   f"{generate_unique_id()},Importado Rutas,30,M,1000,programmer,C,Java,,"
+        call("POST", "/employees/import", files={"file": ("altas.csv", imported.encode(), "text/csv")})
+        call("GET", "/employees/{employee_id}", employee_id=employee_id)
+        call("GET", "/employees/", params={"limit": 1000, "include_salary": True})
+        call("PUT", "/employees/{employee_id}", employee_id=employee_id, json={"age": 36})
+        call("GET", "/employees/{employee_id}/salary", employee_id=programmer_ids[0])
+        batch_team_id = call("POST", "/batch/", json={"operations": [
+            {"op": "create_team", "args": {"team": {"name": "Equipo Lote Rutas"}}}
+        ]})["results"][0]["result"]["id"]
+
+        # Borrados
+        call("DELETE", "/teams/{team_id}/members/bulk", team_id=team_ids[0], json={"programmer_ids": programmer_ids[2:]})
+        call("DELETE", "/teams/{team_id}/members/{programmer_id}", team_id=team_ids[0], programmer_id=programmer_ids[1])
+        call("DELETE", "/management-projects/{project_id}", project_id=management_id)
+        call("DELETE", "/multimedia-projects/{project_id}", project_id=multimedia_id)
+        call("DELETE", "/projects/{project_id}", project_id=project_ids[0])
+        call("DELETE", "/projects/bulk", json={"ids": project_ids[1:]})
+        call("DELETE", "/teams/{team_id}", team_id=team_ids[0])
+        call("DELETE", "/teams/bulk", json={"ids": [*team_ids[1:], batch_team_id]})
+        call("DELETE", "/programmers/{programmer_id}", programmer_id=programmer_ids[2])
+        call("DELETE", "/leaders/{leader_id}", leader_id=leader_id)
+        call("DELETE", "/employees/{employee_id}", employee_id=employee_id)
+        call("DELETE", "/employees/bulk", json={"ids": programmer_ids[:2]})
+
+    routes = {(method, route.path) for route in api_router.routes if isinstance(route, APIRoute)
+              for method in route.methods}
+    assert routes - visited == set()
@@ -0,0 +1,108 @@
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database.database import SessionLocal, engine
+from app.api import operations
+from app.models import models
+from app.testing_utils import employee_payload, generate_unique_id
+
+client = TestClient(app)
+
+def auth_headers():
+    username = f"lotes{generate_unique_id()}"
+    credentials = {"username": username, "password": "testpass123"}
+    client.post("/auth/register", json={**credentials, "email": f"{username}@example.com"})
+    token = client.post("/auth/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+def employee_data(name, employee_type="programmer"):
+    return employee_payload(name, employee_type, age=35, sex="F", base_salary=1500.0)
+
+def onboarding(team_name):
+    """Alta de un equipo completo: líder, equipo, dos programadores y proyecto de gestión"""
+    return [
+        {"op": "create_leader", "ref": "lider", "args": {"leader": {
+            "years_experience": 8, "projects_led": 2, "employee_data": employee_data("Líder Lote", "leader")
+        }}},
+        {"op": "create_team", "ref": "equipo", "args": {"team": {"name": team_name, "leader_id": "$lider"}}},
+        {"op": "create_programmer", "ref": "ana", "args": {"programmer": {
+            "employee_id": 0, "category": "A", "employee_data": employee_data("Ana Lote"), "languages": ["Python"]
+        }}},
+        {"op": "create_programmer", "ref": "luis", "args": {"programmer": {
+            "employee_id": 0, "category": "C", "employee_data": employee_data("Luis Lote"), "languages": ["Go"]
+        }}},
+        {"op": "add_team_members", "args": {"team_id": "$equipo", "programmer_ids": ["$ana", "$luis"]}},
+        {"op": "create_management_project", "ref": "proyecto", "args": {"management_project": {
+            "database_type": "SQLite", "programming_language": "Python", "framework": "FastAPI",
+            "project_data": {
+                "name": f"Proyecto {team_name}", "estimated_time": 120, "price": 5000.0,
+                "type": "management", "team_id": "$equipo"
+            }
+        }}},
+    ]
+
+def test_batch_runs_onboarding_in_one_commit():
+    headers = auth_headers()
+    team_name = f"Equipo Lote {generate_unique_id()}"
+    commits = []
+    listener = lambda connection: commits.append(1)
+    event.listen(engine, "commit", listener)
+    try:
+        response = client.post("/batch/", json={"operations": onboarding(team_name)}, headers=headers)
+    finally:
+        event.remove(engine, "commit", listener)
+    assert response.status_code == 200
+    assert len(commits) == 1
+
+    results = response.json()["results"]
+    assert [result["op"] for result in results] == [operation["op"] for operation in onboarding(team_name)]
+    leader_id, team_id, ana, luis = (results[i]["id"] for i in range(4))
+    assert results[1]["result"] == {"id": team_id, "name": team_name, "leader_id": leader_id}
+    assert results[4]["result"]["programmer_ids"] == [ana, luis]
+    assert results[5]["result"]["project_id"] == results[5]["id"]
+
+    members = client.get(f"/teams/{team_id}/members", headers=headers).json()
+    assert [member["programmer_id"] for member in members] == [ana, luis]
+    assert client.get(f"/projects/{results[5]['id']}").json()["team_id"] == team_id
+
+    # La nómina se recalculó una sola vez, al final del lote, con el estado final
+    assert client.get(f"/employees/{leader_id}/salary").json() == 1500.0 + 0.10 * 5000.0 + 5 * 8
+    assert client.get(f"/employees/{ana}/salary").json() == 1500.0 + 0.05 * 5000.0 + 3 * 1
+    with SessionLocal() as db:
+        assert operations.verify_payroll(db)["ok"]
+
+def test_failed_operation_rolls_back_the_batch():
+    headers = auth_headers()
+    team_name = f"Equipo Fallido {generate_unique_id()}"
+    batch = onboarding(team_name)
+    # El segundo proyecto para el mismo equipo falla al final del lote
+    batch.append({**batch[-1], "ref": None})
+
+    response = client.post("/batch/", json={"operations": batch}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Operación 6 (create_management_project): El equipo ya tiene un proyecto asignado"
+
+    identity_cards = [
+        batch[0]["args"]["leader"]["employee_data"]["identity_card"],
+        batch[2]["args"]["programmer"]["employee_data"]["identity_card"],
+        batch[3]["args"]["programmer"]["employee_data"]["identity_card"],
+    ]
+    with SessionLocal() as db:
+        assert all(operations.get_employee_by_identity(db, card) is None for card in identity_cards)
+        assert db.query(models.Team).filter(models.Team.name == team_name).count() == 0
+
+def test_batch_validation_errors():
+    headers = auth_headers()
+    cases = [
+        ([{"op": "drop_everything"}], "Operación 0 (drop_everything): Operación desconocida"),
+        ([{"op": "create_team", "args": {}}], "Operación 0 (create_team): Faltan argumentos: team"),
+        ([{"op": "create_team", "args": {"team": {"name": "X"}}}], "Operación 0 (create_team): team.name:"),
+        ([{"op": "add_team_member", "ref": "m", "args": {"team_id": "$nada", "programmer_id": 1}}],
+         "Operación 0 (add_team_member): team_id: Input should be a valid integer"),
+    ]
+    for batch, detail in cases:
+        response = client.post("/batch/", json={"operations": batch}, headers=headers)
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith(detail)
+    assert client.post("/batch/", json={"operations": []}, headers=headers).status_code == 422
+    assert client.post("/batch/", json={"operations": [{"op": "create_team"}]}).status_code == 401
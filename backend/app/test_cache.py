@@ -0,0 +1,92 @@
+import time
+from sqlalchemy import update
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.cache import AnalyticsCache, analytics_cache, bump_shared_generations, shared_generations
+from app.database.database import SessionLocal
+from app.models import models
+from app.api.operations.unit_of_work import unit_of_work
+from app.testing_utils import employee_payload
+
+client = TestClient(app)
+
+def test_cache_ttl_lru_and_invalidation():
+    cache = AnalyticsCache(max_entries=2, default_ttl=60)
+    calls = []
+
+    def loader(value):
+        calls.append(value)
+        return value
+
+    assert cache.get_or_set("a", {"projects"}, lambda: loader(1)) == 1
+    assert cache.get_or_set("a", {"projects"}, lambda: loader(2)) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    # LRU: "a" se usó más recientemente que "b", así que "b" es la descartada
+    cache.get_or_set("b", {"employees"}, lambda: loader(3))
+    cache.get_or_set("a", {"projects"}, lambda: loader(4))
+    cache.get_or_set("c", {"teams"}, lambda: loader(5))
+    assert cache.stats()["evictions"] == 1
+    assert cache.get_or_set("b", {"employees"}, lambda: loader(6)) == 6
+
+    # Solo se invalidan las entradas que dependen de la tabla escrita
+    cache.invalidate_tables({"employees"})
+    assert cache.get_or_set("c", {"teams"}, lambda: loader(7)) == 5
+    assert cache.get_or_set("b", {"employees"}, lambda: loader(8)) == 8
+
+    # TTL por entrada
+    cache.get_or_set("short", {"teams"}, lambda: loader(9), ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get_or_set("short", {"teams"}, lambda: loader(10)) == 10
+    assert cache.stats()["expirations"] >= 1
+
+def test_total_salary_cache_invalidated_by_writes():
+    first = client.get("/analytics/total-salary").json()["total"]
+    hits = analytics_cache.stats()["hits"]
+    assert client.get("/analytics/total-salary").json()["total"] == first
+    assert analytics_cache.stats()["hits"] == hits + 1
+
+    emp = employee_payload("Empleado Cache", sex="F", base_salary=1234.0)
+    r = client.post("/employees/", json=emp)
+    assert r.status_code == 200
+    assert abs(client.get("/analytics/total-salary").json()["total"] - (first + 1234.0)) < 1e-6
+
+    r = client.delete(f"/employees/{r.json()['id']}")
+    assert r.status_code == 200
+    assert abs(client.get("/analytics/total-salary").json()["total"] - first) < 1e-6
+
+    stats = client.get("/analytics/cache-stats").json()
+    assert stats["hits"] >= 1 and stats["invalidations"] >= 2
+
+def test_writes_from_another_process_invalidate_the_cache():
+    cache = AnalyticsCache(max_entries=8, default_ttl=60)
+    with SessionLocal() as db:
+        assert cache.get_or_set("total", {"employees"}, lambda: 1, db=db) == 1
+        assert cache.get_or_set("total", {"employees"}, lambda: 2, db=db) == 1
+
+        # Otro proceso no pasa por la caché de este, solo confirma la escritura con su contador
+        bump_shared_generations(db, {"employees"})
+        db.commit()
+        assert cache.get_or_set("total", {"employees"}, lambda: 3, db=db) == 3
+        assert cache.get_or_set("total", {"employees"}, lambda: 4, db=db) == 3
+
+    # Cualquier commit que escribe una tabla incrementa su contador
+    with SessionLocal() as db:
+        before = shared_generations(db, {"employees", "teams"})
+    client.post("/employees/", json=employee_payload("Empleado Contador"))
+    with SessionLocal() as db:
+        after = shared_generations(db, {"employees", "teams"})
+    assert after["employees"] > before["employees"] and after["teams"] == before["teams"]
+
+def test_core_statements_invalidate_the_cache():
+    employee_id = client.post("/employees/", json=employee_payload("Empleado Core")).json()["id"]
+    assert analytics_cache.get_or_set(("core",), {"employees"}, lambda: "antes") == "antes"
+
+    # UPDATE de Core sobre la Table, sin mapper
+    employees = models.Employee.__table__
+    with SessionLocal() as db:
+        before = shared_generations(db, {"employees"})["employees"]
+        with unit_of_work(db):
+            db.execute(update(employees).where(employees.c.id == employee_id).values(age=31))
+        assert shared_generations(db, {"employees"})["employees"] == before + 1
+    assert analytics_cache.get_or_set(("core",), {"employees"}, lambda: "después") == "después"
@@ -0,0 +1,122 @@
+import threading
+import time
+from app.config import Settings, settings
+from app.database.database import create_db_engine, engine, engine_profile
+
+def profile_settings(**overrides):
+    config = Settings()
+    for name, value in overrides.items():
+        setattr(config, name, value)
+    return config
+
+def make_engine(tmp_path, **overrides):
+    bind = create_db_engine(f"sqlite:///{tmp_path}/concurrency.db", profile_settings(**overrides))
+    with bind.connect() as connection:
+        connection.exec_driver_sql("CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY, payload TEXT)")
+        connection.exec_driver_sql("INSERT INTO events (payload) VALUES ('inicial')")
+        connection.commit()
+    return bind
+
+def count_events(bind) -> int:
+    with bind.connect() as connection:
+        return connection.exec_driver_sql("SELECT count(*) FROM events").scalar()
+
+def test_profile_comes_from_settings(tmp_path):
+    bind = make_engine(tmp_path, DB_CACHE_SIZE_KB=4096, DB_POOL_SIZE=3, DB_MAX_OVERFLOW=2)
+    profile = engine_profile(bind)
+    bind.dispose()
+
+    assert profile["journal_mode"] == "wal"
+    assert profile["synchronous"] == "NORMAL"
+    assert profile["temp_store"] == "MEMORY"
+    assert profile["foreign_keys"] == "ON"
+    assert profile["busy_timeout"] == 5000
+    assert profile["cache_size"] == -4096
+    assert (profile["pool_size"], profile["max_overflow"]) == (3, 2)
+
+def test_write_pool_has_its_own_overflow():
+    profile = engine_profile(engine)
+    assert (profile["pool_size"], profile["max_overflow"]) == (
+        settings.DB_WRITE_POOL_SIZE, settings.DB_WRITE_MAX_OVERFLOW
+    )
+
+def test_reads_are_not_blocked_by_an_open_write_transaction(tmp_path):
+    bind = make_engine(tmp_path)
+    with bind.connect() as writer:
+        writer.exec_driver_sql("BEGIN IMMEDIATE")
+        writer.exec_driver_sql("INSERT INTO events (payload) VALUES ('pendiente')")
+        # El lector ve la última versión confirmada sin esperar al escritor
+        started = time.perf_counter()
+        assert count_events(bind) == 1
+        assert time.perf_counter() - started < 1
+        writer.commit()
+    assert count_events(bind) == 2
+    bind.dispose()
+
+def test_second_writer_waits_instead_of_failing(tmp_path):
+    bind = make_engine(tmp_path)
+    locked = threading.Event()
+
+    def hold_write_lock():
+        with bind.connect() as writer:
+            writer.exec_driver_sql("BEGIN IMMEDIATE")
+            writer.exec_driver_sql("INSERT INTO events (payload) VALUES ('primero')")
+            locked.set()
+            time.sleep(0.3)
+            writer.commit()
+
+    thread = threading.Thread(target=hold_write_lock)
+    thread.start()
+    locked.wait()
+    with bind.connect() as connection:
+        # Sin busy_timeout esto fallaría con "database is locked"
+        connection.exec_driver_sql("INSERT INTO events (payload) VALUES ('segundo')")
+        connection.commit()
+    thread.join()
+
+    assert count_events(bind) == 3
+    bind.dispose()
+
+def test_read_throughput_during_writes(tmp_path):
+    bind = make_engine(tmp_path)
+    duration = 1.0
+    errors = []
+    reads = []
+    writes = []
+    stop = threading.Event()
+
+    def writer():
+        try:
+            while not stop.is_set():
+                with bind.connect() as connection:
+                    connection.exec_driver_sql("BEGIN IMMEDIATE")
+                    for _ in range(200):
+                        connection.exec_driver_sql("INSERT INTO events (payload) VALUES ('carga')")
+                    connection.commit()
+                writes.append(200)
+        except Exception as exc:  # pragma: no cover - solo se informa
+            errors.append(exc)
+
+    def reader():
+        done = 0
+        try:
+            while not stop.is_set():
+                count_events(bind)
+                done += 1
+        except Exception as exc:  # pragma: no cover - solo se informa
+            errors.append(exc)
+        reads.append(done)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    bind.dispose()
+
+    assert errors == []
+    assert sum(writes) > 0
+    # Con WAL los lectores no esperan a los lotes del escritor: cada uno hace cientos de lecturas
+    assert all(done / duration > 100 for done in reads), reads
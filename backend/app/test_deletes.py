@@ -0,0 +1,138 @@
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database.database import SessionLocal, engine
+from app.schemas import schemas
+from app.models import models
+from app.api import operations
+from app.testing_utils import employee_payload, generate_unique_id
+
+client = TestClient(app)
+
+def auth_headers():
+    username = f"borrado{generate_unique_id()}"
+    credentials = {"username": username, "password": "testpass123"}
+    client.post("/auth/register", json={**credentials, "email": f"{username}@example.com"})
+    token = client.post("/auth/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+def employee_data(name, employee_type="programmer"):
+    return schemas.EmployeeCreate(**employee_payload(name, employee_type, age=40, base_salary=1200.0))
+
+def create_unit(db, size=2):
+    """Unidad de negocio: líder, equipo con programadores y proyecto"""
+    leader = operations.create_leader(db, schemas.LeaderCreate(
+        years_experience=6, projects_led=1, employee_data=employee_data("Líder Unidad", "leader")
+    ))
+    team = operations.create_team(db, schemas.TeamCreate(name="Equipo Unidad", leader_id=leader.employee_id))
+    programmer_ids = [operations.create_programmer(db, schemas.ProgrammerCreate(
+        employee_id=0, category="B", employee_data=employee_data(f"Programador Unidad {index}"), languages=["Rust", "Go"]
+    )).employee_id for index in range(size)]
+    operations.add_team_members(db, team.id, programmer_ids)
+    project = operations.create_multimedia_project(db, schemas.MultimediaProjectCreate(
+        development_tool="flash", project_data=schemas.ProjectCreate(
+            name="Proyecto Unidad", estimated_time=80, price=4000.0, type="multimedia", team_id=team.id
+        )
+    ))
+    return leader.employee_id, team.id, programmer_ids, project.project_id
+
+def count_statements(function):
+    statements = []
+    listener = lambda conn, cursor, statement, parameters, context, executemany: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = function()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return result, statements
+
+def test_deleting_an_employee_removes_dependent_rows():
+    response = client.post("/programmers/", json={
+        "employee_id": 0, "category": "A", "languages": ["Python", "SQL"],
+        "employee_data": employee_data("Programador Borrado").model_dump()
+    })
+    programmer_id = response.json()["employee_id"]
+    assert client.delete(f"/employees/{programmer_id}").status_code == 200
+
+    with SessionLocal() as db:
+        # Programador, lenguajes y nómina los borra la base de datos (ON DELETE CASCADE)
+        assert db.query(models.Programmer).filter_by(employee_id=programmer_id).count() == 0
+        assert db.query(models.ProgrammerLanguage).filter_by(programmer_id=programmer_id).count() == 0
+        assert db.query(models.EmployeePayroll).filter_by(employee_id=programmer_id).count() == 0
+
+        leader_id, team_id, programmer_ids, project_id = create_unit(db, 1)
+    for url, detail in [
+        (f"/employees/{leader_id}", "No se puede eliminar un líder asignado a un equipo"),
+        (f"/leaders/{leader_id}", "No se puede eliminar un líder asignado a un equipo"),
+        (f"/employees/{programmer_ids[0]}", "No se puede eliminar un programador asignado a un equipo"),
+    ]:
+        response = client.delete(url)
+        assert response.status_code == 400 and response.json()["detail"] == detail
+    assert client.delete("/leaders/999999999").status_code == 404
+
+    with SessionLocal() as db:
+        operations.delete_projects(db, [project_id])
+        operations.delete_teams(db, [team_id])
+        assert operations.delete_employees(db, [leader_id, *programmer_ids])["conflicts"] == []
+        assert operations.verify_payroll(db)["ok"]
+
+def test_bulk_delete_endpoints():
+    headers = auth_headers()
+    with SessionLocal() as db:
+        units = [create_unit(db) for _ in range(2)]
+    team_ids = [unit[1] for unit in units]
+    project_ids = [unit[3] for unit in units]
+
+    response = client.request("DELETE", "/teams/bulk", json={"ids": team_ids + [999999999]}, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"deleted": team_ids, "conflicts": [{"id": 999999999, "detail": "Equipo no encontrado"}]}
+
+    with SessionLocal() as db:
+        assert db.query(models.TeamMember).filter(models.TeamMember.team_id.in_(team_ids)).count() == 0
+        projects = db.query(models.Project).filter(models.Project.id.in_(project_ids)).all()
+        # Los proyectos quedan sin equipo y con una versión nueva (su ETag cambia)
+        assert [(project.team_id, project.version) for project in projects] == [(None, 2), (None, 2)]
+        assert client.get(f"/projects/{project_ids[0]}").json()["team_id"] is None
+        # El líder y los programadores ya no cobran por el proyecto
+        leader_id, _, programmer_ids, _ = units[0]
+        assert operations.get_payroll(db, [leader_id])[leader_id] == 1200.0 + 5 * 6
+
+    response = client.request("DELETE", "/projects/bulk", json={"ids": project_ids})
+    assert response.json()["deleted"] == project_ids
+
+    employee_ids = [employee_id for leader_id, _, programmer_ids, _ in units for employee_id in [leader_id, *programmer_ids]]
+    response = client.request("DELETE", "/employees/bulk", json={"ids": employee_ids})
+    assert response.json() == {"deleted": employee_ids, "conflicts": []}
+    assert client.request("DELETE", "/employees/bulk", json={"ids": []}).status_code == 422
+    with SessionLocal() as db:
+        assert db.query(models.Employee).filter(models.Employee.id.in_(employee_ids)).count() == 0
+        assert operations.verify_payroll(db)["ok"]
+
+def test_archiving_a_business_unit_in_one_batch():
+    headers = auth_headers()
+    with SessionLocal() as db:
+        leader_id, team_id, programmer_ids, project_id = create_unit(db, 20)
+    employee_ids = [leader_id, *programmer_ids]
+    operations_batch = [
+        {"op": "delete_projects", "args": {"project_ids": [project_id]}},
+        {"op": "delete_teams", "args": {"team_ids": [team_id]}},
+        {"op": "delete_employees", "args": {"employee_ids": employee_ids}},
+    ]
+
+    response, statements = count_statements(
+        lambda: client.post("/batch/", json={"operations": operations_batch}, headers=headers)
+    )
+    assert response.status_code == 200
+    assert [result["result"]["deleted"] for result in response.json()["results"]] == [
+        [project_id], [team_id], employee_ids
+    ]
+    # Un número fijo de sentencias para toda la unidad, no unas cuantas por empleado
+    writes = [statement for statement in statements if statement.startswith(("DELETE", "UPDATE", "INSERT"))]
+    assert len(writes) <= 8
+
+    with SessionLocal() as db:
+        assert db.query(models.Employee).filter(models.Employee.id.in_(employee_ids)).count() == 0
+        assert db.query(models.Programmer).filter(models.Programmer.employee_id.in_(programmer_ids)).count() == 0
+        assert db.query(models.Team).filter(models.Team.id == team_id).count() == 0
+        assert db.query(models.MultimediaProject).filter_by(project_id=project_id).count() == 0
+        assert operations.verify_payroll(db)["ok"]
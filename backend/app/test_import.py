@@ -0,0 +1,86 @@
+import json
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database.database import SessionLocal, track_queries
+from app.api.operations.import_operations import import_employees
+from app.models import models
+from app.testing_utils import employee_payload, generate_unique_id
+
+client = TestClient(app)
+
+def employee_ids(identity_cards):
+    with SessionLocal() as db:
+        return dict(db.query(models.Employee.identity_card, models.Employee.id).filter(
+            models.Employee.identity_card.in_(identity_cards)
+        ))
+
+def test_import_csv_with_error_report():
+    cards = [f"IMP{generate_unique_id()}" for _ in range(3)]
+    existing = client.post("/employees/", json=employee_payload(
+        "Empleado Existente", age=40, sex="F", base_salary=900.0
+    )).json()
+    csv_file = "\n".join([
+        "identity_card,name,age,sex,base_salary,type,category,languages,years_experience,projects_led",
+        f"{cards[0]},Programador Uno,30,M,1000,programmer,A,Python;Go,,",
+        f"{cards[1]},Líder Uno,45,F,2000,leader,,,10,3",
+        f"{cards[2]},Programador Menor,15,M,1000,programmer,B,Java,,",
+        f"{cards[0]},Programador Repetido,30,M,1000,programmer,A,Python,,",
+        f"{existing['identity_card']},Programador Existente,30,M,1000,programmer,A,Python,,",
+        f"{cards[2]},Programador Sin Lenguajes,30,M,1000,programmer,C,,,",
+        f"{cards[2]},Programador Categoría,30,M,1000,programmer,Z,Python,,",
+    ])
+    response = client.post("/employees/import", files={"file": ("altas.csv", csv_file.encode(), "text/csv")})
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["total"], report["imported"], report["programmers"], report["leaders"]) == (7, 2, 1, 1)
+    assert [error["row"] for error in report["errors"]] == [3, 6, 7, 4, 5]
+    assert report["errors"][0]["errors"][0].startswith("age:")
+    assert "repetida" in report["errors"][3]["errors"][0]
+    assert "Ya existe" in report["errors"][4]["errors"][0]
+
+    ids = employee_ids(cards)
+    assert set(ids) == {cards[0], cards[1]}
+    assert client.get(f"/programmers/{ids[cards[0]]}").json()["category"] == "A"
+    assert sorted(client.get(f"/programmers/{ids[cards[0]]}/languages").json()) == ["Go", "Python"]
+    assert client.get(f"/leaders/{ids[cards[1]]}").json()["years_experience"] == 10
+    # La nómina materializada incluye a los importados (salario base + 2 lenguajes * 3)
+    assert client.get(f"/employees/{ids[cards[0]]}/salary").json() == 1006
+
+    client.delete(f"/programmers/{ids[cards[0]]}")
+    client.delete(f"/leaders/{ids[cards[1]]}")
+    client.delete(f"/employees/{existing['id']}")
+
+def test_import_ndjson_checks_identity_cards_once_per_chunk():
+    cards = [f"ND{generate_unique_id()}" for _ in range(10)]
+    lines = [json.dumps({
+        "identity_card": card, "name": "Programador Importado", "age": 25, "sex": "M",
+        "base_salary": 800.0, "type": "programmer", "category": "C", "languages": ["Rust"]
+    }) for card in cards]
+    lines.insert(3, "{no es json")
+
+    response = client.post("/employees/import?format=ndjson", files={"file": ("altas.txt", "\n".join(lines).encode())})
+    assert response.status_code == 200
+    assert response.json()["imported"] == 10
+    assert response.json()["errors"][0]["row"] == 4
+
+    # Con bloques de 4 filas: una consulta de cédulas y un INSERT por tabla en cada bloque
+    more = [f"ND{generate_unique_id()}" for _ in range(8)]
+    rows = [(i, {
+        "identity_card": card, "name": "Programador Importado", "age": 25, "sex": "M",
+        "base_salary": 800.0, "type": "programmer", "category": "C", "languages": ["Rust"]
+    }) for i, card in enumerate(more, start=1)]
+    with SessionLocal() as db:
+        stats = track_queries()
+        report = import_employees(db, rows, chunk_size=4)
+    assert report["imported"] == 8
+    # Por bloque: cédulas existentes, INSERT de employees, IDs asignados, INSERT de
+    # programmers y de programmer_languages; al final, la actualización de la nómina
+    # y los contadores de la caché de analytics
+    assert stats.count <= 2 * 5 + 6
+
+    for employee_id in {**employee_ids(cards), **employee_ids(more)}.values():
+        client.delete(f"/programmers/{employee_id}")
+
+def test_import_rejects_unknown_format():
+    response = client.post("/employees/import", files={"file": ("altas.xlsx", b"")})
+    assert response.status_code == 400
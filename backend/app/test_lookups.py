@@ -0,0 +1,44 @@
+from app.api import auth
+from app.api.operations import employee_operations
+from app.database.database import SessionLocal, track_queries
+from app.models import models
+from app.testing_utils import employee_payload, generate_unique_id
+
+def test_primary_key_lookups_use_the_identity_map():
+    identity_card = generate_unique_id()
+    with SessionLocal() as db:
+        employee = models.Employee(**employee_payload("Empleado Búsqueda", identity_card=identity_card, sex="F"))
+        db.add(employee)
+        db.commit()
+        employee_id = employee.id
+        try:
+            # Un objeto expirado (como tras un commit) se vuelve a leer
+            db.expire(employee)
+            stats = track_queries()
+            assert employee_operations.get_employee(db, employee_id) is employee
+            assert stats.count == 1
+            # Ya cargado: sin consultas
+            assert employee_operations.get_employee(db, employee_id) is employee
+            assert stats.count == 1
+
+            assert employee_operations.get_employee_by_identity(db, identity_card) is employee
+            assert employee_operations.get_employee(db, -1) is None
+            assert employee_operations.get_employee_by_identity(db, "no-existe") is None
+        finally:
+            db.delete(employee)
+            db.commit()
+
+        assert employee_operations.get_employee(db, employee_id) is None
+
+def test_get_user_by_username():
+    username = f"busqueda{generate_unique_id()}"
+    with SessionLocal() as db:
+        user = models.User(username=username, email=f"{username}@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        try:
+            assert auth.get_user(db, username).id == user.id
+            assert auth.get_user(db, f"{username}x") is None
+        finally:
+            db.delete(user)
+            db.commit()
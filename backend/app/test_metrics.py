@@ -0,0 +1,42 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import settings
+from app.testing_utils import employee_payload
+
+client = TestClient(app)
+
+def create_employee():
+    r = client.post("/employees/", json=employee_payload("Empleado Metricas"))
+    assert r.status_code == 200
+    return r.json()["id"]
+
+def test_db_metrics_headers_and_route_aggregate():
+    emp_id = create_employee()
+    r = client.get(f"/employees/{emp_id}")
+    assert r.status_code == 200
+    assert int(r.headers["X-DB-Queries"]) == 1
+    assert float(r.headers["X-DB-Time-ms"]) >= 0
+
+    r = client.get("/health")
+    assert r.headers["X-DB-Queries"] == "0"
+
+    stats = {row["route"]: row for row in client.get("/analytics/query-stats").json()}
+    route = stats["GET /employees/{employee_id}"]
+    assert route["requests"] >= 1 and route["max_queries"] >= 1
+    assert client.delete(f"/employees/{emp_id}").status_code == 200
+
+def test_query_budget_rejects_requests_over_budget():
+    emp_id = create_employee()
+    previous = settings.DB_QUERY_BUDGET
+    settings.DB_QUERY_BUDGET = 1
+    try:
+        assert client.get(f"/employees/{emp_id}").status_code == 200
+        r = client.put(f"/employees/{emp_id}", json={"name": "Empleado Presupuesto"})
+        assert r.status_code == 500
+        assert "Query budget exceeded" in r.json()["detail"]
+        assert int(r.headers["X-DB-Queries"]) == 1
+    finally:
+        settings.DB_QUERY_BUDGET = previous
+    # La sentencia que superó el presupuesto no se ejecutó y la escritura se deshizo
+    assert client.get(f"/employees/{emp_id}").json()["name"] == "Empleado Metricas"
+    assert client.delete(f"/employees/{emp_id}").status_code == 200
@@ -0,0 +1,67 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database.database import SessionLocal
+from app.models import models
+from app.api import operations
+
+client = TestClient(app)
+
+def walk(url, limit):
+    """Recorre un listado completo siguiendo X-Next-Cursor"""
+    items = []
+    cursor = None
+    while True:
+        r = client.get(url, params={"limit": limit, **({"cursor": cursor} if cursor else {})})
+        assert r.status_code == 200, r.text
+        items.extend(r.json())
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            return items
+
+def test_employee_cursor_walks_every_sort_order():
+    db = SessionLocal()
+    try:
+        employees = db.query(models.Employee).all()
+    finally:
+        db.close()
+
+    by_salary = sorted(employees, key=lambda e: (-e.base_salary, -e.id))
+    assert [e["id"] for e in walk("/employees/?sort=-base_salary", 7)] == [e.id for e in by_salary]
+
+    by_name = sorted(employees, key=lambda e: (e.name, e.id))
+    assert [e["id"] for e in walk("/employees/?sort=name", 5)] == [e.id for e in by_name]
+
+    # El modo offset sigue funcionando y devuelve el mismo orden por id
+    r = client.get("/employees/?skip=2&limit=3")
+    assert [e["id"] for e in r.json()] == sorted(e.id for e in employees)[2:5]
+
+def test_programmer_cursor_matches_listing():
+    db = SessionLocal()
+    try:
+        everything = operations.list_programmers(db, limit=1000000)
+    finally:
+        db.close()
+
+    assert walk("/programmers/?sort=id", 3) == everything
+    by_category = sorted(everything, key=lambda p: (p["category"], p["employee_id"]))
+    assert walk("/programmers/?sort=category", 4) == by_category
+
+def test_invalid_cursor_and_sort_are_rejected():
+    assert client.get("/employees/?sort=age").status_code == 400
+    assert client.get("/employees/?cursor=no-es-un-cursor").status_code == 400
+
+    cursor = operations.encode_cursor("name", ["Ana", 1])
+    r = client.get("/employees/", params={"sort": "id", "cursor": cursor})
+    assert r.status_code == 400
+    assert "name" in r.json()["detail"]
+
+    values = operations.decode_cursor(operations.encode_cursor("-price", [10.5, 3]), "-price", 2)
+    assert values == [10.5, 3]
+
+def test_cursor_values_must_be_scalars():
+    for values in ([{"a": 1}], [[1]], [True]):
+        cursor = operations.encode_cursor("id", values)
+        for url in ("/employees/", "/programmers/"):
+            r = client.get(url, params={"cursor": cursor})
+            assert r.status_code == 400 and r.json()["detail"] == "Cursor inválido", (url, values)
+    assert operations.decode_cursor(operations.encode_cursor("name", [None, 7]), "name", 2) == [None, 7]
@@ -0,0 +1,227 @@
+import pytest
+from pydantic import ValidationError
+from app.main import app  # noqa: F401  (crea las tablas)
+from app.database.database import SessionLocal
+from app.models import models
+from app.schemas import schemas
+from app.api import operations
+from app.testing_utils import employee_payload
+
+def employee_data(employee_type, base_salary):
+    return schemas.EmployeeCreate(**employee_payload(f"Nomina {employee_type}", employee_type, base_salary=base_salary))
+
+def legacy_salary(db, employee_id):
+    """Fórmula original, empleado por empleado, usada como referencia"""
+    employee = db.query(models.Employee).filter(models.Employee.id == employee_id).first()
+    total = employee.base_salary
+    if employee.type == "programmer":
+        count = db.query(models.ProgrammerLanguage).filter(
+            models.ProgrammerLanguage.programmer_id == employee_id
+        ).count()
+        member = db.query(models.TeamMember).filter(models.TeamMember.programmer_id == employee_id).first()
+        project = db.query(models.Project).filter(models.Project.team_id == member.team_id).first() if member else None
+        if project:
+            total += 0.05 * project.price
+        total += 3 * count
+    elif employee.type == "leader":
+        leader = db.query(models.Leader).filter(models.Leader.employee_id == employee_id).first()
+        team = db.query(models.Team).filter(models.Team.leader_id == employee_id).first()
+        project = db.query(models.Project).filter(models.Project.team_id == team.id).first() if team else None
+        if project:
+            total += 0.10 * project.price
+        total += 5 * (leader.years_experience if leader else 0)
+    return float(total)
+
+def create_payroll_fixture(db):
+    """Crea un líder con equipo y proyecto, dos programadores (uno sin equipo) y un empleado suelto"""
+    leader = operations.create_leader(db, schemas.LeaderCreate(
+        employee_data=employee_data("leader", 2000.0), years_experience=7, projects_led=2
+    ))
+    team = operations.create_team(db, schemas.TeamCreate(name="Equipo Nomina", leader_id=leader.employee_id))
+    operations.create_project(db, schemas.ProjectCreate(
+        name="Proyecto Nomina", estimated_time=100, price=10000.0, type="management", team_id=team.id
+    ))
+    member = operations.create_programmer(db, schemas.ProgrammerCreate(
+        employee_id=0, category="A", employee_data=employee_data("programmer", 1500.0),
+        languages=["Python", "Go", "Rust"]
+    ))
+    operations.add_team_member(db, team.id, member.employee_id)
+    loner = operations.create_programmer(db, schemas.ProgrammerCreate(
+        employee_id=0, category="C", employee_data=employee_data("programmer", 900.0),
+        languages=["Java"]
+    ))
+    plain = operations.create_employee(db, employee_data("programmer", 800.0))
+    return {
+        "leader": leader.employee_id,
+        "member": member.employee_id,
+        "loner": loner.employee_id,
+        "plain": plain.id,
+        "team": team.id,
+    }
+
+def test_payroll_engine_matches_legacy_formula():
+    db = SessionLocal()
+    try:
+        ids = create_payroll_fixture(db)
+        expected = {
+            ids["leader"]: 2000.0 + 0.10 * 10000.0 + 5 * 7,
+            ids["member"]: 1500.0 + 0.05 * 10000.0 + 3 * 3,
+            ids["loner"]: 900.0 + 3 * 1,
+            ids["plain"]: 800.0,
+        }
+        for employee_id, salary in expected.items():
+            assert operations.calculate_salary(db, employee_id) == salary
+            assert operations.calculate_salary(db, employee_id) == legacy_salary(db, employee_id)
+
+        all_ids = [row[0] for row in db.query(models.Employee.id).all()]
+        payroll = operations.get_payroll(db)
+        assert set(payroll) == set(all_ids)
+        for employee_id in all_ids:
+            assert abs(payroll[employee_id] - legacy_salary(db, employee_id)) < 1e-6
+        assert abs(operations.calculate_total_salary(db) - sum(payroll.values())) < 1e-6
+    finally:
+        db.close()
+
+def test_calculate_salary_unknown_employee():
+    db = SessionLocal()
+    try:
+        try:
+            operations.calculate_salary(db, -1)
+            assert False, "Se esperaba ValueError"
+        except ValueError:
+            pass
+    finally:
+        db.close()
+
+def test_highest_paid_covers_whole_workforce_and_pages():
+    db = SessionLocal()
+    try:
+        create_payroll_fixture(db)
+        payroll = operations.get_payroll(db)
+        expected = sorted(payroll.items(), key=lambda item: (-item[1], item[0]))
+
+        top = operations.get_highest_paid_employees(db, limit=5)
+        assert [(s.employee_id, s.total_salary) for s in top] == expected[:5]
+
+        page = operations.get_highest_paid_employees(db, limit=3, offset=2)
+        assert [s.employee_id for s in page] == [employee_id for employee_id, _ in expected[2:5]]
+
+        threshold = expected[min(3, len(expected) - 1)][1]
+        above = operations.get_highest_paid_employees(db, limit=1000, min_salary=threshold)
+        assert all(s.total_salary >= threshold for s in above)
+        assert len(above) == len([1 for _, salary in expected if salary >= threshold][:1000])
+    finally:
+        db.close()
+
+def test_materialized_payroll_tracks_writes():
+    db = SessionLocal()
+    try:
+        ids = create_payroll_fixture(db)
+        assert operations.verify_payroll(db)["ok"]
+
+        project = db.query(models.Project).filter(models.Project.team_id == ids["team"]).first()
+        operations.update_project(db, project.id, schemas.ProjectUpdate(price=20000.0))
+        operations.update_programmer(db, ids["member"], schemas.ProgrammerUpdate(languages=["Python"]))
+        operations.update_leader(db, ids["leader"], schemas.LeaderUpdate(years_experience=9))
+        operations.update_employee(db, ids["plain"], schemas.EmployeeUpdate(base_salary=850.0))
+        operations.add_team_member(db, ids["team"], ids["loner"])
+
+        stored = dict(db.query(models.EmployeePayroll.employee_id, models.EmployeePayroll.total_salary).filter(
+            models.EmployeePayroll.employee_id.in_(list(ids.values()))
+        ).all())
+        assert stored[ids["leader"]] == 2000.0 + 0.10 * 20000.0 + 5 * 9
+        assert stored[ids["member"]] == 1500.0 + 0.05 * 20000.0 + 3 * 1
+        assert stored[ids["loner"]] == 900.0 + 0.05 * 20000.0 + 3 * 1
+        assert stored[ids["plain"]] == 850.0
+
+        operations.remove_team_member(db, ids["team"], ids["loner"])
+        operations.delete_programmer(db, ids["loner"])
+        operations.delete_employee(db, ids["plain"])
+        operations.delete_team(db, ids["team"])
+
+        result = operations.verify_payroll(db)
+        assert result["ok"], result
+        assert operations.calculate_total_salary(db) == result["stored_total"]
+    finally:
+        db.close()
+
+def test_payroll_simulation_matches_engine():
+    db = SessionLocal()
+    try:
+        create_payroll_fixture(db)
+        payroll = operations.get_payroll(db)
+        inputs = operations.load_payroll_inputs(db)
+        baseline = operations.evaluate_scenarios(inputs, [operations.baseline_scenario()])[0]
+        for employee_id, salary in zip(inputs.employee_ids.tolist(), baseline.tolist()):
+            assert abs(payroll[employee_id] - salary) < 1e-6
+
+        scenarios = [
+            schemas.PayrollScenario(name="sin cambios"),
+            schemas.PayrollScenario(name="bono 7%", programmer_project_rate=0.07),
+            schemas.PayrollScenario(name="lenguaje extra A", extra_languages={"A": 1}),
+        ]
+        result = operations.simulate_payroll(db, scenarios, histogram_bins=5)
+        assert result.employee_count == len(payroll)
+        assert abs(result.baseline_total - sum(payroll.values())) < 1e-6
+
+        unchanged, bonus, extra = result.scenarios
+        assert abs(unchanged.delta) < 1e-6 and unchanged.employees_affected == 0
+        programmer_prices = inputs.programmer_project_price[inputs.is_programmer].sum()
+        assert abs(bonus.delta - 0.02 * programmer_prices) < 1e-6
+        category_a = int((inputs.is_programmer & (inputs.category_code == 0)).sum())
+        assert abs(extra.delta - 3 * category_a) < 1e-6
+        assert sum(extra.distribution.histogram_counts) == result.employee_count
+    finally:
+        db.close()
+
+    for extra_languages in ({"D": 1}, {"A": -1}):
+        with pytest.raises(ValidationError):
+            schemas.PayrollScenario(name="no válido", extra_languages=extra_languages)
+
+def test_calculate_salaries_batches_queries():
+    from sqlalchemy import event
+    from app.database.database import engine
+
+    db = SessionLocal()
+    try:
+        create_payroll_fixture(db)
+        all_ids = [row[0] for row in db.query(models.Employee.id).all()]
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            salaries = operations.calculate_salaries(db, all_ids + [-1], chunk_size=2)
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+
+        assert set(salaries) == set(all_ids)
+        assert len(statements) == (len(all_ids) + 1 + 1) // 2
+        for employee_id in all_ids[:5]:
+            assert salaries[employee_id] == operations.calculate_salary(db, employee_id)
+    finally:
+        db.close()
+
+def test_salary_distribution_breakdowns():
+    db = SessionLocal()
+    try:
+        ids = create_payroll_fixture(db)
+        payroll = operations.get_payroll(db)
+        report = operations.get_salary_distribution(db, bins=4)
+
+        assert report.overall.count == len(payroll)
+        assert report.overall.min == min(payroll.values())
+        assert report.overall.max == max(payroll.values())
+        assert abs(report.overall.mean - sum(payroll.values()) / len(payroll)) < 1e-6
+        assert report.overall.min <= report.overall.p50 <= report.overall.p90 <= report.overall.p99
+        assert sum(report.overall.histogram_counts) == len(payroll)
+
+        assert sum(d.count for d in report.by_employee_type.values()) == len(payroll)
+        assert sum(d.count for d in report.by_project_type.values()) == len(payroll)
+        assert "management" in report.by_project_type
+        assert report.by_project_type["none"].count >= 2  # programador sin equipo y empleado suelto
+        assert report.by_category["A"].count >= 1
+    finally:
+        db.close()
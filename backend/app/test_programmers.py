@@ -0,0 +1,121 @@
+import json
+from fastapi.testclient import TestClient
+from app.main import app
+from sqlalchemy import event
+from app.database.database import SessionLocal, engine
+from app.models import models
+from app.testing_utils import employee_payload
+
+client = TestClient(app)
+
+def create_programmer(languages):
+    r = client.post("/programmers/", json={
+        "employee_id": 0,
+        "category": "B",
+        "employee_data": employee_payload("Programador Listado", age=28, sex="F", base_salary=1200.0),
+        "languages": languages
+    })
+    assert r.status_code == 200
+    return r.json()["employee_id"]
+
+def expected_listing():
+    db = SessionLocal()
+    try:
+        return [
+            {
+                "employee_id": programmer.employee_id,
+                "category": programmer.category,
+                "languages": sorted(language for (language,) in db.query(models.ProgrammerLanguage.language).filter(
+                    models.ProgrammerLanguage.programmer_id == programmer.employee_id
+                ))
+            }
+            for programmer in db.query(models.Programmer).order_by(models.Programmer.employee_id)
+        ]
+    finally:
+        db.close()
+
+def test_programmers_listing_is_paginated_and_single_query():
+    create_programmer(["Rust", "Go", "Python"])
+    create_programmer(["Java"])
+    expected = expected_listing()
+
+    r = client.get("/programmers/?limit=1000")
+    assert r.status_code == 200
+    assert r.headers["X-DB-Queries"] == "1"
+    assert r.json() == expected[:1000]
+
+    r = client.get("/programmers/?skip=1&limit=2")
+    assert r.json() == expected[1:3]
+    assert client.get("/programmers/?limit=0").status_code == 422
+
+def test_programmers_ndjson_stream():
+    create_programmer(["Kotlin", "Swift"])
+    expected = expected_listing()
+
+    r = client.get("/programmers/?format=ndjson")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in r.text.splitlines()] == expected
+
+def language_writes(function):
+    """Sentencias de escritura sobre programmer_languages que ejecuta function"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "programmer_languages" in statement and statement.split()[0] in ("INSERT", "DELETE"):
+            statements.append(statement.split()[0])
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = function()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return result, statements
+
+def languages_of(programmer_id):
+    return sorted(client.get(f"/programmers/{programmer_id}/languages").json())
+
+def test_language_update_writes_only_the_difference():
+    programmer_id = create_programmer(["Rust", "Go", "Python"])
+    url = f"/programmers/{programmer_id}"
+
+    r, writes = language_writes(lambda: client.put(url, json={"languages": ["Rust", "Go", "Python", "Java"]}))
+    assert r.status_code == 200 and writes == ["INSERT"]
+    assert languages_of(programmer_id) == ["Go", "Java", "Python", "Rust"]
+    salary_with_four = client.get(f"/employees/{programmer_id}/salary").json()
+
+    _, writes = language_writes(lambda: client.put(url, json={"languages": ["Go", "Java", "Python", "Rust"]}))
+    assert writes == []
+
+    _, writes = language_writes(lambda: client.put(url, json={"languages": ["Go", "Elixir"]}))
+    assert writes == ["DELETE", "INSERT"]
+    assert languages_of(programmer_id) == ["Elixir", "Go"]
+    # La nómina se recalcula con los lenguajes nuevos
+    assert client.get(f"/employees/{programmer_id}/salary").json() < salary_with_four
+
+def test_batch_language_update():
+    first = create_programmer(["Python"])
+    second = create_programmer(["Java", "Go"])
+
+    r, writes = language_writes(lambda: client.put("/programmers/languages", json={"updates": [
+        {"programmer_id": first, "languages": ["Python", "Rust"]},
+        {"programmer_id": second, "languages": ["Go"]},
+        {"programmer_id": -1, "languages": ["C"]},
+        {"programmer_id": first, "languages": []},
+    ]}))
+    assert r.status_code == 200
+    # Un DELETE y un INSERT para todos los programadores
+    assert writes == ["DELETE", "INSERT"]
+    assert r.json() == {
+        "changes": [
+            {"programmer_id": first, "added": ["Rust"], "removed": []},
+            {"programmer_id": second, "added": [], "removed": ["Java"]},
+        ],
+        "conflicts": [
+            {"programmer_id": first, "detail": "El programador está repetido en la solicitud"},
+            {"programmer_id": -1, "detail": "Programador no encontrado"},
+        ]
+    }
+    assert languages_of(first) == ["Python", "Rust"]
+    assert languages_of(second) == ["Go"]
+    assert client.put("/programmers/languages", json={"updates": []}).status_code == 422
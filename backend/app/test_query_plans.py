@@ -0,0 +1,76 @@
+from sqlalchemy import create_engine, inspect, select
+from app.main import app  # noqa: F401  (crea las tablas)
+from app.database.database import engine
+from app.database.migrations import pending_migrations, run_migrations
+from app.database.query_plans import check_query_plans, explain, full_table_scans
+from app.models import models
+
+def test_hot_queries_use_indexes():
+    assert check_query_plans(engine) == {}
+
+def test_full_scan_is_detected():
+    plan = explain(engine, select(models.Employee).where(models.Employee.age == 30))
+    assert full_table_scans(plan)
+    assert not full_table_scans(["MATERIALIZE page", "SCAN page", "SCAN CONSTANT ROW"])
+    # Recorrer un índice entero también es un recorrido completo, salvo el permitido
+    assert full_table_scans(["SCAN employees USING INDEX ix_employees_type"])
+    assert full_table_scans(["SCAN employees USING COVERING INDEX ix_employees_name"], "ix_employees_type")
+    assert not full_table_scans(["SCAN employees USING INDEX ix_employees_type"], "ix_employees_type")
+    assert not full_table_scans(["SEARCH employees USING INDEX ix_employees_type (type=?)"])
+
+def test_migration_adds_missing_indexes(tmp_path):
+    bind = create_engine(f"sqlite:///{tmp_path}/antigua.db")
+    models.Base.metadata.create_all(bind=bind)
+    with bind.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_teams_leader_id")
+        connection.exec_driver_sql("DROP INDEX ix_team_members_programmer_id")
+
+    assert pending_migrations(bind) == ["índice ix_teams_leader_id", "índice ix_team_members_programmer_id"]
+    assert run_migrations(bind) == ["índice ix_teams_leader_id", "índice ix_team_members_programmer_id"]
+    assert "ix_teams_leader_id" in {index["name"] for index in inspect(bind).get_indexes("teams")}
+    assert run_migrations(bind) == []
+    assert check_query_plans(bind) == {}
+    bind.dispose()
+
+def test_migration_adds_missing_columns(tmp_path):
+    bind = create_engine(f"sqlite:///{tmp_path}/sin_versiones.db")
+    models.Base.metadata.create_all(bind=bind)
+    with bind.begin() as connection:
+        connection.exec_driver_sql("INSERT INTO teams (name) VALUES ('Equipo Antiguo')")
+        connection.exec_driver_sql("ALTER TABLE teams DROP COLUMN version")
+        connection.exec_driver_sql("ALTER TABLE projects DROP COLUMN version")
+
+    assert pending_migrations(bind) == ["columna teams.version", "columna projects.version"]
+    assert run_migrations(bind) == ["columna teams.version", "columna projects.version"]
+    with bind.connect() as connection:
+        # Las filas existentes empiezan en la versión 1
+        assert connection.exec_driver_sql("SELECT version FROM teams").scalar() == 1
+    assert run_migrations(bind) == [] and pending_migrations(bind) == []
+    bind.dispose()
+
+def test_migration_rebuilds_tables_with_old_foreign_keys(tmp_path):
+    bind = create_engine(f"sqlite:///{tmp_path}/sin_reglas.db")
+    models.Base.metadata.create_all(bind=bind)
+    with bind.begin() as connection:
+        # team_members tal como la creaban las versiones anteriores (sin ON DELETE)
+        connection.exec_driver_sql("DROP TABLE team_members")
+        connection.exec_driver_sql(
+            "CREATE TABLE team_members (team_id INTEGER NOT NULL REFERENCES teams (id), "
+            "programmer_id INTEGER NOT NULL REFERENCES programmers (employee_id), PRIMARY KEY (team_id, programmer_id))"
+        )
+        connection.exec_driver_sql("INSERT INTO employees (identity_card, name, age, sex, base_salary, type) "
+                                   "VALUES ('1', 'Programador Antiguo', 30, 'M', 1000, 'programmer')")
+        connection.exec_driver_sql("INSERT INTO programmers (employee_id, category) VALUES (1, 'A')")
+        connection.exec_driver_sql("INSERT INTO teams (id, name) VALUES (1, 'Equipo Antiguo')")
+        connection.exec_driver_sql("INSERT INTO team_members VALUES (1, 1)")
+
+    # La tabla se recrea desde el modelo, índices incluidos
+    assert pending_migrations(bind) == ["claves foráneas de team_members"]
+    assert run_migrations(bind) == ["claves foráneas de team_members"]
+    assert "ix_team_members_programmer_id" in {index["name"] for index in inspect(bind).get_indexes("team_members")}
+    with bind.connect() as connection:
+        assert connection.exec_driver_sql("SELECT * FROM team_members").all() == [(1, 1)]
+        rules = {row[3]: row[6] for row in connection.exec_driver_sql("PRAGMA foreign_key_list(team_members)")}
+        assert rules == {"team_id": "CASCADE", "programmer_id": "RESTRICT"}
+    assert run_migrations(bind) == [] and pending_migrations(bind) == []
+    bind.dispose()
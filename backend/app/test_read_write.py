@@ -0,0 +1,89 @@
+import anyio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import Settings, settings
+from app.database.database import engine, read_engine, ReadSessionLocal, read_database_url
+from app.testing_utils import employee_payload, generate_unique_id
+
+client = TestClient(app)
+
+@contextmanager
+def engines_used():
+    """Registra qué engines (escritura / lectura) ejecutan sentencias dentro del bloque"""
+    used = set()
+    listeners = [
+        (bind, lambda *args, name=name: used.add(name))
+        for name, bind in (("write", engine), ("read", read_engine))
+    ]
+    for bind, listener in listeners:
+        event.listen(bind, "before_cursor_execute", listener)
+    try:
+        yield used
+    finally:
+        for bind, listener in listeners:
+            event.remove(bind, "before_cursor_execute", listener)
+
+@pytest.mark.skipif(settings.DB_ASYNC, reason="en modo async las rutas usan los engines aiosqlite")
+def test_get_routes_use_read_pool_and_writes_use_writer_pool():
+    assert read_engine is not engine
+    employee = employee_payload("Empleado Lectura")
+    with engines_used() as used:
+        employee_id = client.post("/employees/", json=employee).json()["id"]
+    assert used == {"write"}
+
+    with engines_used() as used:
+        assert client.get(f"/employees/{employee_id}").status_code == 200
+        assert client.get("/programmers/?limit=5").status_code == 200
+    assert used == {"read"}
+
+    # POST de solo lectura que declara get_read_db explícitamente
+    with engines_used() as used:
+        response = client.post("/analytics/payroll-simulation", json={"scenarios": [{"name": "base"}]})
+        assert response.status_code == 200
+    assert used == {"read"}
+
+    with engines_used() as used:
+        assert client.delete(f"/employees/{employee_id}").status_code == 200
+    assert used == {"write"}
+
+async def limit_threadpool(total_tokens):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = total_tokens
+
+@pytest.mark.skipif(settings.DB_ASYNC, reason="en modo async la sesión no ocupa hilos del threadpool")
+def test_more_concurrent_writes_than_threads(monkeypatch):
+    username = f"concurrente{generate_unique_id()}"
+    credentials = {"username": username, "password": "testpass123"}
+    client.post("/auth/register", json={**credentials, "email": f"{username}@example.com"})
+    headers = {"Authorization": f"Bearer {client.post('/auth/login', json=credentials).json()['access_token']}"}
+    # Si una petición esperase conexión dentro de un hilo, fallaría al agotar esta espera
+    monkeypatch.setattr(engine.pool, "_timeout", 2)
+
+    requests = 4 * settings.DB_WRITE_POOL_SIZE
+    with TestClient(app) as concurrent_client:
+        # Menos hilos que peticiones: cada una usa varios pasos del threadpool con la conexión tomada
+        concurrent_client.portal.call(limit_threadpool, settings.DB_WRITE_POOL_SIZE)
+        with ThreadPoolExecutor(requests) as executor:
+            responses = list(executor.map(
+                lambda index: concurrent_client.post("/teams/", json={"name": f"Equipo Concurrente {index}"}, headers=headers),
+                range(requests)
+            ))
+    assert [response.status_code for response in responses] == [200] * requests
+
+def test_read_sessions_cannot_write():
+    with ReadSessionLocal() as db:
+        assert db.execute(text("SELECT count(*) FROM employees")).scalar() >= 0
+        with pytest.raises(OperationalError):
+            db.execute(text("DELETE FROM employees WHERE id = -1"))
+
+def test_read_database_url():
+    assert read_database_url("sqlite:///./datos.db", Settings()) == "sqlite:///file:./datos.db?mode=ro&uri=true"
+    assert read_database_url("sqlite://", Settings()) is None
+
+    config = Settings()
+    config.DB_READ_REPLICA_URL = "postgresql://replica/app"
+    assert read_database_url("sqlite:///./datos.db", config) == "postgresql://replica/app"
@@ -0,0 +1,68 @@
+from sqlalchemy import create_engine, func, select
+from app.models import models
+from sqlalchemy.orm import Session
+from app.api.cache import shared_generations
+from app.api.operations.payroll_operations import ensure_payroll
+from app.seed_db import SeedConfig, seed_database
+
+def snapshot(bind):
+    with bind.connect() as connection:
+        return {
+            "employees": connection.execute(
+                select(models.Employee.id, models.Employee.base_salary, models.Employee.type).order_by(models.Employee.id)
+            ).all(),
+            "languages": connection.execute(select(func.count()).select_from(models.ProgrammerLanguage)).scalar(),
+            "members": connection.execute(
+                select(models.TeamMember.team_id, models.TeamMember.programmer_id).order_by(models.TeamMember.programmer_id)
+            ).all(),
+            "payroll": connection.execute(select(models.PayrollSummary.total_salary, models.PayrollSummary.employee_count)).one(),
+        }
+
+def test_seed_is_deterministic_and_builds_payroll(tmp_path):
+    snapshots = []
+    for name in ("a", "b"):
+        bind = create_engine(f"sqlite:///{tmp_path}/{name}.db")
+        counts = seed_database(SeedConfig(500, seed=7, leader_ratio=0.2), bind=bind)
+        assert counts["employees"] == 500
+        assert counts["leaders"] == counts["teams"] == 100
+        assert counts["programmers"] == 400
+        snapshots.append(snapshot(bind))
+        bind.dispose()
+
+    assert snapshots[0] == snapshots[1]
+    assert snapshots[0]["payroll"][1] == 500
+    # Los bonos de proyecto, lenguajes y experiencia nunca son negativos
+    assert snapshots[0]["payroll"][0] > sum(row.base_salary for row in snapshots[0]["employees"])
+
+def test_seed_appends_after_existing_rows(tmp_path):
+    bind = create_engine(f"sqlite:///{tmp_path}/append.db")
+    seed_database(SeedConfig(50), bind=bind)
+    seed_database(SeedConfig(50), bind=bind)
+    with bind.connect() as connection:
+        assert connection.execute(select(func.count()).select_from(models.Employee)).scalar() == 100
+        assert connection.execute(select(models.PayrollSummary.employee_count)).scalar() == 100
+    bind.dispose()
+
+def test_seed_invalidates_cache_and_stale_payroll(tmp_path):
+    bind = create_engine(f"sqlite:///{tmp_path}/sin_nomina.db")
+    seed_database(SeedConfig(50), bind=bind)
+    with Session(bind) as db:
+        before = shared_generations(db, ["employees", "payroll_summary"])
+
+    # Sin reconstruir la nómina, el resumen se borra y ensure_payroll la recalcula
+    seed_database(SeedConfig(50), bind=bind, build_payroll=False)
+    with Session(bind) as db:
+        after = shared_generations(db, ["employees", "payroll_summary"])
+        assert all(after[table] > before[table] for table in before)
+        assert db.execute(select(func.count()).select_from(models.PayrollSummary)).scalar() == 0
+        ensure_payroll(db)
+        assert db.execute(select(models.PayrollSummary.employee_count)).scalar() == 100
+    bind.dispose()
+
+def test_seed_config_validation():
+    for kwargs in ({"employees": 0}, {"employees": 10, "leader_ratio": 0}, {"employees": 10, "max_languages": 20}):
+        try:
+            SeedConfig(**kwargs)
+            assert False, "Se esperaba ValueError"
+        except ValueError:
+            pass
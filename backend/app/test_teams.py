@@ -0,0 +1,125 @@
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database.database import SessionLocal, engine
+from app.schemas import schemas
+from app.api import operations
+from app.testing_utils import employee_payload, generate_unique_id
+
+def create_team_with_members(db, size):
+    team = operations.create_team(db, schemas.TeamCreate(name="Equipo Miembros"))
+    programmer_ids = []
+    for index in range(size):
+        programmer = operations.create_programmer(db, schemas.ProgrammerCreate(
+            employee_id=0,
+            category="ABC"[index % 3],
+            employee_data=schemas.EmployeeCreate(**employee_payload(
+                f"Miembro {index}", age=25 + index, sex="F", base_salary=1000.0 + index
+            )),
+            languages=["Python", "Go"][:index % 2 + 1]
+        ))
+        operations.add_team_member(db, team.id, programmer.employee_id)
+        programmer_ids.append(programmer.employee_id)
+    return team.id, programmer_ids
+
+def count_queries(function):
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        result = function()
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+    return result, len(statements)
+
+def test_team_members_loaded_in_two_queries():
+    db = SessionLocal()
+    try:
+        team_id, programmer_ids = create_team_with_members(db, 6)
+        other_team_id, other_ids = create_team_with_members(db, 2)
+        empty_team = operations.create_team(db, schemas.TeamCreate(name="Equipo Vacio"))
+
+        members, queries = count_queries(lambda: operations.get_team_members(db, team_id))
+        assert queries == 2
+        assert [m["programmer_id"] for m in members] == sorted(programmer_ids)
+        first = members[0]
+        assert first["employee"]["name"] == "Miembro 0" and first["employee"]["type"] == "programmer"
+        assert first["category"] == "A" and first["languages"] == ["Python"]
+        assert members[1]["languages"] == ["Go", "Python"]
+
+        by_team, queries = count_queries(
+            lambda: operations.get_members_for_teams(db, [team_id, other_team_id, empty_team.id])
+        )
+        assert queries == 2
+        assert by_team[team_id] == members
+        assert [m["programmer_id"] for m in by_team[other_team_id]] == sorted(other_ids)
+        assert by_team[empty_team.id] == []
+    finally:
+        db.close()
+
+def test_bulk_membership_changes_with_conflicts():
+    db = SessionLocal()
+    try:
+        source_id, programmer_ids = create_team_with_members(db, 4)
+        other_id, other_ids = create_team_with_members(db, 1)
+        target = operations.create_team(db, schemas.TeamCreate(name="Equipo Destino"))
+
+        moved = programmer_ids[:3]
+        result, removal_queries = count_queries(
+            lambda: operations.remove_team_members(db, source_id, moved + other_ids + [-1])
+        )
+        assert result["programmer_ids"] == moved
+        assert result["conflicts"] == [
+            {"programmer_id": other_ids[0], "detail": "El programador no está en este equipo"},
+            {"programmer_id": -1, "detail": "Programador no encontrado"},
+        ]
+
+        result, add_queries = count_queries(
+            lambda: operations.add_team_members(db, target.id, moved + [moved[0], programmer_ids[3], -1])
+        )
+        assert result["programmer_ids"] == moved
+        assert [c["detail"] for c in result["conflicts"]] == [
+            "El programador ya está en otro equipo", "Programador no encontrado"
+        ]
+        # Comprobaciones e INSERT/DELETE con un número fijo de consultas, no una por programador
+        assert removal_queries <= 8 and add_queries <= 8
+
+        again = operations.add_team_members(db, target.id, [moved[0]])
+        assert again["programmer_ids"] == []
+        assert again["conflicts"][0]["detail"] == "El programador ya está en este equipo"
+
+        members = operations.get_members_for_teams(db, [source_id, target.id])
+        assert [m["programmer_id"] for m in members[source_id]] == [programmer_ids[3]]
+        assert [m["programmer_id"] for m in members[target.id]] == sorted(moved)
+    finally:
+        db.close()
+
+def auth_headers(client):
+    username = f"equipos{generate_unique_id()}"
+    credentials = {"username": username, "password": "testpass123"}
+    client.post("/auth/register", json={**credentials, "email": f"{username}@example.com"})
+    token = client.post("/auth/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+def test_bulk_membership_endpoints():
+    client = TestClient(app)
+    headers = auth_headers(client)
+    db = SessionLocal()
+    try:
+        team_id, programmer_ids = create_team_with_members(db, 2)
+    finally:
+        db.close()
+
+    url = f"/teams/{team_id}/members/bulk"
+    response = client.request("DELETE", url, json={"programmer_ids": programmer_ids}, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"team_id": team_id, "programmer_ids": programmer_ids, "conflicts": []}
+    response = client.post(url, json={"programmer_ids": programmer_ids}, headers=headers)
+    assert response.status_code == 200 and response.json()["programmer_ids"] == programmer_ids
+
+    missing_team = client.post("/teams/-1/members/bulk", json={"programmer_ids": programmer_ids}, headers=headers)
+    assert missing_team.status_code == 400
+    assert client.post(url, json={"programmer_ids": []}, headers=headers).status_code == 422
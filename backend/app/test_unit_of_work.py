@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api import operations
+from app.database.database import SessionLocal, engine
+from app.schemas import schemas
+from app.testing_utils import employee_payload, generate_unique_id
+
+client = TestClient(app)
+
+def employee_data(identity_card=None):
+    return employee_payload("Empleado Transacción", identity_card=identity_card or generate_unique_id())
+
+def count_commits():
+    commits = []
+    listener = lambda connection: commits.append(1)
+    event.listen(engine, "commit", listener)
+    return commits, lambda: event.remove(engine, "commit", listener)
+
+def test_write_requests_commit_once():
+    commits, stop = count_commits()
+    try:
+        response = client.post("/programmers/", json={
+            "employee_id": 0, "category": "B", "employee_data": employee_data(), "languages": ["Python", "Go"]
+        })
+        assert response.status_code == 200
+        assert len(commits) == 1
+        # La respuesta sale de los objetos ya cargados, sin volver a leerlos
+        assert response.json()["employee"]["name"] == "Empleado Transacción"
+
+        programmer_id = response.json()["employee_id"]
+        assert client.put(f"/programmers/{programmer_id}", json={"category": "A"}).status_code == 200
+        assert len(commits) == 2
+    finally:
+        stop()
+    client.delete(f"/programmers/{programmer_id}")
+
+def test_nested_units_commit_in_the_outermost():
+    first, second = generate_unique_id(), generate_unique_id()
+    with SessionLocal() as db:
+        with pytest.raises(ValueError):
+            with operations.unit_of_work(db):
+                operations.create_employee(db, schemas.EmployeeCreate(**employee_data(first)))
+                assert operations.in_unit_of_work(db)
+                raise ValueError("falla un paso posterior")
+        assert not operations.in_unit_of_work(db)
+
+        with operations.unit_of_work(db):
+            operations.create_employee(db, schemas.EmployeeCreate(**employee_data(second)))
+
+    with SessionLocal() as db:
+        # La primera operación se deshizo junto con la unidad externa
+        assert operations.get_employee_by_identity(db, first) is None
+        created = operations.get_employee_by_identity(db, second)
+        assert created is not None
+        operations.delete_employee(db, created.id)
+
+def test_failed_step_rolls_back_the_whole_operation():
+    identity_card = generate_unique_id()
+    with SessionLocal() as db:
+        # El lenguaje repetido falla en el último INSERT, después de crear empleado y programador
+        with pytest.raises(IntegrityError):
+            operations.create_programmer(db, schemas.ProgrammerCreate(
+                employee_id=0, category="A", employee_data=employee_data(identity_card),
+                languages=["Python", "python"]
+            ))
+    with SessionLocal() as db:
+        assert operations.get_employee_by_identity(db, identity_card) is None
@@ -0,0 +1,112 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api import operations
+from app.database.database import SessionLocal
+from app.schemas import schemas
+from app.testing_utils import employee_payload, generate_unique_id
+
+client = TestClient(app)
+
+def create_employee():
+    response = client.post("/employees/", json=employee_payload("Empleado Versionado", age=33, sex="F", base_salary=1100.0))
+    assert response.status_code == 200
+    return response.json()["id"]
+
+def test_conditional_get_and_if_match_on_employee():
+    employee_id = create_employee()
+    url = f"/employees/{employee_id}"
+
+    first = client.get(url)
+    etag = first.headers["ETag"]
+    cached = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    updated = client.put(url, json={"name": "Empleado Renombrado"}, headers={"If-Match": etag})
+    assert updated.status_code == 200
+    new_etag = updated.headers["ETag"]
+    assert new_etag != etag
+
+    # Otro editor con la versión anterior no pisa el cambio
+    stale = client.put(url, json={"name": "Cambio Perdido"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+    assert client.delete(url, headers={"If-Match": etag}).status_code == 412
+    assert client.get(url, headers={"If-None-Match": etag}).json()["name"] == "Empleado Renombrado"
+
+    assert client.delete(url, headers={"If-Match": new_etag}).status_code == 200
+
+def test_list_pages_return_304_until_a_row_changes():
+    employee_id = create_employee()
+    url = f"/employees/?cursor={operations.encode_cursor('id', [employee_id - 1])}&limit=5&include_salary=true"
+
+    page = client.get(url)
+    etag = page.headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": f'W/{etag}, "otro"'}).status_code == 304
+
+    client.put(f"/employees/{employee_id}", json={"age": 34})
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    client.delete(f"/employees/{employee_id}")
+
+def test_concurrent_update_is_rejected():
+    employee_id = create_employee()
+    with SessionLocal() as first, SessionLocal() as second:
+        mine = operations.get_employee(first, employee_id)
+        theirs = operations.get_employee(second, employee_id)
+        assert mine.version == theirs.version
+
+        operations.update_employee(second, employee_id, schemas.EmployeeUpdate(age=40))
+        with pytest.raises(operations.StaleVersionError):
+            operations.update_employee(first, employee_id, schemas.EmployeeUpdate(age=41))
+
+    with SessionLocal() as db:
+        assert operations.get_employee(db, employee_id).age == 40
+        operations.delete_employee(db, employee_id)
+
+def test_project_and_team_versions():
+    with SessionLocal() as db:
+        team = operations.create_team(db, schemas.TeamCreate(name=f"Equipo Versión {generate_unique_id()}"))
+        team_id, team_etag = team.id, operations.resource_etag(team)
+    project = client.post("/projects/", json={
+        "name": "Proyecto Versionado", "estimated_time": 40, "price": 3000.0, "type": "multimedia", "team_id": team_id
+    }).json()
+    url = f"/projects/{project['id']}"
+
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.put(url, json={"price": 3500.0}, headers={"If-Match": etag}).status_code == 200
+    assert client.put(url, json={"price": 4000.0}, headers={"If-Match": etag}).status_code == 412
+    assert client.get(url).json()["price"] == 3500.0
+
+    # Borrar el proyecto no cambia la fila del equipo, así que su versión sigue vigente
+    assert client.delete(url, headers={"If-Match": client.get(url).headers["ETag"]}).status_code == 200
+    with SessionLocal() as db:
+        assert operations.resource_etag(operations.get_team(db, team_id)) == team_etag
+
+def test_concurrent_delete_is_rejected():
+    with SessionLocal() as db:
+        team = operations.create_team(db, schemas.TeamCreate(name=f"Equipo Borrado {generate_unique_id()}"))
+        project = operations.create_project(db, schemas.ProjectCreate(
+            name="Proyecto Borrado", estimated_time=40, price=3000.0, type="management", team_id=team.id
+        ))
+        team_id, project_id = team.id, project.id
+    employee_id = create_employee()
+    rows = [
+        (operations.get_employee, operations.delete_employee, employee_id, schemas.EmployeeUpdate(age=41),
+         operations.update_employee),
+        (operations.get_project, operations.delete_project, project_id, schemas.ProjectUpdate(price=3100.0),
+         operations.update_project),
+        (operations.get_team, operations.delete_team, team_id, schemas.TeamCreate(name="Equipo Renombrado"),
+         operations.update_team),
+    ]
+    for get, delete, row_id, changes, update in rows:
+        with SessionLocal() as first, SessionLocal() as second:
+            read = get(first, row_id)  # la sesión conserva la versión leída mientras haya referencias
+            update(second, row_id, changes)
+            # El DELETE lleva la versión leída: no borra una fila que cambió entretanto
+            with pytest.raises(operations.StaleVersionError):
+                delete(first, row_id)
+        with SessionLocal() as db:
+            assert get(db, row_id) is not None
+            assert delete(db, row_id)
@@ -0,0 +1,16 @@
+"""
+Utilidades compartidas por los tests
+"""
+import random
+import string
+
+def generate_unique_id():
+    """Genera un ID único para evitar conflictos en tests"""
+    return ''.join(random.choices(string.digits, k=8))
+
+def employee_payload(name: str = "Empleado Test", employee_type: str = "programmer", **fields) -> dict:
+    """Datos de alta de un empleado con una cédula nueva; fields sustituye los valores por defecto"""
+    return {
+        "identity_card": generate_unique_id(), "name": name, "age": 30, "sex": "M",
+        "base_salary": 1000.0, "type": employee_type, **fields
+    }
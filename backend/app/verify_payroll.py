@@ -0,0 +1,44 @@
+"""
+Script para verificar la nómina materializada (employee_payroll) contra un recálculo completo
+
+Uso:
+    python -m app.verify_payroll            # solo verifica
+    python -m app.verify_payroll --rebuild  # reconstruye la tabla si hay diferencias
+"""
+import sys
+from app.database.database import engine, SessionLocal
+from app.models.models import Base
+from app.api.operations.payroll_operations import verify_payroll, rebuild_payroll
+
+def main(rebuild: bool = False) -> bool:
+    """
+    Verifica la nómina y, si se pide, la reconstruye.
+    Devuelve True si al terminar la nómina materializada es correcta.
+    """
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        result = verify_payroll(db)
+        print(f"Total esperado: {result['expected_total']:.2f}")
+        print(f"Total almacenado: {result['stored_total']}")
+        for mismatch in result["mismatches"][:20]:
+            print(f"  Empleado {mismatch['employee_id']}: esperado={mismatch['expected']} almacenado={mismatch['stored']}")
+        if len(result["mismatches"]) > 20:
+            print(f"  ... y {len(result['mismatches']) - 20} diferencias más")
+
+        if result["ok"]:
+            print("✅ La nómina materializada coincide con el recálculo completo")
+            return True
+
+        if result["stored_total"] is None:
+            print("❌ La nómina materializada aún no se ha construido")
+        else:
+            print(f"❌ Se encontraron {len(result['mismatches'])} diferencias")
+        if rebuild:
+            rebuild_payroll(db)
+            db.commit()
+            print("✅ Nómina materializada reconstruida")
+            return True
+        return False
+
+if __name__ == "__main__":
+    sys.exit(0 if main(rebuild="--rebuild" in sys.argv[1:]) else 1)
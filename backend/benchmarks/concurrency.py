@@ -0,0 +1,185 @@
+"""
+Benchmark de carga concurrente: modo síncrono frente a modo async (DB_ASYNC).
+
+Para cada modo arranca un subproceso con una base SQLite sintética propia, lanza
+peticiones concurrentes contra la aplicación ASGI (httpx en el mismo proceso,
+sin red) y mide rendimiento (peticiones por segundo) y latencia p50/p95. En modo
+síncrono cada petición ocupa un hilo del threadpool de FastAPI; en modo async la
+E/S de la base se espera en el bucle de eventos.
+
+Cada modo se mide con dos perfiles de pool: los límites que trae la configuración
+(DB_MAX_OVERFLOW, DB_WRITE_MAX_OVERFLOW) y sin límite de conexiones extra, para
+separar el coste del modo de acceso de la espera de turno en el pool.
+
+Uso:
+    python -m benchmarks.concurrency --employees 10000 --concurrency 10 100 --requests 2000
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from benchmarks.run_benchmarks import BACKEND_DIR, BENCHMARKS_DIR, _percentile
+
+DEFAULT_OUTPUT = BENCHMARKS_DIR / "results" / "concurrency.json"
+MODES = ("sync", "async")
+# Variables de entorno de cada perfil de pool (las demás, las de la configuración)
+PROFILES = {
+    "default": {},
+    "sin-limite": {"DB_MAX_OVERFLOW": "-1", "DB_WRITE_MAX_OVERFLOW": "-1"},
+}
+
+def _workload(ctx):
+    """Mezcla de peticiones: sobre todo lecturas y una escritura de cada diez"""
+    def request(i):
+        kind = i % 10
+        if kind == 9:
+            sequence = next(ctx["sequence"])
+            return "POST", "/employees/", {
+                "identity_card": f"C{os.getpid()}X{sequence}", "name": f"Carga {sequence}", "age": 30,
+                "sex": "F", "base_salary": 1200.0, "type": "programmer"
+            }
+        employee_id = ctx["employee_ids"][i % len(ctx["employee_ids"])]
+        return {
+            0: ("GET", f"/employees/{employee_id}", None),
+            1: ("GET", f"/employees/{employee_id}/salary", None),
+            2: ("GET", "/employees/?limit=50", None),
+            3: ("GET", "/programmers/?limit=50", None),
+            4: ("GET", f"/teams/{ctx['team_id']}/members", None),
+            5: ("GET", "/leaders/?limit=20", None),
+            6: ("GET", "/projects/?limit=50", None),
+            7: ("GET", "/analytics/total-salary", None),
+            8: ("GET", f"/programmers/{ctx['programmer_id']}", None),
+        }[kind]
+    return request
+
+async def _login(client) -> dict:
+    credentials = {"username": f"carga{os.getpid()}", "password": "benchpass"}
+    await client.post("/auth/register", json={**credentials, "email": f"carga{os.getpid()}@example.com"})
+    token = (await client.post("/auth/login", json=credentials)).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+async def _run_load(app, ctx, concurrency: int, total: int) -> dict:
+    import httpx
+
+    request = _workload(ctx)
+    latencies = []
+    errors = 0
+    queue = iter(range(total))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        headers = await _login(client)
+
+        async def user():
+            nonlocal errors
+            for i in queue:
+                method, path, payload = request(i)
+                start = time.perf_counter()
+                response = await client.request(method, path, json=payload, headers=headers)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code >= 400:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[user() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "errors": errors
+    }
+
+def run_mode(employees: int, concurrency_levels, total: int, seed: int) -> dict:
+    """Siembra la base y mide cada nivel de concurrencia (se ejecuta en un subproceso)"""
+    from app.database.database import engine, SessionLocal
+    from app.database.async_database import dispose_async_engine
+    from app.models import models
+    from app.seed_db import SeedConfig, seed_database
+
+    seed_database(SeedConfig(employees, seed=seed), bind=engine)
+    from app.main import app
+
+    with SessionLocal() as db:
+        member = db.query(models.TeamMember).order_by(models.TeamMember.team_id).first()
+        ctx = {
+            "employee_ids": [row.id for row in db.query(models.Employee.id).order_by(models.Employee.id).limit(200)],
+            "team_id": member.team_id,
+            "programmer_id": member.programmer_id,
+            "sequence": itertools.count(),
+        }
+
+    async def measure():
+        results = {}
+        try:
+            for concurrency in concurrency_levels:
+                results[str(concurrency)] = await _run_load(app, ctx, concurrency, total)
+        finally:
+            await dispose_async_engine()
+        return results
+
+    return asyncio.run(measure())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Carga concurrente: modo síncrono frente a async")
+    parser.add_argument("--employees", type=int, default=10000, help="Cantidad de empleados de la base")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 100], help="Peticiones simultáneas")
+    parser.add_argument("--requests", type=int, default=1000, help="Peticiones por nivel de concurrencia")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla de los datos sintéticos")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="Archivo JSON de resultados")
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        json.dump(run_mode(args.employees, args.concurrency, args.requests, args.seed), sys.stdout)
+        return 0
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "employees": args.employees,
+            "requests": args.requests,
+            "seed": args.seed
+        },
+        "profiles": {}
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile, overrides in PROFILES.items():
+            report["profiles"][profile] = {}
+            for mode in MODES:
+                print(f"Midiendo modo {mode} con el perfil de pool {profile}...", file=sys.stderr)
+                env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp}/load_{profile}_{mode}.db",
+                           DB_ASYNC=str(mode == "async"), **overrides)
+                completed = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.concurrency", "--worker", mode,
+                     "--employees", str(args.employees), "--requests", str(args.requests), "--seed", str(args.seed),
+                     "--concurrency", *[str(level) for level in args.concurrency]],
+                    cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, check=True
+                )
+                report["profiles"][profile][mode] = json.loads(completed.stdout.splitlines()[-1])
+
+    output = pathlib.Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+    for profile, modes in report["profiles"].items():
+        print(f"Perfil de pool: {profile}")
+        print(f"{'concurrencia':>12} | {'sync req/s':>10} {'p95 ms':>9} {'errores':>7} | "
+              f"{'async req/s':>11} {'p95 ms':>9} {'errores':>7}")
+        for level in args.concurrency:
+            sync, async_ = modes["sync"][str(level)], modes["async"][str(level)]
+            print(f"{level:>12} | {sync['throughput_rps']:>10} {sync['p95_ms']:>9} {sync['errors']:>7} | "
+                  f"{async_['throughput_rps']:>11} {async_['p95_ms']:>9} {async_['errors']:>7}")
+    print(f"Resultados guardados en {output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Micro-benchmark de las búsquedas de una sola fila (get_employee, get_programmer,
+get_leader, get_team, get_project, auth.get_user y get_employee_by_identity).
+
+Compara, por llamada, la forma anterior (db.query(...).filter(...).first(), que
+construye la consulta en cada llamada) con la actual (app/api/operations/lookups.py:
+sentencias select() construidas una vez y, por clave primaria, el identity map de la
+sesión), en dos escenarios:
+  - fila nueva: cada llamada busca una fila que la sesión todavía no cargó
+  - repetida: la misma fila dentro de la misma sesión (por clave primaria se toma
+    del identity map sin ir a la base)
+
+Uso:
+    python -m benchmarks.lookups --employees 2000 --calls 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from sqlalchemy.orm import sessionmaker
+from app.api import auth
+from app.api.operations import (
+    employee_operations, programmer_operations, leader_operations, team_operations, project_operations
+)
+from app.database.database import Base, create_db_engine
+from app.models import models
+from app.seed_db import SeedConfig, seed_database
+
+# ---- FORMA ANTERIOR (UNA CONSULTA NUEVA POR LLAMADA) ----
+LEGACY_LOOKUPS = {
+    "get_employee": lambda db, key: db.query(models.Employee).filter(models.Employee.id == key).first(),
+    "get_employee_by_identity": lambda db, key: db.query(models.Employee).filter(
+        models.Employee.identity_card == key).first(),
+    "get_programmer": lambda db, key: db.query(models.Programmer).filter(
+        models.Programmer.employee_id == key).first(),
+    "get_leader": lambda db, key: db.query(models.Leader).filter(models.Leader.employee_id == key).first(),
+    "get_team": lambda db, key: db.query(models.Team).filter(models.Team.id == key).first(),
+    "get_project": lambda db, key: db.query(models.Project).filter(models.Project.id == key).first(),
+    "get_user": lambda db, key: db.query(models.User).filter(models.User.username == key).first(),
+}
+
+CURRENT_LOOKUPS = {
+    "get_employee": employee_operations.get_employee,
+    "get_employee_by_identity": employee_operations.get_employee_by_identity,
+    "get_programmer": programmer_operations.get_programmer,
+    "get_leader": leader_operations.get_leader,
+    "get_team": team_operations.get_team,
+    "get_project": project_operations.get_project,
+    "get_user": auth.get_user,
+}
+
+def _keys(db, limit: int) -> dict:
+    """Claves existentes para cada búsqueda"""
+    def column(attribute):
+        return [row[0] for row in db.query(attribute).order_by(attribute).limit(limit)]
+
+    if db.query(models.User).count() == 0:
+        for i in range(min(limit, 200)):
+            db.add(models.User(username=f"bench{i}", email=f"bench{i}@example.com", hashed_password="x"))
+        db.commit()
+    return {
+        "get_employee": column(models.Employee.id),
+        "get_employee_by_identity": column(models.Employee.identity_card),
+        "get_programmer": column(models.Programmer.employee_id),
+        "get_leader": column(models.Leader.employee_id),
+        "get_team": column(models.Team.id),
+        "get_project": column(models.Project.id),
+        "get_user": column(models.User.username),
+    }
+
+def _time_per_call(Session, lookup, keys, calls: int, repeated: bool) -> float:
+    """Microsegundos por llamada"""
+    with Session() as db:
+        # Calentar la caché de compilación de SQLAlchemy
+        for key in keys[:10]:
+            lookup(db, key)
+        db.expunge_all()
+        # En una petición el objeto sigue referenciado mientras se usa; el identity
+        # map de la sesión guarda referencias débiles
+        loaded = []
+        started = time.perf_counter()
+        for i in range(calls):
+            key = keys[0] if repeated else keys[i % len(keys)]
+            if not repeated and i % len(keys) == 0:
+                db.expunge_all()
+                loaded.clear()
+            loaded.append(lookup(db, key))
+        return (time.perf_counter() - started) / calls * 1_000_000
+
+def run(employees: int, calls: int, seed: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        bind = create_db_engine(f"sqlite:///{os.path.join(tmp, 'lookups.db')}")
+        Base.metadata.create_all(bind=bind)
+        seed_database(SeedConfig(employees, seed=seed), bind=bind)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=bind)
+        with Session() as db:
+            keys = _keys(db, calls)
+
+        results = {}
+        for name, lookup in CURRENT_LOOKUPS.items():
+            results[name] = {
+                scenario: {
+                    "antes_us": round(_time_per_call(Session, LEGACY_LOOKUPS[name], keys[name], calls, repeated), 1),
+                    "despues_us": round(_time_per_call(Session, lookup, keys[name], calls, repeated), 1),
+                }
+                for scenario, repeated in (("fila_nueva", False), ("repetida", True))
+            }
+        bind.dispose()
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Coste por llamada de las búsquedas de una sola fila")
+    parser.add_argument("--employees", type=int, default=2000, help="Cantidad de empleados de la base")
+    parser.add_argument("--calls", type=int, default=2000, help="Llamadas por búsqueda y escenario")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla de los datos sintéticos")
+    args = parser.parse_args(argv)
+
+    results = run(args.employees, args.calls, args.seed)
+    print(f"{'búsqueda':<26} | {'fila nueva: antes':>17} {'después':>8} | {'repetida: antes':>15} {'después':>8}  (µs/llamada)")
+    for name, scenarios in results.items():
+        new, repeated = scenarios["fila_nueva"], scenarios["repetida"]
+        print(f"{name:<26} | {new['antes_us']:>17} {new['despues_us']:>8} | "
+              f"{repeated['antes_us']:>15} {repeated['despues_us']:>8}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
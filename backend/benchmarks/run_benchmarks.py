@@ -0,0 +1,525 @@
+"""
+Suite de benchmarks de la API.
+
+Para cada tamaño de base de datos (por defecto 1k, 10k y 100k empleados) crea una
+base SQLite sintética, recorre todas las rutas de app/routers con el TestClient de
+FastAPI y mide por endpoint la latencia (p50/p95), las consultas SQL por petición y
+el pico de memoria. Los resultados se guardan en JSON para poder compararlos.
+
+Uso:
+    python -m benchmarks.run_benchmarks --sizes 1000 10000 100000
+    python -m benchmarks.run_benchmarks --sizes 1000 --output benchmarks/results/nuevo.json \\
+        --compare benchmarks/results/base.json --threshold 1.25
+"""
+import argparse
+import json
+import os
+import pathlib
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCHMARKS_DIR = pathlib.Path(__file__).parent.absolute()
+BACKEND_DIR = BENCHMARKS_DIR.parent
+DEFAULT_OUTPUT = BENCHMARKS_DIR / "results" / "latest.json"
+
+# ---- DEFINICIÓN DE ENDPOINTS ----
+class Endpoint:
+    """
+    Una ruta a medir.
+    path y payload reciben (ctx, i) y devuelven la URL y los argumentos de la petición i;
+    setup(ctx, db, n) prepara, sin medir, los recursos que consumen las rutas de escritura.
+    Las rutas cached (caché de analytics) se miden dos veces: en frío, vaciando la caché
+    antes de cada petición, y en caliente, con el resultado ya guardado.
+    """
+
+    def __init__(self, method, route, path, payload=None, setup=None, auth=True, cached=False):
+        self.method = method
+        self.route = route
+        self.path = path
+        self.payload = payload
+        self.setup = setup
+        self.auth = auth
+        self.cached = cached
+
+    @property
+    def name(self):
+        return f"{self.method} {self.route}"
+
+def _employee_payload(ctx, i, employee_type="programmer"):
+    ctx["sequence"] += 1
+    return {
+        "identity_card": f"B{os.getpid()}X{ctx['sequence']}",
+        "name": f"Bench {ctx['sequence']}",
+        "age": 30,
+        "sex": "M",
+        "base_salary": 1500.0,
+        "type": employee_type
+    }
+
+def _programmer_payload(ctx, i):
+    return {"json": {
+        "employee_id": 0,
+        "category": "B",
+        "employee_data": _employee_payload(ctx, i),
+        "languages": ["Python", "Go"]
+    }}
+
+def _leader_payload(ctx, i):
+    return {"json": {
+        "years_experience": 5,
+        "projects_led": 1,
+        "employee_data": _employee_payload(ctx, i, "leader")
+    }}
+
+def _import_payload(ctx, i, rows=20):
+    """Archivo NDJSON con rows programadores nuevos para POST /employees/import"""
+    lines = []
+    for _ in range(rows):
+        employee = _employee_payload(ctx, i)
+        lines.append(json.dumps({**employee, "category": "C", "languages": ["Python"]}))
+    return {"files": {"file": ("bench.ndjson", "\n".join(lines).encode(), "application/x-ndjson")}}
+
+def _project_data(ctx, i, team_id, project_type):
+    return {
+        "name": f"Bench proyecto {i}",
+        "description": "Proyecto de benchmark",
+        "estimated_time": 100 + i,
+        "price": 10000.0,
+        "type": project_type,
+        "team_id": team_id
+    }
+
+def _batch_payload(ctx, i):
+    """Alta completa en un lote: líder, equipo, dos programadores, miembros y proyecto de gestión"""
+    return {"json": {"operations": [
+        {"op": "create_leader", "ref": "lider", "args": {"leader": _leader_payload(ctx, i)["json"]}},
+        {"op": "create_team", "ref": "equipo", "args": {"team": {"name": f"Bench lote {i}", "leader_id": "$lider"}}},
+        {"op": "create_programmer", "ref": "p1", "args": {"programmer": _programmer_payload(ctx, i)["json"]}},
+        {"op": "create_programmer", "ref": "p2", "args": {"programmer": _programmer_payload(ctx, i)["json"]}},
+        {"op": "add_team_members", "args": {"team_id": "$equipo", "programmer_ids": ["$p1", "$p2"]}},
+        {"op": "create_management_project", "args": {"management_project": {
+            "database_type": "Postgresql", "programming_language": "Python", "framework": "Django",
+            "project_data": {**_project_data(ctx, i, 1, "management"), "team_id": "$equipo"}
+        }}},
+    ]}}
+
+# Preparación de recursos (fuera de la medición)
+def _pool(name, factory):
+    def setup(ctx, db, n):
+        ctx[name] = [factory(ctx, db, i) for i in range(n)]
+    return setup
+
+def _new_employee(ctx, db, i):
+    from app.api import operations
+    from app.schemas import schemas
+    return operations.create_employee(db, schemas.EmployeeCreate(**_employee_payload(ctx, i))).id
+
+def _new_programmer(ctx, db, i):
+    from app.api import operations
+    from app.schemas import schemas
+    data = _programmer_payload(ctx, i)["json"]
+    return operations.create_programmer(db, schemas.ProgrammerCreate(**data)).employee_id
+
+def _new_leader(ctx, db, i):
+    from app.api import operations
+    from app.schemas import schemas
+    data = _leader_payload(ctx, i)["json"]
+    return operations.create_leader(db, schemas.LeaderCreate(**data)).employee_id
+
+def _new_team(ctx, db, i):
+    from app.api import operations
+    from app.schemas import schemas
+    return operations.create_team(db, schemas.TeamCreate(name=f"Bench equipo {i}")).id
+
+def _new_project(project_type):
+    def factory(ctx, db, i):
+        from app.api import operations
+        from app.schemas import schemas
+        team_id = _new_team(ctx, db, i)
+        return operations.create_project(db, schemas.ProjectCreate(**_project_data(ctx, i, team_id, project_type))).id
+    return factory
+
+def _new_member(ctx, db, i):
+    from app.api import operations
+    programmer_id = _new_programmer(ctx, db, i)
+    operations.add_team_member(db, ctx["member_team_id"], programmer_id)
+    return programmer_id
+
+def _batch(factory, size=5):
+    """Lista de size recursos por petición, para las rutas masivas"""
+    def batch(ctx, db, i):
+        return [factory(ctx, db, i * size + j) for j in range(size)]
+    return batch
+
+def build_endpoints():
+    """Todas las rutas de la API con la forma de construir cada petición"""
+    return [
+        # Raíz y salud
+        Endpoint("GET", "/", lambda ctx, i: "/", auth=False),
+        Endpoint("GET", "/health", lambda ctx, i: "/health", auth=False),
+
+        # Autenticación
+        Endpoint("POST", "/auth/register", lambda ctx, i: "/auth/register",
+                 lambda ctx, i: {"json": {"username": f"bench{os.getpid()}u{i}", "email": f"bench{os.getpid()}u{i}@example.com", "password": "benchpass"}},
+                 auth=False),
+        Endpoint("POST", "/auth/login", lambda ctx, i: "/auth/login",
+                 lambda ctx, i: {"json": ctx["credentials"]}, auth=False),
+        Endpoint("POST", "/auth/token", lambda ctx, i: "/auth/token",
+                 lambda ctx, i: {"data": ctx["credentials"]}, auth=False),
+        Endpoint("GET", "/auth/me", lambda ctx, i: "/auth/me"),
+        Endpoint("GET", "/auth/protected", lambda ctx, i: "/auth/protected"),
+
+        # Empleados
+        Endpoint("POST", "/employees/", lambda ctx, i: "/employees/", lambda ctx, i: {"json": _employee_payload(ctx, i)}),
+        Endpoint("GET", "/employees/{employee_id}", lambda ctx, i: f"/employees/{ctx['programmer_id']}"),
+        Endpoint("GET", "/employees/", lambda ctx, i: "/employees/"),
+        Endpoint("PUT", "/employees/{employee_id}", lambda ctx, i: f"/employees/{ctx['programmer_id']}",
+                 lambda ctx, i: {"json": {"name": f"Bench renombrado {i}"}}),
+        Endpoint("DELETE", "/employees/{employee_id}", lambda ctx, i: f"/employees/{ctx['employee_pool'][i]}",
+                 setup=_pool("employee_pool", _new_employee)),
+        Endpoint("DELETE", "/employees/bulk", lambda ctx, i: "/employees/bulk",
+                 lambda ctx, i: {"json": {"ids": ctx["employee_batches"][i]}},
+                 setup=_pool("employee_batches", _batch(_new_programmer))),
+        Endpoint("GET", "/employees/{employee_id}/salary", lambda ctx, i: f"/employees/{ctx['programmer_id']}/salary"),
+        Endpoint("POST", "/employees/import", lambda ctx, i: "/employees/import", _import_payload),
+
+        # Programadores
+        Endpoint("POST", "/programmers/", lambda ctx, i: "/programmers/", _programmer_payload),
+        Endpoint("GET", "/programmers/{programmer_id}", lambda ctx, i: f"/programmers/{ctx['programmer_id']}"),
+        Endpoint("GET", "/programmers/", lambda ctx, i: "/programmers/"),
+        Endpoint("PUT", "/programmers/{programmer_id}", lambda ctx, i: f"/programmers/{ctx['programmer_id']}",
+                 lambda ctx, i: {"json": {"languages": ["Python", "Go"] if i % 2 else ["Python", "Rust", "Java"]}}),
+        Endpoint("PUT", "/programmers/languages", lambda ctx, i: "/programmers/languages",
+                 lambda ctx, i: {"json": {"updates": [
+                     {"programmer_id": programmer_id, "languages": ["Python", "Rust"]}
+                     for programmer_id in ctx["language_batches"][i]
+                 ]}},
+                 setup=_pool("language_batches", _batch(_new_programmer))),
+        Endpoint("DELETE", "/programmers/{programmer_id}", lambda ctx, i: f"/programmers/{ctx['programmer_pool'][i]}",
+                 setup=_pool("programmer_pool", _new_programmer)),
+        Endpoint("GET", "/programmers/by-project/{project_id}", lambda ctx, i: f"/programmers/by-project/{ctx['management_project_id']}"),
+        Endpoint("GET", "/programmers/by-framework/{framework}", lambda ctx, i: f"/programmers/by-framework/{ctx['framework']}"),
+        Endpoint("GET", "/programmers/{programmer_id}/languages", lambda ctx, i: f"/programmers/{ctx['programmer_id']}/languages"),
+        Endpoint("GET", "/programmers/by-identity/{identity_card}/project",
+                 lambda ctx, i: f"/programmers/by-identity/{ctx['programmer_identity']}/project"),
+
+        # Líderes
+        Endpoint("POST", "/leaders/", lambda ctx, i: "/leaders/", _leader_payload),
+        Endpoint("GET", "/leaders/{leader_id}", lambda ctx, i: f"/leaders/{ctx['leader_id']}"),
+        Endpoint("GET", "/leaders/", lambda ctx, i: "/leaders/"),
+        Endpoint("PUT", "/leaders/{leader_id}", lambda ctx, i: f"/leaders/{ctx['leader_id']}",
+                 lambda ctx, i: {"json": {"years_experience": 5 + i % 10}}),
+        Endpoint("DELETE", "/leaders/{leader_id}", lambda ctx, i: f"/leaders/{ctx['leader_pool'][i]}",
+                 setup=_pool("leader_pool", _new_leader)),
+
+        # Equipos
+        Endpoint("POST", "/teams/", lambda ctx, i: "/teams/", lambda ctx, i: {"json": {"name": f"Bench equipo {i}"}}),
+        Endpoint("GET", "/teams/", lambda ctx, i: "/teams/"),
+        Endpoint("GET", "/teams/{team_id}", lambda ctx, i: f"/teams/{ctx['team_id']}"),
+        Endpoint("PUT", "/teams/{team_id}", lambda ctx, i: f"/teams/{ctx['team_id']}",
+                 lambda ctx, i: {"json": {"name": f"Equipo renombrado {i}", "leader_id": ctx["team_leader_id"]}}),
+        Endpoint("DELETE", "/teams/{team_id}", lambda ctx, i: f"/teams/{ctx['team_pool'][i]}",
+                 setup=_pool("team_pool", _new_team)),
+        Endpoint("DELETE", "/teams/bulk", lambda ctx, i: "/teams/bulk",
+                 lambda ctx, i: {"json": {"ids": ctx["team_batches"][i]}},
+                 setup=_pool("team_batches", _batch(_new_team))),
+        Endpoint("GET", "/teams/{team_id}/members", lambda ctx, i: f"/teams/{ctx['team_id']}/members"),
+        Endpoint("POST", "/teams/{team_id}/members", lambda ctx, i: f"/teams/{ctx['member_team_id']}/members",
+                 lambda ctx, i: {"json": {"programmer_id": ctx["free_programmer_pool"][i]}},
+                 setup=_pool("free_programmer_pool", _new_programmer)),
+        Endpoint("DELETE", "/teams/{team_id}/members/{programmer_id}",
+                 lambda ctx, i: f"/teams/{ctx['member_team_id']}/members/{ctx['member_pool'][i]}",
+                 setup=_pool("member_pool", _new_member)),
+        Endpoint("POST", "/teams/{team_id}/members/bulk", lambda ctx, i: f"/teams/{ctx['member_team_id']}/members/bulk",
+                 lambda ctx, i: {"json": {"programmer_ids": ctx["free_programmer_batches"][i]}},
+                 setup=_pool("free_programmer_batches", _batch(_new_programmer))),
+        Endpoint("DELETE", "/teams/{team_id}/members/bulk", lambda ctx, i: f"/teams/{ctx['member_team_id']}/members/bulk",
+                 lambda ctx, i: {"json": {"programmer_ids": ctx["member_batches"][i]}},
+                 setup=_pool("member_batches", _batch(_new_member))),
+
+        # Proyectos
+        Endpoint("POST", "/projects/", lambda ctx, i: "/projects/",
+                 lambda ctx, i: {"json": _project_data(ctx, i, ctx["project_team_pool"][i], "management")},
+                 setup=_pool("project_team_pool", _new_team)),
+        Endpoint("GET", "/projects/{project_id}", lambda ctx, i: f"/projects/{ctx['management_project_id']}"),
+        Endpoint("GET", "/projects/", lambda ctx, i: "/projects/"),
+        Endpoint("PUT", "/projects/{project_id}", lambda ctx, i: f"/projects/{ctx['management_project_id']}",
+                 lambda ctx, i: {"json": {"price": 10000.0 + i}}),
+        Endpoint("DELETE", "/projects/{project_id}", lambda ctx, i: f"/projects/{ctx['project_pool'][i]}",
+                 setup=_pool("project_pool", _new_project("management"))),
+        Endpoint("DELETE", "/projects/bulk", lambda ctx, i: "/projects/bulk",
+                 lambda ctx, i: {"json": {"ids": ctx["project_batches"][i]}},
+                 setup=_pool("project_batches", _batch(_new_project("management")))),
+        Endpoint("GET", "/projects/by-type/{project_type}", lambda ctx, i: "/projects/by-type/management"),
+        Endpoint("GET", "/projects/{project_id}/details", lambda ctx, i: f"/projects/{ctx['management_project_id']}/details"),
+        Endpoint("GET", "/projects/{project_id}/export-txt", lambda ctx, i: f"/projects/{ctx['management_project_id']}/export-txt"),
+
+        # Analytics
+        Endpoint("GET", "/analytics/earliest-project", lambda ctx, i: "/analytics/earliest-project", cached=True),
+        Endpoint("GET", "/analytics/projects-count", lambda ctx, i: "/analytics/projects-count", cached=True),
+        Endpoint("GET", "/analytics/highest-paid-employees", lambda ctx, i: "/analytics/highest-paid-employees?limit=10",
+                 cached=True),
+        Endpoint("GET", "/analytics/total-salary", lambda ctx, i: "/analytics/total-salary", cached=True),
+        Endpoint("GET", "/analytics/cache-stats", lambda ctx, i: "/analytics/cache-stats"),
+        Endpoint("GET", "/analytics/query-stats", lambda ctx, i: "/analytics/query-stats"),
+        Endpoint("GET", "/analytics/salary-distribution", lambda ctx, i: "/analytics/salary-distribution", cached=True),
+        Endpoint("POST", "/analytics/payroll-simulation", lambda ctx, i: "/analytics/payroll-simulation",
+                 lambda ctx, i: {"json": {"scenarios": [
+                     {"name": "bono 7%", "programmer_project_rate": 0.07},
+                     {"name": "lenguaje extra A", "extra_languages": {"A": 1}}
+                 ]}}),
+
+        # Proyectos de gestión
+        Endpoint("POST", "/management-projects/", lambda ctx, i: "/management-projects/",
+                 lambda ctx, i: {"json": {
+                     "database_type": "Postgresql", "programming_language": "Python", "framework": "Django",
+                     "project_data": _project_data(ctx, i, ctx["management_team_pool"][i], "management")
+                 }},
+                 setup=_pool("management_team_pool", _new_team)),
+        Endpoint("GET", "/management-projects/{project_id}", lambda ctx, i: f"/management-projects/{ctx['management_project_id']}"),
+        Endpoint("GET", "/management-projects/", lambda ctx, i: "/management-projects/"),
+        Endpoint("PUT", "/management-projects/{project_id}", lambda ctx, i: f"/management-projects/{ctx['management_project_id']}",
+                 lambda ctx, i: {"json": {"database_type": "Mysql", "programming_language": "Python", "framework": ctx["framework"]}}),
+        Endpoint("DELETE", "/management-projects/{project_id}", lambda ctx, i: f"/management-projects/{ctx['management_pool'][i]}",
+                 setup=_pool("management_pool", _new_project("management"))),
+
+        # Proyectos multimedia
+        Endpoint("POST", "/multimedia-projects/", lambda ctx, i: "/multimedia-projects/",
+                 lambda ctx, i: {"json": {
+                     "development_tool": "flash",
+                     "project_data": _project_data(ctx, i, ctx["multimedia_team_pool"][i], "multimedia")
+                 }},
+                 setup=_pool("multimedia_team_pool", _new_team)),
+        Endpoint("GET", "/multimedia-projects/{project_id}", lambda ctx, i: f"/multimedia-projects/{ctx['multimedia_project_id']}"),
+        Endpoint("GET", "/multimedia-projects/", lambda ctx, i: "/multimedia-projects/"),
+        Endpoint("PUT", "/multimedia-projects/{project_id}", lambda ctx, i: f"/multimedia-projects/{ctx['multimedia_project_id']}",
+                 lambda ctx, i: {"json": {"development_tool": "director" if i % 2 else "flash"}}),
+        Endpoint("DELETE", "/multimedia-projects/{project_id}", lambda ctx, i: f"/multimedia-projects/{ctx['multimedia_pool'][i]}",
+                 setup=_pool("multimedia_pool", _new_project("multimedia"))),
+
+        # Lotes de operaciones
+        Endpoint("POST", "/batch/", lambda ctx, i: "/batch/", _batch_payload),
+    ]
+
+# ---- EJECUCIÓN EN UN TAMAÑO ----
+def _sample_context(db):
+    """Elige IDs representativos de la base sembrada para construir las peticiones"""
+    from app.models import models
+
+    project = db.query(models.Project).filter(
+        models.Project.type == "management", models.Project.team_id.isnot(None)
+    ).order_by(models.Project.id).first()
+    multimedia = db.query(models.Project).filter(models.Project.type == "multimedia").order_by(models.Project.id).first()
+    member = db.query(models.TeamMember).filter(models.TeamMember.team_id == project.team_id).first()
+    programmer = db.query(models.Employee).filter(models.Employee.id == member.programmer_id).first()
+    team = db.query(models.Team).filter(models.Team.id == project.team_id).first()
+    framework = db.query(models.ManagementProject.framework).filter(
+        models.ManagementProject.project_id == project.id
+    ).scalar()
+    return {
+        "sequence": 0,
+        "programmer_id": programmer.id,
+        "programmer_identity": programmer.identity_card,
+        "leader_id": team.leader_id,
+        "team_id": team.id,
+        "team_leader_id": team.leader_id,
+        "management_project_id": project.id,
+        "multimedia_project_id": multimedia.id,
+        "framework": framework,
+    }
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    index = (len(ordered) - 1) * percent / 100
+    lower = int(index)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (index - lower)
+
+def run_size(employees: int, iterations: int, max_seconds: float, seed: int) -> dict:
+    """Siembra una base del tamaño indicado y mide todas las rutas (se ejecuta en un subproceso)"""
+    from fastapi.testclient import TestClient
+    from app.database.database import engine, SessionLocal
+    from app.seed_db import SeedConfig, seed_database
+
+    started = time.perf_counter()
+    dataset = seed_database(SeedConfig(employees, seed=seed), bind=engine)
+    seed_seconds = time.perf_counter() - started
+
+    from app.main import app
+    from app.api.cache import analytics_cache
+    from fastapi.routing import APIRoute
+
+    client = TestClient(app)
+
+    with SessionLocal() as db:
+        ctx = _sample_context(db)
+    ctx["credentials"] = {"username": f"bench{os.getpid()}", "password": "benchpass"}
+    client.post("/auth/register", json={**ctx["credentials"], "email": f"bench{os.getpid()}@example.com"})
+    token = client.post("/auth/login", json=ctx["credentials"]).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    with SessionLocal() as db:
+        ctx["member_team_id"] = _new_team(ctx, db, 0)
+
+    endpoints = build_endpoints()
+    covered = {(e.method, e.route) for e in endpoints}
+    uncovered = sorted(
+        f"{method} {route.path}"
+        for route in app.routes if isinstance(route, APIRoute)
+        for method in route.methods
+        if (method, route.path) not in covered
+    )
+
+    results = {}
+    for endpoint in endpoints:
+        if endpoint.setup:
+            with SessionLocal() as db:
+                endpoint.setup(ctx, db, iterations + 1)
+
+        def call(i):
+            kwargs = endpoint.payload(ctx, i) if endpoint.payload else {}
+            if endpoint.auth:
+                kwargs["headers"] = headers
+            return client.request(endpoint.method, endpoint.path(ctx, i), **kwargs)
+
+        def measure(name, cold=False):
+            latencies = []
+            queries = []
+            errors = 0
+            budget_start = time.perf_counter()
+            for i in range(iterations):
+                if cold:
+                    analytics_cache.clear()
+                start = time.perf_counter()
+                response = call(i)
+                latencies.append((time.perf_counter() - start) * 1000)
+                queries.append(int(response.headers["X-DB-Queries"]))
+                if response.status_code >= 400:
+                    errors += 1
+                if time.perf_counter() - budget_start > max_seconds:
+                    break
+
+            # Pico de memoria en una petición adicional (tracemalloc ralentiza, no se cronometra)
+            if cold:
+                analytics_cache.clear()
+            tracemalloc.start()
+            call(len(latencies))
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            results[name] = {
+                "samples": len(latencies),
+                "p50_ms": round(_percentile(latencies, 50), 3),
+                "p95_ms": round(_percentile(latencies, 95), 3),
+                "mean_ms": round(statistics.mean(latencies), 3),
+                "queries_per_request": round(statistics.mean(queries), 2),
+                "peak_memory_kb": round(peak_bytes / 1024, 1),
+                "errors": errors
+            }
+            print(f"  [{employees}] {name}: p50={results[name]['p50_ms']}ms "
+                  f"p95={results[name]['p95_ms']}ms queries={results[name]['queries_per_request']}",
+                  file=sys.stderr)
+
+        # Las rutas con caché se miden sin ella (el cálculo real) y con ella
+        measure(endpoint.name, cold=endpoint.cached)
+        if endpoint.cached:
+            measure(f"{endpoint.name} (caché)")
+
+    return {
+        "dataset": dataset,
+        "seed_seconds": round(seed_seconds, 2),
+        "uncovered_routes": uncovered,
+        "endpoints": results
+    }
+
+# ---- COMPARACIÓN ----
+def compare_results(current: dict, baseline: dict, threshold: float, min_delta_ms: float = 1.0) -> list:
+    """
+    Compara dos ejecuciones y devuelve las regresiones encontradas: p95 mayor que
+    baseline * threshold (y al menos min_delta_ms más lento) o más consultas por petición (con margen para las respuestas
+    servidas desde la caché).
+    """
+    regressions = []
+    for size, size_results in current["sizes"].items():
+        baseline_size = baseline.get("sizes", {}).get(size)
+        if not baseline_size:
+            continue
+        for name, metrics in size_results["endpoints"].items():
+            previous = baseline_size["endpoints"].get(name)
+            if not previous:
+                continue
+            if (metrics["p95_ms"] > previous["p95_ms"] * threshold
+                    and metrics["p95_ms"] - previous["p95_ms"] > min_delta_ms):
+                regressions.append(f"[{size}] {name}: p95 {previous['p95_ms']}ms -> {metrics['p95_ms']}ms")
+            if metrics["queries_per_request"] > previous["queries_per_request"] + 0.5:
+                regressions.append(
+                    f"[{size}] {name}: consultas {previous['queries_per_request']} -> {metrics['queries_per_request']}"
+                )
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de la API del Sistema de Gestión de Proyectos")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Cantidad de empleados por base")
+    parser.add_argument("--iterations", type=int, default=20, help="Peticiones por endpoint")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="Tiempo máximo por endpoint")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla de los datos sintéticos")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="Archivo JSON de resultados")
+    parser.add_argument("--compare", help="Archivo JSON de una ejecución anterior para detectar regresiones")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Factor máximo permitido de p95 frente a la base")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        result = run_size(args.worker, args.iterations, args.max_seconds, args.seed)
+        json.dump(result, sys.stdout)
+        return 0
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "seed": args.seed
+        },
+        "sizes": {}
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            print(f"Ejecutando benchmarks con {size} empleados...", file=sys.stderr)
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp}/bench_{size}.db")
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.run_benchmarks", "--worker", str(size),
+                 "--iterations", str(args.iterations), "--max-seconds", str(args.max_seconds), "--seed", str(args.seed)],
+                cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, check=True
+            )
+            # La aplicación escribe avisos de arranque en stdout; el resultado es la última línea
+            report["sizes"][str(size)] = json.loads(completed.stdout.splitlines()[-1])
+
+    output = pathlib.Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"Resultados guardados en {output}", file=sys.stderr)
+
+    for size, size_results in report["sizes"].items():
+        if size_results["uncovered_routes"]:
+            print(f"Rutas sin benchmark [{size}]: {', '.join(size_results['uncovered_routes'])}", file=sys.stderr)
+
+    if args.compare:
+        baseline = json.loads(pathlib.Path(args.compare).read_text())
+        regressions = compare_results(report, baseline, args.threshold)
+        if regressions:
+            print("❌ Regresiones detectadas:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+        print("✅ Sin regresiones frente a la ejecución base", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())